@@ -0,0 +1,85 @@
+# compare the default partition policy with the cost-driven partition
+import argparse
+from tvm import tensor_graph, tg, auto_tensorize as at
+
+
+def get_model(name, dtype):
+    models = tensor_graph.testing.models
+    if name == "resnet18":
+        return models.resnet18(num_classes=1000, dtype=dtype, out_dtype=dtype)
+    elif name == "resnet50":
+        return models.resnet50(num_classes=1000, dtype=dtype, out_dtype=dtype)
+    elif name == "mobilenet_v1":
+        return models.MobileNetv1(dtype=dtype, out_dtype=dtype)
+    elif name == "mobilenet_v2":
+        return models.MobileNetV2("mobilenet_v2", dtype=dtype, out_dtype=dtype)
+    elif name == "shufflenet":
+        return models.ShuffleNet(dtype=dtype, out_dtype=dtype)
+    raise ValueError("Unknown network: %s" % name)
+
+
+def tune_and_evaluate(name, multi_graph, target, trials, rounds):
+    dispatch = tensor_graph.core.AutoScheduleMultiGraphDispatch
+    measure_opt = at.MeasureOptions(target=target, timeout=100, number=200, min_repeat_ms=500)
+    tid = dispatch.add_graph_task(
+        name, multi_graph, measure_opt, scheduler_option="auto_tensorize", trials=trials
+    )
+    cost = at.MAX_FLOAT
+    for i in range(rounds):
+        dispatch.auto_schedule(tid)
+        sch_tensors = dispatch.get_schedules(tid)
+        if dispatch.ready(tid):
+            cost = min(cost, at.evaluate_graph(multi_graph, sch_tensors, target, 0, 100, True))
+    return cost
+
+
+def main(network, batch, dtype, trials, rounds):
+    target = "cuda"
+    model = get_model(network, dtype)
+    model.eval()
+    img_tensor = tensor_graph.core.GraphTensor([batch, 3, 224, 224], dtype, name="data")
+    fwd_graph = tensor_graph.core.make_fwd_graph(model, [img_tensor])
+    tir_graph = tensor_graph.core.make_tir_graph(fwd_graph, inference=True)
+
+    # default partition
+    multi_graph = tg.make_tir_multi_graph(tir_graph)
+    num_default = len(tg.get_graphs_from_tir_multi_graph(multi_graph))
+    cost_default = tune_and_evaluate(network + "_default", multi_graph, target, trials, rounds)
+
+    # cost-driven partition
+    marks = tg.get_graph_partition_mark(tir_graph, policy="cost")
+    tg.use_partition_mark(marks)
+    multi_graph = tg.make_tir_multi_graph(tir_graph)
+    tensor_graph.core.set_partition_policy(tensor_graph.core.partition_policy)
+    num_cost = len(tg.get_graphs_from_tir_multi_graph(multi_graph))
+    cost_cost = tune_and_evaluate(network + "_cost", multi_graph, target, trials, rounds)
+
+    print("%s default partition: %d subgraphs, %f ms" % (network, num_default, cost_default))
+    print("%s cost partition: %d subgraphs, %f ms" % (network, num_cost, cost_cost))
+
+
+example_text = """
+ example:
+    python partition_cost.py --network resnet18 --dtype float16 --trials 20
+"""
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        prog="partition_cost",
+        description="partition policy comparison",
+        epilog=example_text,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--network", type=str, default="resnet18")
+    parser.add_argument("--batch", type=int, default=1)
+    parser.add_argument(
+        "--dtype",
+        type=str,
+        choices=["float16", "float32", "float64"],
+        default="float16",
+    )
+    parser.add_argument("--trials", type=int, default=20)
+    parser.add_argument("--rounds", type=int, default=5)
+
+    args = parser.parse_args()
+    main(args.network, args.batch, args.dtype, args.trials, args.rounds)
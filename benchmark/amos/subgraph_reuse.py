@@ -0,0 +1,74 @@
+# report how many subgraphs of each network share schedules and kernels
+import argparse
+from tvm import tensor_graph, tg
+
+
+def get_networks(batch, dtype):
+    models = tensor_graph.testing.models
+    img_shape = [batch, 3, 224, 224]
+    return {
+        "resnet18": (models.resnet18(num_classes=1000, dtype=dtype, out_dtype=dtype), img_shape),
+        "resnet50": (models.resnet50(num_classes=1000, dtype=dtype, out_dtype=dtype), img_shape),
+        "mobilenet_v1": (models.MobileNetv1(dtype=dtype, out_dtype=dtype), img_shape),
+        "mobilenet_v2": (
+            models.MobileNetV2("mobilenet_v2", dtype=dtype, out_dtype=dtype),
+            img_shape,
+        ),
+        "shufflenet": (models.ShuffleNet(dtype=dtype, out_dtype=dtype), img_shape),
+    }
+
+
+def main(batch, dtype, networks):
+    for name, (model, shape) in get_networks(batch, dtype).items():
+        if networks and name not in networks:
+            continue
+        model.eval()
+        img_tensor = tensor_graph.core.GraphTensor(shape, dtype, name="data")
+        fwd_graph = tensor_graph.core.make_fwd_graph(model, [img_tensor])
+        tir_graph = tensor_graph.core.make_tir_graph(fwd_graph, inference=True)
+        multi_graph = tg.make_tir_multi_graph(tir_graph)
+        graphs = tg.get_graphs_from_tir_multi_graph(multi_graph).values()
+        total = len(graphs)
+        tags = set([x.tag for x in graphs])
+        hashes = set([tg.subgraph_hash(x) for x in graphs])
+        abstract = set([tg.subgraph_hash(x, shape_abstract=True) for x in graphs])
+        print(
+            "%s: %d subgraphs, unique by tag: %d (reuse %.1f%%), "
+            "unique by hash: %d (reuse %.1f%%), unique by shape-abstract hash: %d"
+            % (
+                name,
+                total,
+                len(tags),
+                (1 - len(tags) / total) * 100,
+                len(hashes),
+                (1 - len(hashes) / total) * 100,
+                len(abstract),
+            ),
+            flush=True,
+        )
+
+
+example_text = """
+ example:
+    python subgraph_reuse.py --dtype float16
+    python subgraph_reuse.py --networks resnet18 resnet50
+"""
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(
+        prog="subgraph_reuse",
+        description="subgraph reuse report",
+        epilog=example_text,
+        formatter_class=argparse.RawDescriptionHelpFormatter,
+    )
+    parser.add_argument("--batch", type=int, default=1)
+    parser.add_argument(
+        "--dtype",
+        type=str,
+        choices=["float16", "float32", "float64"],
+        default="float16",
+    )
+    parser.add_argument("--networks", type=str, nargs="*", default=[])
+
+    args = parser.parse_args()
+    main(args.batch, args.dtype, args.networks)
@@ -0,0 +1,96 @@
+"""Compare the round-robin and the gradient task scheduler on the conv layers of resnet-18,
+by the number of trials needed to reach the same estimated network latency.
+
+python task_scheduler.py --n-trials 4000 --target cuda
+"""
+import argparse
+import os
+import tempfile
+
+import tvm
+from tvm import te, auto_scheduler, topi
+
+
+@auto_scheduler.register_workload
+def conv2d_layer(N, H, W, CO, CI, KH, KW, stride, padding):
+    data = te.placeholder((N, CI, H, W), name="data")
+    kernel = te.placeholder((CO, CI, KH, KW), name="kernel")
+    conv = topi.nn.conv2d_nchw(data, kernel, stride, padding, dilation=1, out_dtype="float32")
+    return [data, kernel, conv]
+
+
+# (C, H, W, K, R, S, stride, padding, occurrences) of the conv layers of resnet-18
+res18_layers = [
+    (3, 224, 224, 64, 7, 7, 2, 3, 1),
+    (64, 56, 56, 64, 3, 3, 1, 1, 4),
+    (64, 56, 56, 128, 3, 3, 2, 1, 1),
+    (64, 56, 56, 128, 1, 1, 2, 0, 1),
+    (128, 28, 28, 128, 3, 3, 1, 1, 3),
+    (128, 28, 28, 256, 3, 3, 2, 1, 1),
+    (128, 28, 28, 256, 1, 1, 2, 0, 1),
+    (256, 14, 14, 256, 3, 3, 1, 1, 3),
+    (256, 14, 14, 512, 3, 3, 2, 1, 1),
+    (256, 14, 14, 512, 1, 1, 2, 0, 1),
+    (512, 7, 7, 512, 3, 3, 1, 1, 3),
+]
+
+
+def tune(tasks, weights, strategy, n_trials, log_file, target_latency=None):
+    """Tune the tasks, return the estimated latency in ms and the number of trials"""
+    measure_ctx = auto_scheduler.LocalRPCMeasureContext(min_repeat_ms=300)
+    tune_option = auto_scheduler.TuningOptions(
+        num_measure_trials=n_trials,
+        runner=measure_ctx.runner,
+        measure_callbacks=[auto_scheduler.RecordToFile(log_file)],
+        verbose=0,
+    )
+    progress_file = log_file + ".progress"
+    task_scheduler = auto_scheduler.TaskScheduler(
+        tasks,
+        task_weights=weights,
+        strategy=strategy,
+        callbacks=[auto_scheduler.task_scheduler.LogTaskProgress(progress_file)],
+    )
+    task_scheduler.tune(tune_option, target_latency=target_latency)
+    del measure_ctx
+    return task_scheduler.cur_score * 1000, task_scheduler.ct
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-trials", type=int, default=4000)
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--target", type=str, default="cuda")
+    args = parser.parse_args()
+
+    target = tvm.target.Target(args.target)
+    tasks, weights = [], []
+    for C, H, W, K, R, S, stride, padding, occurrences in res18_layers:
+        tasks.append(
+            auto_scheduler.create_task(
+                conv2d_layer,
+                (args.batch_size, H, W, K, C, R, S, (stride, stride), (padding, padding)),
+                target,
+            )
+        )
+        weights.append(occurrences)
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        latency, trials = tune(
+            tasks, weights, "round-robin", args.n_trials, os.path.join(tmp_dir, "rr.json")
+        )
+        print("round-robin: estimated latency %.4f ms after %d trials" % (latency, trials))
+        # Stop the gradient strategy once it is as good as round-robin with the full budget
+        latency, trials = tune(
+            tasks,
+            weights,
+            "gradient",
+            args.n_trials,
+            os.path.join(tmp_dir, "gradient.json"),
+            target_latency=latency / 1000,
+        )
+        print("gradient: estimated latency %.4f ms after %d trials" % (latency, trials))
+
+
+if __name__ == "__main__":
+    main()
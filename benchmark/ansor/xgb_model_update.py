@@ -0,0 +1,82 @@
+"""Compare the full retraining and the incremental mode of XGBModel
+on the search time and the final latency of a matmul search.
+
+python xgb_model_update.py --n-trials 2000 --target llvm
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+import tvm
+from tvm import te, auto_scheduler
+
+
+@auto_scheduler.register_workload
+def matmul(N, M, K):
+    A = te.placeholder((N, K), name="A")
+    B = te.placeholder((K, M), name="B")
+    k = te.reduce_axis((0, K), name="k")
+    C = te.compute((N, M), lambda i, j: te.sum(A[i][k] * B[k][j], axis=[k]), name="C")
+    return [A, B, C]
+
+
+class TimedModel(auto_scheduler.XGBModel):
+    """XGBModel recording the time spent in update"""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.update_time = 0
+
+    def update(self, inputs, results):
+        tic = time.time()
+        super().update(inputs, results)
+        self.update_time += time.time() - tic
+
+
+def search(task, model, n_trials, log_file):
+    """Search with a cost model, return the best latency in ms"""
+    measure_ctx = auto_scheduler.LocalRPCMeasureContext(min_repeat_ms=300)
+    tune_option = auto_scheduler.TuningOptions(
+        num_measure_trials=n_trials,
+        runner=measure_ctx.runner,
+        measure_callbacks=[auto_scheduler.RecordToFile(log_file)],
+        verbose=0,
+    )
+    policy = auto_scheduler.SketchPolicy(task, model, verbose=0)
+    auto_scheduler.auto_schedule(task, policy, tune_option)
+    del measure_ctx
+    _, res = auto_scheduler.load_best(log_file, task.workload_key)
+    return np.mean([x.value for x in res.costs]) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-trials", type=int, default=2000)
+    parser.add_argument("--size", type=int, default=1024)
+    parser.add_argument("--target", type=str, default="llvm")
+    parser.add_argument("--window-size", type=int, default=4096)
+    args = parser.parse_args()
+
+    task = auto_scheduler.create_task(
+        matmul, (args.size, args.size, args.size), tvm.target.Target(args.target)
+    )
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for name, kwargs in [
+            ("full retrain", {}),
+            ("incremental", {"incremental": True, "window_size": args.window_size}),
+        ]:
+            model = TimedModel(**kwargs)
+            log_file = os.path.join(tmp_dir, "%s.json" % name.replace(" ", "_"))
+            tic = time.time()
+            latency = search(task, model, args.n_trials, log_file)
+            print(
+                "%s: search %.1f s (model update %.1f s), best latency %.4f ms"
+                % (name, time.time() - tic, model.update_time, latency)
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,95 @@
+"""Measure graph tuning time and the achieved end-to-end latency
+with and without dominance pruning of DP states.
+
+python graph_tuner.py --network resnet-50 --records r50.log --target "llvm -mcpu=skylake-avx512"
+"""
+import argparse
+import os
+import tempfile
+import time
+
+import numpy as np
+
+import tvm
+from tvm import autotvm, relay
+import tvm.relay.testing
+from tvm.autotvm.graph_tuner import DPTuner
+import tvm.contrib.graph_runtime as runtime
+
+
+def get_network(name, batch_size, dtype="float32"):
+    """Get the relay module of a network"""
+    input_shape = (batch_size, 3, 224, 224)
+    if "resnet" in name:
+        n_layer = int(name.split("-")[1])
+        mod, params = relay.testing.resnet.get_workload(
+            num_layers=n_layer, batch_size=batch_size, dtype=dtype
+        )
+    elif name == "inception_v3":
+        input_shape = (batch_size, 3, 299, 299)
+        mod, params = relay.testing.inception_v3.get_workload(batch_size=batch_size, dtype=dtype)
+    else:
+        raise ValueError("Unsupported network: " + name)
+    return mod, params, input_shape
+
+
+def evaluate(mod, params, input_shape, target, opt_sch_file, dtype="float32"):
+    """Build with the graph tuning result and measure the latency in ms"""
+    with autotvm.apply_graph_best(opt_sch_file):
+        with tvm.transform.PassContext(opt_level=3):
+            lib = relay.build_module.build(mod, target=target, params=params)
+    ctx = tvm.cpu()
+    module = runtime.GraphModule(lib["default"](ctx))
+    module.set_input("data", tvm.nd.array(np.random.uniform(size=input_shape).astype(dtype)))
+    ftimer = module.module.time_evaluator("run", ctx, number=100, repeat=3)
+    return np.mean(ftimer().results) * 1000
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--network", type=str, default="resnet-50")
+    parser.add_argument("--records", type=str, required=True, help="kernel tuning log")
+    parser.add_argument("--target", type=str, default="llvm")
+    parser.add_argument("--batch-size", type=int, default=1)
+    parser.add_argument("--n-parallel", type=int, default=os.cpu_count())
+    parser.add_argument("--min-exec-num", type=int, default=2000)
+    args = parser.parse_args()
+
+    mod, params, input_shape = get_network(args.network, args.batch_size)
+    target_ops = [relay.op.get("nn.conv2d")]
+    layout_records = None
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        for prune in [False, True]:
+            tuner = DPTuner(
+                mod["main"],
+                {"data": input_shape},
+                args.records,
+                target_ops,
+                args.target,
+                log_file=os.path.join(tmp_dir, "graph_tuner.log"),
+            )
+            tic = time.time()
+            # the second run reuses the measured layout transforms
+            tuner.benchmark_layout_transform(
+                min_exec_num=args.min_exec_num,
+                n_parallel=args.n_parallel,
+                layout_records=layout_records,
+            )
+            benchmark_time = time.time() - tic
+            layout_records = list(tuner.layout_transform_perf_records.values())
+
+            tic = time.time()
+            tuner.run(prune=prune)
+            dp_time = time.time() - tic
+
+            opt_sch_file = os.path.join(tmp_dir, "opt_%d.log" % prune)
+            tuner.write_opt_sch2record_file(opt_sch_file)
+            latency = evaluate(mod, params, input_shape, args.target, opt_sch_file)
+            print(
+                "%s prune=%s: layout benchmark %.1f s, DP %.2f s, %d states, latency %.3f ms"
+                % (args.network, prune, benchmark_time, dp_time, tuner._num_states, latency)
+            )
+
+
+if __name__ == "__main__":
+    main()
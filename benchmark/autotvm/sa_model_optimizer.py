@@ -0,0 +1,124 @@
+"""Compare the vectorized simulated annealing optimizer with the
+per-point implementation on conv2d tasks.
+
+python sa_model_optimizer.py --n-iter 500 --parallel-size 128
+"""
+import argparse
+import heapq
+import time
+
+import numpy as np
+
+import tvm
+from tvm import te, autotvm
+from tvm.autotvm.tuner.xgboost_cost_model import XGBoostCostModel
+from tvm.autotvm.tuner.sa_model_optimizer import SimulatedAnnealingOptimizer, random_walk
+from tvm.autotvm.util import sample_ints
+
+
+CONV2D_SHAPES = [
+    # N, C, H, W, K, R, S, stride, padding
+    (1, 64, 56, 56, 64, 3, 3, 1, 1),
+    (1, 128, 28, 28, 128, 3, 3, 1, 1),
+    (1, 256, 14, 14, 256, 3, 3, 1, 1),
+    (1, 512, 7, 7, 512, 3, 3, 1, 1),
+]
+
+
+def per_point_find_maximums(optimizer, model, num, exclusive):
+    """The per-point SA loop, as the baseline"""
+    points = np.array(
+        sample_ints(0, len(optimizer.task.config_space), optimizer.parallel_size)
+    )
+    scores = model.predict(points)
+    heap_items = [(float("-inf"), -1 - i) for i in range(num)]
+    heapq.heapify(heap_items)
+    in_heap = set(exclusive)
+    in_heap.update([x[1] for x in heap_items])
+    for s, p in zip(scores, points):
+        if s > heap_items[0][0] and p not in in_heap:
+            pop = heapq.heapreplace(heap_items, (s, p))
+            in_heap.remove(pop[1])
+            in_heap.add(p)
+    t = optimizer.temp[0]
+    cool = 1.0 * (optimizer.temp[0] - optimizer.temp[1]) / (optimizer.n_iter + 1)
+    k = 0
+    k_last_modify = 0
+    while k < optimizer.n_iter and k < k_last_modify + optimizer.early_stop:
+        new_points = np.empty_like(points)
+        for i, p in enumerate(points):
+            new_points[i] = random_walk(p, optimizer.dims)
+        new_scores = model.predict(new_points)
+        ac_prob = np.exp(np.minimum((new_scores - scores) / (t + 1e-5), 1))
+        ac_index = np.random.random(len(ac_prob)) < ac_prob
+        points[ac_index] = new_points[ac_index]
+        scores[ac_index] = new_scores[ac_index]
+        for s, p in zip(new_scores, new_points):
+            if s > heap_items[0][0] and p not in in_heap:
+                pop = heapq.heapreplace(heap_items, (s, p))
+                in_heap.remove(pop[1])
+                in_heap.add(p)
+                k_last_modify = k
+        k += 1
+        t -= cool
+    heap_items.sort(key=lambda item: -item[0])
+    return [x[1] for x in heap_items if x[0] >= 0]
+
+
+def make_task(shape):
+    N, C, H, W, K, R, S, stride, padding = shape
+    data = te.placeholder((N, C, H, W), name="data")
+    kernel = te.placeholder((K, C, R, S), name="kernel")
+    return autotvm.task.create(
+        "conv2d_nchw.cuda",
+        args=(data, kernel, (stride, stride), (padding, padding), (1, 1), "float32"),
+        target="cuda",
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--n-iter", type=int, default=500)
+    parser.add_argument("--parallel-size", type=int, default=128)
+    parser.add_argument("--num", type=int, default=64)
+    parser.add_argument("--n-chains", type=int, default=4)
+    parser.add_argument("--n-workers", type=int, default=4)
+    args = parser.parse_args()
+
+    for shape in CONV2D_SHAPES:
+        task = make_task(shape)
+        # a cheap model fitted on random scores, prediction cost is the same for both
+        model = XGBoostCostModel(task, feature_type="knob", loss_type="rank")
+        xs = np.array(sample_ints(0, len(task.config_space), 256))
+        model.fit(xs, np.random.random(len(xs)), plan_size=64)
+
+        results = []
+        for name, n_chains, n_workers in [
+            ("per-point", 1, 1),
+            ("vectorized", 1, 1),
+            ("vectorized-chains", args.n_chains, args.n_workers),
+        ]:
+            optimizer = SimulatedAnnealingOptimizer(
+                task,
+                n_iter=args.n_iter,
+                parallel_size=args.parallel_size,
+                persistent=False,
+                early_stop=None,
+                n_chains=n_chains,
+                n_workers=n_workers,
+            )
+            tic = time.time()
+            if name == "per-point":
+                maximums = per_point_find_maximums(optimizer, model, args.num, set())
+            else:
+                maximums = optimizer.find_maximums(model, args.num, set())
+            cost = time.time() - tic
+            best = np.max(model.predict(np.array(maximums))) if maximums else float("nan")
+            results.append("%s: %.2f s (best score %.4f)" % (name, cost, best))
+        print("conv2d", shape, "space size", len(task.config_space))
+        for line in results:
+            print("  " + line)
+
+
+if __name__ == "__main__":
+    main()
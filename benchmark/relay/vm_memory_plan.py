@@ -0,0 +1,69 @@
+"""Report the static memory of the regions planned by the VM compiler,
+with and without reusing the memory of dead intermediates.
+
+python vm_memory_plan.py --network resnet-50 --target llvm
+python vm_memory_plan.py --network bert --target llvm
+"""
+import argparse
+import logging
+
+import tvm
+from tvm import relay
+import tvm.relay.testing
+from tvm.relay.transform import memory_plan
+
+
+class RegionStats(logging.Handler):
+    """Collect the region sizes logged by the MemoryPlan pass"""
+
+    def __init__(self):
+        super().__init__(logging.DEBUG)
+        self.coalesced = 0
+        self.reused = 0
+
+    def emit(self, record):
+        _, coalesced, reused = record.args
+        self.coalesced += coalesced
+        self.reused += reused
+
+
+def get_network(name, batch_size):
+    """Get the relay module of a network"""
+    if "resnet" in name:
+        n_layer = int(name.split("-")[1])
+        return relay.testing.resnet.get_workload(num_layers=n_layer, batch_size=batch_size)
+    if name == "mobilenet":
+        return relay.testing.mobilenet.get_workload(batch_size=batch_size)
+    if name == "bert":
+        import torch
+        from transformers import BertConfig, BertModel
+
+        model = BertModel(BertConfig(torchscript=True)).eval()
+        inputs = torch.randint(0, 30522, (batch_size, 128))
+        scripted_model = torch.jit.trace(model, inputs).eval()
+        return relay.frontend.from_pytorch(scripted_model, [("input_ids", inputs.shape)])
+    raise ValueError("Unsupported network: " + name)
+
+
+def main():
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--network", type=str, default="resnet-50")
+    parser.add_argument("--target", type=str, default="llvm")
+    parser.add_argument("--batch-size", type=int, default=1)
+    args = parser.parse_args()
+
+    mod, params = get_network(args.network, args.batch_size)
+    stats = RegionStats()
+    memory_plan.logger.addHandler(stats)
+    memory_plan.logger.setLevel(logging.DEBUG)
+    # each planned region logs its size both without and with reuse
+    with tvm.transform.PassContext(opt_level=3, config={"relay.MemoryPlan.reuse": True}):
+        relay.vm.compile(mod, target=args.target, params=params)
+    print(
+        "%s: %.2f MB without reuse, %.2f MB with reuse"
+        % (args.network, stats.coalesced / 2 ** 20, stats.reused / 2 ** 20)
+    )
+
+
+if __name__ == "__main__":
+    main()
@@ -67,12 +67,15 @@
 
 #include <string>
 #include <unordered_set>
+#include <utility>
 #include <vector>
 
 namespace tvm {
 namespace auto_scheduler {
 
 class ProgramMeasurer;
+class MeasureInput;
+class MeasureResult;
 class SearchPolicyNode;
 
 /*!
@@ -171,6 +174,17 @@ class SearchPolicyNode : public Object {
   virtual State Search(int num_measure_trials, int early_stopping, int num_measures_per_round,
                        ProgramMeasurer measurer) = 0;
 
+  /*!
+   * \brief Continue the search by doing an additional search round.
+   * This is used by the task scheduler to interleave the search of several tasks, the
+   * measurer is shared by all of them and is not reset.
+   * \param num_measure The number of programs to measure in this round.
+   * \param measurer The ProgramMeasurer to build and measure programs.
+   * \return The measured inputs and results in this round.
+   */
+  virtual std::pair<Array<MeasureInput>, Array<MeasureResult>> ContinueSearchOneRound(
+      int num_measure, ProgramMeasurer measurer) = 0;
+
   /*!
    * \brief Preload measured states from a log file to resume the state of the search policy.
    * \param log_file The name of the record log file.
@@ -24,6 +24,7 @@ from . import loop_state
 from . import utils
 from . import workload_registry
 from . import feature
+from . import task_scheduler
 
 # Shortcut
 from .auto_schedule import SearchTask, TuningOptions, HardwareParams, create_task, auto_schedule
@@ -37,6 +38,14 @@ from .measure import (
     RPCRunner,
     LocalRPCMeasureContext,
 )
-from .measure_record import RecordToFile, RecordReader, load_best, load_records, save_records
+from .measure_record import (
+    RecordToFile,
+    RecordReader,
+    RecordIndex,
+    load_best,
+    load_records,
+    save_records,
+)
 from .search_policy import EmptyPolicy, SketchPolicy, PreloadMeasuredStates
+from .task_scheduler import TaskScheduler
 from .workload_registry import register_workload, make_workload_key
@@ -76,6 +76,76 @@ class XGBDMatrixContext:
 dmatrix_context = XGBDMatrixContext()
 
 
+class FlatFeatureBuffer:
+    """Store the multi-stage features of measure records in a preallocated flat buffer.
+    The features of record i are rows[offsets[i]:offsets[i + 1]].
+
+    Parameters
+    ----------
+    capacity: int
+        The initial number of rows
+    """
+
+    def __init__(self, capacity=4096):
+        self.capacity = capacity
+        self.rows = None
+        self.offsets = np.zeros(1, dtype=np.int64)
+
+    def __len__(self):
+        return len(self.offsets) - 1
+
+    def append(self, features):
+        """Append the features of new records
+        Parameters
+        ----------
+        features: List[np.ndarray]
+            The feature of each record, with shape (n_stage, vec_len)
+        """
+        if len(features) == 0:
+            return
+        counts = np.array([len(x) for x in features], dtype=np.int64)
+        n_rows = int(self.offsets[-1])
+        n_new = int(np.sum(counts))
+        vec_len = features[0].shape[-1]
+        if self.rows is None or len(self.rows) < n_rows + n_new:
+            size = max(self.capacity, n_rows + n_new)
+            if self.rows is not None:
+                size = max(size, 2 * len(self.rows))
+            rows = np.empty((size, vec_len), dtype=np.float32)
+            if self.rows is not None:
+                rows[:n_rows] = self.rows[:n_rows]
+            self.rows = rows
+        self.rows[n_rows : n_rows + n_new] = np.concatenate(features, axis=0)
+        self.offsets = np.concatenate([self.offsets, n_rows + np.cumsum(counts)])
+
+    def get(self, record_id):
+        """Get the feature of a record"""
+        return self.rows[self.offsets[record_id] : self.offsets[record_id + 1]]
+
+    def take(self, record_ids):
+        """Gather the features of records
+
+        Parameters
+        ----------
+        record_ids: np.ndarray
+            The record ids
+
+        Returns
+        -------
+        x_flatten: np.ndarray
+            The feature rows of all records
+        pack_ids: np.ndarray
+            The position in record_ids of each row
+        """
+        record_ids = np.asarray(record_ids, dtype=np.int64)
+        starts = self.offsets[record_ids]
+        counts = self.offsets[record_ids + 1] - starts
+        pack_ids = np.repeat(np.arange(len(record_ids)), counts)
+        # the index of each row inside its record
+        inner = np.arange(len(pack_ids)) - np.repeat(np.cumsum(counts) - counts, counts)
+        return self.rows[np.repeat(starts, counts) + inner], pack_ids
+
+
 class XGBModel(PythonBasedModel):
     """Train a XGBoost model to predict the normalized throughputs of programs.
     Let the normalized throughput be the score of a program (higher is better). We predict
@@ -91,9 +161,42 @@ class XGBModel(PythonBasedModel):
     of several samples, so we implemented a custom loss function and call it pack-sum-rmse.
     It is called "pack-sum" because we combine several samples into a "pack" and sum up
     their predictions.
+
+    By default, a new model is trained on the full history after every measurement batch.
+    In the incremental mode, boosting continues from the previous model on a bounded
+    training window: all new records plus old records sampled with probability increasing
+    with their throughput, weighted by the inverse of that probability. The model is
+    retrained from scratch on the window every `full_retrain_interval` updates to bound
+    the number of trees.
+
+    Parameters
+    ----------
+    verbose_eval: int
+        Print training log every `verbose_eval` iterations.
+    num_warmup_sample: int
+        The cost model predicts random scores until it has this number of samples.
+    seed: Optional[int]
+        The random seed.
+    incremental: bool
+        Whether to use the incremental mode.
+    window_size: int
+        The max number of records in a training window of the incremental mode.
+    num_incremental_rounds: int
+        The max number of boosting rounds added in an incremental update.
+    full_retrain_interval: int
+        Retrain from scratch every this number of updates in the incremental mode.
     """
 
-    def __init__(self, verbose_eval=25, num_warmup_sample=100, seed=None):
+    def __init__(
+        self,
+        verbose_eval=25,
+        num_warmup_sample=100,
+        seed=None,
+        incremental=False,
+        window_size=4096,
+        num_incremental_rounds=50,
+        full_retrain_interval=10,
+    ):
         self.xgb_params = {
             "max_depth": 10,
             "gamma": 0.001,
@@ -110,17 +213,23 @@ class XGBModel(PythonBasedModel):
         self.plan_size = 32
         self.num_warmup_sample = num_warmup_sample
         self.verbose_eval = verbose_eval
+        self.incremental = incremental
+        self.window_size = window_size
+        self.num_incremental_rounds = num_incremental_rounds
+        self.full_retrain_interval = full_retrain_interval
+        self.num_updates = 0
+        self.rng = np.random.RandomState(seed or 43)
 
         super().__init__()
 
         # cache measurement input/result pairs and extracted features
         self.inputs = []
         self.results = []
-        self.inputs_feature_cache = []
+        self.feature_buffer = FlatFeatureBuffer()
 
     def update(self, inputs, results):
         """Update the cost model according to new measurement results (training data).
-        XGBoost does not support incremental training, so we re-train a new model every time.
+        Re-train a new model every time, or continue boosting in the incremental mode.
         Parameters
         ----------
         inputs : List[MeasureInput]
@@ -135,29 +244,47 @@ class XGBModel(PythonBasedModel):
         self.inputs.extend(inputs)
         self.results.extend(results)
 
-        # extract feature
-        n_cached = len(self.inputs_feature_cache)
+        # extract feature, the features of old records are in the buffer
+        n_cached = len(self.feature_buffer)
         features, normalized_throughputs, task_ids = get_per_store_features_from_measure_pairs(
             self.inputs, self.results, skip_first_n_feature_extraction=n_cached
         )
-        if n_cached > 0:
-            features = list(features)
-            features[:n_cached] = self.inputs_feature_cache
-            features = np.array(features, dtype=object)
-        self.inputs_feature_cache = features
-        dtrain = pack_sum_xgbmatrix(
-            features, normalized_throughputs, task_ids, normalized_throughputs
+        self.feature_buffer.append(features[n_cached:])
+
+        if not self.incremental:
+            record_ids = np.arange(len(self.inputs))
+            weights = normalized_throughputs
+        else:
+            record_ids, importance = self._sample_window(normalized_throughputs, n_cached)
+            weights = normalized_throughputs[record_ids] * importance
+        dtrain = buffer_to_pack_sum_xgbmatrix(
+            self.feature_buffer,
+            record_ids,
+            normalized_throughputs[record_ids],
+            task_ids[record_ids],
+            weights,
+        )
+
+        warm_start = (
+            self.incremental
+            and self.bst is not None
+            and self.num_updates % self.full_retrain_interval != 0
         )
+        self.num_updates += 1
+        if warm_start:
+            # the early stopping state of the last training is not comparable on new data
+            self.bst.set_attr(best_score=None, best_iteration=None, best_msg=None)
 
         # train xgb model
         self.bst = xgb.train(
             self.xgb_params,
             dtrain,
-            num_boost_round=10000,
+            num_boost_round=self.num_incremental_rounds if warm_start else 10000,
             obj=pack_sum_square_error,
+            xgb_model=self.bst if warm_start else None,
             callbacks=[
                 custom_callback(
-                    stopping_rounds=50,
+                    stopping_rounds=10 if warm_start else 50,
                     metric="tr-p-rmse",
                     fevals=[
                         pack_sum_rmse,
@@ -170,6 +297,41 @@ class XGBModel(PythonBasedModel):
             ],
         )
 
+    def _sample_window(self, normalized_throughputs, n_old):
+        """Sample the training window of the incremental mode.
+        Parameters
+        ----------
+        normalized_throughputs: np.ndarray
+            The normalized throughputs of all records
+        n_old: int
+            The number of records before the last measurement batch
+        Returns
+        -------
+        record_ids: np.ndarray
+            The records in the window
+        importance: np.ndarray
+            The importance weight of each record in the window
+        """
+        n_total = len(normalized_throughputs)
+        new_ids = np.arange(n_old, n_total)
+        n_sample = self.window_size - len(new_ids)
+        if n_sample >= n_old:
+            return np.arange(n_total), np.ones(n_total)
+        if n_sample <= 0:
+            return new_ids, np.ones(len(new_ids))
+
+        # prefer the fast programs, which decide the ranking near the top,
+        # but keep some chance for the slow and failed ones
+        prob = normalized_throughputs[:n_old] + 0.05
+        prob = prob / np.sum(prob)
+        old_ids = self.rng.choice(n_old, n_sample, replace=False, p=prob)
+        importance = 1.0 / (prob[old_ids] * n_old)
+        importance = np.clip(importance / np.mean(importance), 0.1, 10.0)
+        return (
+            np.concatenate([new_ids, np.sort(old_ids)]),
+            np.concatenate([np.ones(len(new_ids)), importance[np.argsort(old_ids)]]),
+        )
+
     def predict(self, task, states):
         """Predict the scores of states
         Parameters
@@ -322,6 +484,51 @@ def feature_to_pack_sum_xgbmatrix(xs):
     return xgb.DMatrix(np.array(x_flatten)), pack_ids
 
 
+def buffer_to_pack_sum_xgbmatrix(buffer, record_ids, ys, gids=None, weights=None):
+    """Convert the records in a feature buffer into a xgb matrix with pack-sum format.
+    This is the vectorized version of `pack_sum_xgbmatrix`.
+    Parameters
+    ----------
+    buffer: FlatFeatureBuffer
+        The feature buffer
+    record_ids: np.ndarray
+        The records in the buffer
+    ys: np.ndarray
+        The normaizlied throughput of each record
+    gids: Optional[np.ndarray]
+        Group id (task id) of each record
+    weights: Optional[np.ndarray]
+        The weight of each record
+    Returns
+    -------
+    dmatrix: xgb.DMatrix
+        The DMatrix with pack-sum information
+    """
+    record_ids = np.asarray(record_ids)
+    ys = np.asarray(ys)
+    if gids is not None:
+        # sort by group
+        gids = np.asarray(gids, dtype=np.int64)
+        indices = gids.argsort(kind="stable")
+        record_ids, ys = record_ids[indices], ys[indices]
+        group_sizes = np.bincount(gids)
+        # a task may have no record in a training window
+        group_sizes = group_sizes[group_sizes > 0]
+        if weights is not None:
+            weights = np.asarray(weights)[indices]
+    else:
+        # assume it has only one group
+        group_sizes = [len(record_ids)]
+
+    x_flatten, pack_ids = buffer.take(record_ids)
+    ret = xgb.DMatrix(x_flatten, ys[pack_ids])
+    if weights is not None:
+        ret.set_weight(weights[pack_ids])
+    dmatrix_context.set("pack_ids", ret, pack_ids)
+    dmatrix_context.set("group_sizes", ret, group_sizes)
+    return ret
+
+
 def pack_sum_xgbmatrix(xs, ys, gids=None, weights=None):
     """Convert (feature, label) pairs into a xgb matrix with pack-sum format
     Parameters
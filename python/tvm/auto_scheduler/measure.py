@@ -38,6 +38,8 @@ import traceback
 import tempfile
 import multiprocessing
 
+import numpy as np
+
 import tvm._ffi
 from tvm.runtime import Object, module, ndarray
 from tvm.driver import build_module
@@ -52,6 +54,7 @@ from .loop_state import StateObject
 from .utils import (
     get_const_tuple,
     NoDaemonPool,
+    PersistentPool,
     call_func_with_timeout,
     request_remote,
     check_remote,
@@ -62,9 +65,21 @@ MAX_ERROR_MSG_LEN = 512**2
 
 # We use fork and a global variable to copy arguments between processes.
 # This can avoid expensive serialization of TVM IR when using multiprocessing.Pool
-GLOBAL_BUILD_ARGUMENTS = None
 GLOBAL_RUN_ARGUMENTS = None
 
+# The persistent worker pools of LocalBuilder and LocalRunner, created on the first use.
+# The tasks are shared with the build workers by fork, the workers are restarted when a new
+# task shows up. Only the transform steps of the inputs are sent to the workers.
+LOCAL_BUILD_POOL = None
+LOCAL_BUILD_TASKS = []
+LOCAL_BUILD_TASK_IDS = {}
+LOCAL_RUN_POOL = None
+
+# The argument buffers of a LocalRunner worker, by (shape, dtype, context).
+# They are randomly filled once and reused by all following programs.
+LOCAL_RUN_BUFFERS = {}
+LOCAL_RUN_BUFFER_MAX_BYTES = 1 << 30
+
 
 @tvm._ffi.register_object("auto_scheduler.MeasureCallback")
 class MeasureCallback(Object):
@@ -459,29 +474,26 @@ def make_error_msg():
     return error_msg
 
 
-def local_build_worker(index):
+def local_build_worker(task_idx, serialized_input, build_func, verbose):
     """
-    Build function of LocalBuilder to be ran in the Builder thread pool.
+    Build function of LocalBuilder to be ran in the persistent build workers.
 
     Parameters
     ----------
-    index : int
-        The MeasureInput index to be processed by the current Builder thread.
+    task_idx : int
+        The index of the task in LOCAL_BUILD_TASKS.
+    serialized_input : str
+        The MeasureInput serialized by SerializeMeasureInput.
+    build_func : str
+        The name of build function to process the built module.
+    verbose: int
+        Verbosity level. 0 for silent, 1 to output information during program building.
 
     Returns
     -------
-    res : BuildResult
-        The build result of this Builder thread.
+    res : Tuple
+        The fields of the BuildResult.
     """
-    global GLOBAL_BUILD_ARGUMENTS
-
-    # We use fork and a global variable to copy arguments between processes.
-    # This can avoid expensive serialization of TVM IR when using multiprocessing.Pool
-    if not GLOBAL_BUILD_ARGUMENTS:
-        raise ValueError("GLOBAL_BUILD_ARGUMENTS not found")
-    measure_inputs, build_func, timeout, verbose = GLOBAL_BUILD_ARGUMENTS
-    assert isinstance(build_func, str)
-
     if build_func == "default":
         build_func = tar.tar
     elif build_func == "ndk":
@@ -489,54 +501,45 @@ def local_build_worker(index):
     else:
         raise ValueError("Invalid build_func" + build_func)
 
-    def timed_func():
-        tic = time.time()
-        inp = measure_inputs[index]
-        task = inp.task
+    tic = time.time()
+    task = LOCAL_BUILD_TASKS[task_idx]
+    state = _ffi_api.DeserializeMeasureInput(serialized_input).state
 
-        error_no = MeasureErrorNo.NO_ERROR
-        error_msg = None
-        args = []
+    error_no = MeasureErrorNo.NO_ERROR
+    error_msg = None
+    args = []
+
+    try:
+        sch, args = task.compute_dag.apply_steps_from_state(state, layout_rewrite=True)
+    # pylint: disable=broad-except
+    except Exception:
+        error_no = MeasureErrorNo.INSTANTIATION_ERROR
+        error_msg = make_error_msg()
+
+    if error_no == 0:
+        dirname = tempfile.mkdtemp()
+        filename = os.path.join(dirname, "tmp_func." + build_func.output_format)
 
         try:
-            sch, args = task.compute_dag.apply_steps_from_state(inp.state, layout_rewrite=True)
+            # TODO(merrymercy): Port the unroll pass.
+            with transform.PassContext():
+                func = build_module.build(
+                    sch, args, target=task.target, target_host=task.target_host
+                )
+            func.export_library(filename, build_func)
         # pylint: disable=broad-except
         except Exception:
-            error_no = MeasureErrorNo.INSTANTIATION_ERROR
+            error_no = MeasureErrorNo.COMPILE_HOST
             error_msg = make_error_msg()
+    else:
+        filename = ""
 
-        if error_no == 0:
-            dirname = tempfile.mkdtemp()
-            filename = os.path.join(dirname, "tmp_func." + build_func.output_format)
-
-            try:
-                # TODO(merrymercy): Port the unroll pass.
-                with transform.PassContext():
-                    func = build_module.build(
-                        sch, args, target=task.target, target_host=task.target_host
-                    )
-                func.export_library(filename, build_func)
-            # pylint: disable=broad-except
-            except Exception:
-                error_no = MeasureErrorNo.COMPILE_HOST
-                error_msg = make_error_msg()
+    if verbose >= 1:
+        if error_no == MeasureErrorNo.NO_ERROR:
+            print(".", end="")
         else:
-            filename = ""
-
-        if verbose >= 1:
-            if error_no == MeasureErrorNo.NO_ERROR:
-                print(".", end="")
-            else:
-                print(".E", end="")  # Build error
-        return filename, args, error_no, error_msg, time.time() - tic
-
-    res = call_func_with_timeout(timeout, timed_func)
-    if isinstance(res, TimeoutError):
-        if verbose >= 1:
-            print(".T", end="")  # Build timeout
-        res = None, [], MeasureErrorNo.BUILD_TIMEOUT, None, timeout
-
-    return res
+            print(".E", end="")  # Build error
+    return filename, args, error_no, error_msg, time.time() - tic
 
 
 @tvm._ffi.register_func("auto_scheduler.local_builder.build")
@@ -563,20 +566,35 @@ def local_builder_build(inputs, timeout, n_parallel, build_func="default", verbo
     res : List[BuildResult]
         The build results of these MeasureInputs.
     """
-    # We use fork and a global variable to copy arguments between processes.
-    # This can avoid expensive serialization of TVM IR when using multiprocessing.Pool
-    global GLOBAL_BUILD_ARGUMENTS
-
-    GLOBAL_BUILD_ARGUMENTS = (inputs, build_func, timeout, verbose)
-
-    pool = NoDaemonPool(n_parallel)
-    tuple_res = pool.map(local_build_worker, range(len(inputs)))
-    pool.terminate()
-    pool.join()
-    del pool
+    global LOCAL_BUILD_POOL
+
+    if LOCAL_BUILD_POOL is None or LOCAL_BUILD_POOL.n_parallel != n_parallel:
+        if LOCAL_BUILD_POOL is not None:
+            LOCAL_BUILD_POOL.close()
+        LOCAL_BUILD_POOL = PersistentPool(n_parallel)
+
+    args_list = []
+    for inp in inputs:
+        # The handle identifies the task object, the task is kept alive by the table
+        key = (inp.task.handle.value, inp.task.workload_key)
+        if key not in LOCAL_BUILD_TASK_IDS:
+            LOCAL_BUILD_TASK_IDS[key] = len(LOCAL_BUILD_TASKS)
+            LOCAL_BUILD_TASKS.append(inp.task)
+            # Let the workers see the new task
+            LOCAL_BUILD_POOL.restart()
+        task_idx = LOCAL_BUILD_TASK_IDS[key]
+        args_list.append((task_idx, _ffi_api.SerializeMeasureInput(inp), build_func, verbose))
 
     results = []
-    for res in tuple_res:
+    for res in LOCAL_BUILD_POOL.map_with_timeout(local_build_worker, args_list, timeout):
+        if isinstance(res, TimeoutError):
+            if verbose >= 1:
+                print(".T", end="")  # Build timeout
+            res = None, [], MeasureErrorNo.BUILD_TIMEOUT, None, timeout
+        elif isinstance(res, RuntimeError):
+            if verbose >= 1:
+                print(".E", end="")  # Build error
+            res = None, [], MeasureErrorNo.COMPILE_HOST, str(res), timeout
         results.append(BuildResult(*res))
 
     return results
@@ -638,62 +656,12 @@ def local_run(
     res : List[MeasureResult]
         The measure results of these MeasureInputs.
     """
-    max_float = 1e10  # We use 1e10 instead of sys.float_info.max for better readability in log
-
-    def timed_func(inp, build_res):
-        tic = time.time()
-        error_no = 0
-        error_msg = None
-        try:
-            func = module.load_module(build_res.filename)
-            ctx = ndarray.context(str(inp.task.target), 0)
-            # Limitation:
-            # We can not get PackFunction directly in the remote mode as it is wrapped
-            # under the std::function. We could lift the restriction later once we fold
-            # the PackedFunc as an object. Currently, we pass function name to work
-            # around it.
-            f_prepare = "cache_flush_cpu_non_first_arg" if enable_cpu_cache_flush else ""
-            time_f = func.time_evaluator(
-                func.entry_name,
-                ctx,
-                number=number,
-                repeat=repeat,
-                min_repeat_ms=min_repeat_ms,
-                f_preproc=f_prepare,
-            )
-        # pylint: disable=broad-except
-        except Exception:
-            costs = (max_float,)
-            error_no = MeasureErrorNo.COMPILE_DEVICE
-            error_msg = make_error_msg()
-
-        if error_no == 0:
-            try:
-                args = [
-                    ndarray.empty(get_const_tuple(x.shape), x.dtype, ctx) for x in build_res.args
-                ]
-                random_fill = tvm.get_global_func("tvm.contrib.random.random_fill", True)
-                assert random_fill, "Please make sure USE_RANDOM is ON in the config.cmake"
-                for arg in args:
-                    random_fill(arg)
-                ctx.sync()
-                costs = time_f(*args).results
-            # pylint: disable=broad-except
-            except Exception:
-                costs = (max_float,)
-                error_no = MeasureErrorNo.RUNTIME_DEVICE
-                error_msg = make_error_msg()
+    global LOCAL_RUN_POOL
 
-        shutil.rmtree(os.path.dirname(build_res.filename))
-        toc = time.time()
-        time.sleep(cooldown_interval)
+    max_float = 1e10  # We use 1e10 instead of sys.float_info.max for better readability in log
 
-        if verbose >= 1:
-            if error_no == MeasureErrorNo.NO_ERROR:
-                print("*", end="")
-            else:
-                print("*E", end="")  # Run error
-        return costs, error_no, error_msg, toc - tic + build_res.time_cost, toc
+    if LOCAL_RUN_POOL is None:
+        LOCAL_RUN_POOL = PersistentPool(1)
 
     measure_results = []
     assert len(inputs) == len(build_results), "Measure input size should be equal to build results"
@@ -707,8 +675,26 @@ def local_run(
                 time.time(),
             )
         else:
-            res = call_func_with_timeout(timeout, timed_func, args=(inp, build_res))
-            if isinstance(res, TimeoutError):
+            tic = time.time()
+            arg_info = [(get_const_tuple(x.shape), x.dtype) for x in build_res.args]
+            ret = LOCAL_RUN_POOL.map_with_timeout(
+                local_run_worker,
+                [
+                    (
+                        build_res.filename,
+                        str(inp.task.target),
+                        arg_info,
+                        number,
+                        repeat,
+                        min_repeat_ms,
+                        enable_cpu_cache_flush,
+                    )
+                ],
+                timeout,
+            )[0]
+            shutil.rmtree(os.path.dirname(build_res.filename), ignore_errors=True)
+            toc = time.time()
+            if isinstance(ret, TimeoutError):
                 if verbose >= 1:
                     print("*T", end="")  # Run timeout
                 res = (
@@ -716,8 +702,20 @@ def local_run(
                     MeasureErrorNo.RUN_TIMEOUT,
                     None,
                     build_res.time_cost + timeout,
-                    time.time(),
+                    toc,
                 )
+            else:
+                if isinstance(ret, RuntimeError):
+                    # The worker crashed, e.g. by a segfault in the program
+                    ret = (max_float,), MeasureErrorNo.RUNTIME_DEVICE, str(ret)
+                costs, error_no, error_msg = ret
+                if verbose >= 1:
+                    if error_no == MeasureErrorNo.NO_ERROR:
+                        print("*", end="")
+                    else:
+                        print("*E", end="")  # Run error
+                res = costs, error_no, error_msg, toc - tic + build_res.time_cost, toc
+            time.sleep(cooldown_interval)
         measure_results.append(MeasureResult(*res))
 
     if verbose >= 1:
@@ -726,6 +724,129 @@ def local_run(
     return measure_results
 
 
+def get_run_buffers(arg_info, ctx):
+    """Get the randomly filled argument buffers of a program in a LocalRunner worker.
+
+    The buffers are reused across programs, several arguments of the same shape and dtype in
+    one program get different buffers.
+
+    Parameters
+    ----------
+    arg_info : List[Tuple[Tuple[int], str]]
+        The shape and dtype of every argument.
+    ctx : TVMContext
+        The context to allocate on.
+
+    Returns
+    -------
+    args : List[NDArray]
+        The argument buffers.
+    """
+    required = {}
+    for shape, dtype in arg_info:
+        key = (shape, dtype, str(ctx))
+        required[key] = required.get(key, 0) + 1
+
+    def nbytes(key, count):
+        return int(np.prod(key[0])) * np.dtype(key[1]).itemsize * count
+
+    missing = {
+        key: count - len(LOCAL_RUN_BUFFERS.get(key, []))
+        for key, count in required.items()
+        if count > len(LOCAL_RUN_BUFFERS.get(key, []))
+    }
+    if missing:
+        total_bytes = sum(nbytes(key, len(bufs)) for key, bufs in LOCAL_RUN_BUFFERS.items())
+        new_bytes = sum(nbytes(key, count) for key, count in missing.items())
+        if total_bytes + new_bytes > LOCAL_RUN_BUFFER_MAX_BYTES:
+            LOCAL_RUN_BUFFERS.clear()
+            missing = required
+
+        random_fill = tvm.get_global_func("tvm.contrib.random.random_fill", True)
+        assert random_fill, "Please make sure USE_RANDOM is ON in the config.cmake"
+        for (shape, dtype, _), count in missing.items():
+            for _ in range(count):
+                arr = ndarray.empty(shape, dtype, ctx)
+                random_fill(arr)
+                LOCAL_RUN_BUFFERS.setdefault((shape, dtype, str(ctx)), []).append(arr)
+
+    args = []
+    used = {}
+    for shape, dtype in arg_info:
+        key = (shape, dtype, str(ctx))
+        args.append(LOCAL_RUN_BUFFERS[key][used.get(key, 0)])
+        used[key] = used.get(key, 0) + 1
+    ctx.sync()
+    return args
+
+
+def local_run_worker(
+    filename, target, arg_info, number, repeat, min_repeat_ms, enable_cpu_cache_flush
+):
+    """
+    Run function of LocalRunner to be ran in the persistent run worker.
+
+    Parameters
+    ----------
+    filename : str
+        The built module.
+    target : str
+        The target of the task.
+    arg_info : List[Tuple[Tuple[int], str]]
+        The shape and dtype of every argument.
+    number : int
+        The number of times to run the generated code for taking average.
+    repeat : int
+        The number of times to repeat the measurement.
+    min_repeat_ms : int
+        The minimum duration of one `repeat` in milliseconds.
+    enable_cpu_cache_flush: bool
+        Whether to flush cache on CPU between repeated measurements.
+
+    Returns
+    -------
+    res : Tuple
+        The costs, error_no and error_msg of the MeasureResult.
+    """
+    max_float = 1e10
+    error_no = 0
+    error_msg = None
+    try:
+        func = module.load_module(filename)
+        ctx = ndarray.context(target, 0)
+        # Limitation:
+        # We can not get PackFunction directly in the remote mode as it is wrapped
+        # under the std::function. We could lift the restriction later once we fold
+        # the PackedFunc as an object. Currently, we pass function name to work
+        # around it.
+        f_prepare = "cache_flush_cpu_non_first_arg" if enable_cpu_cache_flush else ""
+        time_f = func.time_evaluator(
+            func.entry_name,
+            ctx,
+            number=number,
+            repeat=repeat,
+            min_repeat_ms=min_repeat_ms,
+            f_preproc=f_prepare,
+        )
+    # pylint: disable=broad-except
+    except Exception:
+        costs = (max_float,)
+        error_no = MeasureErrorNo.COMPILE_DEVICE
+        error_msg = make_error_msg()
+
+    if error_no == 0:
+        try:
+            args = get_run_buffers(arg_info, ctx)
+            costs = time_f(*args).results
+        # pylint: disable=broad-except
+        except Exception:
+            costs = (max_float,)
+            error_no = MeasureErrorNo.RUNTIME_DEVICE
+            error_msg = make_error_msg()
+
+    return tuple(costs), error_no, error_msg
+
+
 def rpc_run_worker(index):
     """Function to be ran in the RPCRunner thread pool.
 
@@ -17,6 +17,10 @@
 
 """ Serialization and other I/O support for measurement records (tuning logs). """
 
+import json
+import mmap
+import os
+
 import numpy as np
 
 import tvm._ffi
@@ -114,9 +118,179 @@ def save_records(filename, inputs, results):
         The MeasureResults to be written.
     """
     _ffi_api.SaveRecords(filename, inputs, results)
+    _on_append(filename)
+
+
+class RecordIndex(object):
+    """The best record of every (workload_key, target kind) pair of a log file.
+
+    The index is built by one pass over the log and only keeps the cost and the byte range of
+    the best line of each pair, so a query reads and parses a single line of the memory-mapped
+    log. Records appended to the log later are indexed incrementally: RecordToFile and
+    save_records notify the indices opened on the same file, and every query also catches up
+    with the tail written by other processes.
+
+    Parameters
+    ----------
+    filename : str
+        The log file.
+    index_file : Optional[str]
+        The file to load a previously saved index from. It is only used when it matches the log.
+    """
+
+    def __init__(self, filename, index_file=None):
+        self.filename = os.path.abspath(filename)
+        self.best = {}
+        self.scanned_bytes = 0
+        if index_file and os.path.isfile(index_file):
+            self._load(index_file)
+        self.update()
+        _RECORD_INDICES[self.filename] = self
 
+    @staticmethod
+    def _target_kind(target):
+        if target is None:
+            return None
+        if isinstance(target, str):
+            return target.split()[0]
+        return target.kind.name
 
-def load_best(filename, workload_key=None, target=None):
+    def _load(self, index_file):
+        with open(index_file, "r") as fin:
+            data = json.load(fin)
+        if data.get("scanned_bytes", 0) > os.path.getsize(self.filename):
+            # The log was truncated or rewritten after the index was saved
+            return
+        self.scanned_bytes = data["scanned_bytes"]
+        self.best = {(wkl, kind): tuple(item) for wkl, kind, *item in data["best"]}
+
+    def save(self, index_file):
+        """Save the index so that another process can skip the scan of the indexed part.
+
+        Parameters
+        ----------
+        index_file : str
+            The file to save to.
+        """
+        data = {
+            "log": self.filename,
+            "scanned_bytes": self.scanned_bytes,
+            "best": [[wkl, kind, *item] for (wkl, kind), item in self.best.items()],
+        }
+        tmp_file = "%s.%d.tmp" % (index_file, os.getpid())
+        with open(tmp_file, "w") as fout:
+            json.dump(data, fout)
+        os.replace(tmp_file, index_file)
+
+    def update(self):
+        """Index the records appended to the log since the last update.
+
+        Returns
+        -------
+        num : int
+            The number of newly indexed lines.
+        """
+        if not os.path.isfile(self.filename):
+            return 0
+        size = os.path.getsize(self.filename)
+        if size < self.scanned_bytes:
+            # The log was truncated or rewritten, rebuild from scratch
+            self.best = {}
+            self.scanned_bytes = 0
+        if size == self.scanned_bytes:
+            return 0
+
+        num = 0
+        offset = self.scanned_bytes
+        with open(self.filename, "rb") as fin:
+            fin.seek(offset)
+            for line in fin:
+                if not line.endswith(b"\n"):
+                    # A partially written line, index it in a later update
+                    break
+                self._index_line(line, offset)
+                offset += len(line)
+                num += 1
+        self.scanned_bytes = offset
+        return num
+
+    def _index_line(self, line, offset):
+        if line[:1] in (b"#", b" ", b"\n"):
+            return
+        try:
+            record = json.loads(line)
+            (workload_key, target), _ = record["i"]
+            costs, error_no = record["r"][0], record["r"][1]
+        except (ValueError, KeyError, TypeError):
+            return
+        if error_no != MeasureErrorNo.NO_ERROR:
+            return
+        key = (workload_key, self._target_kind(target))
+        cost = float(np.mean(costs))
+        if key not in self.best or cost < self.best[key][0]:
+            self.best[key] = (cost, offset, len(line))
+
+    def _read_record(self, offset, length):
+        with open(self.filename, "rb") as fin:
+            with mmap.mmap(fin.fileno(), 0, access=mmap.ACCESS_READ) as buf:
+                line = buf[offset : offset + length]
+        inp, res = _ffi_api.ReadMeasureRecord(line.decode())
+        return inp, res
+
+    def query(self, workload_key=None, target=None):
+        """Return the best measurement pair of a workload and a target.
+
+        Parameters
+        ----------
+        workload_key : Optional[str]
+            The workload key of the compute declaration.
+            With `None`, this returns the best measure pair of all workloads.
+        target : Optional[Union[str, tvm.target.Target]]
+            The target device.
+            With `None`, this returns the best measure pair of all target devices.
+
+        Returns
+        -------
+        input : auto_scheduler.measure.MeasureInput
+            The best State's MeasureInput, None if there is no valid record.
+        result : auto_scheduler.measure.MeasureResult
+            The best State's MeasureResult, None if there is no valid record.
+        """
+        self.update()
+        kind = self._target_kind(target)
+        if workload_key is not None and kind is not None:
+            item = self.best.get((workload_key, kind))
+        else:
+            item = None
+            for (wkl, k), value in self.best.items():
+                if workload_key is not None and wkl != workload_key:
+                    continue
+                if kind is not None and k != kind:
+                    continue
+                # Ties are broken by the position in the log, the same as a full scan
+                if item is None or value[:2] < item[:2]:
+                    item = value
+        if item is None:
+            return None, None
+        return self._read_record(item[1], item[2])
+
+    def __len__(self):
+        self.update()
+        return len(self.best)
+
+
+# The indices opened in this process, by the absolute path of their log file
+_RECORD_INDICES = {}
+
+
+@tvm._ffi.register_func("auto_scheduler.record_index.on_append")
+def _on_append(filename):
+    index = _RECORD_INDICES.get(os.path.abspath(filename))
+    if index is not None:
+        index.update()
+
+
+def load_best(filename, workload_key=None, target=None, use_index=True):
     """Return the best measurement pair form a log file. This may return none results if
     there is no legal measure pair with the specified workload_key/target found from the log file.
 
@@ -130,6 +304,9 @@ def load_best(filename, workload_key=None, target=None):
     target : Optional[tvm.target.Target]
         The target device.
         With `None`, this returns the best measure pair of all target devices.
+    use_index : bool = True
+        Whether to answer from the RecordIndex of the file, which is built on the first call
+        and kept in this process. With `False`, the whole log is scanned on every call.
 
     Returns
     -------
@@ -138,6 +315,12 @@ def load_best(filename, workload_key=None, target=None):
     result : auto_scheduler.measure.MeasureResult
         The best State's MeasureResult from this log fine.
     """
+    if use_index:
+        index = _RECORD_INDICES.get(os.path.abspath(filename))
+        if index is None:
+            index = RecordIndex(filename)
+        return index.query(workload_key, target)
+
     log_reader = RecordReader(filename)
     best_cost = 1e30
     best_inp = None
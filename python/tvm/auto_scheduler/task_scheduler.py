@@ -0,0 +1,421 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+"""
+The task scheduler that allocates the time resources when tuning multiple tasks together.
+
+The details of the "gradient" strategy below can be found in the section 6 of this paper:
+L. Zheng, C. Jia, M. Sun, Z. Wu, C. Yu, et al. "Ansor : Generating High-Performance Tensor
+Programs for Deep Learning." (OSDI 2020).
+"""
+
+import json
+import os
+import time
+
+import numpy as np
+
+from .search_policy import SearchPolicy, SketchPolicy, PreloadMeasuredStates
+from .cost_model import RandomModel, XGBModel
+from .measure import MeasureErrorNo
+from .measure_record import RecordIndex
+from . import _ffi_api
+
+
+def make_search_policies(search_policy, tasks, num_measures_per_round, verbose, load_log_file=None):
+    """Make a search policy for each task.
+
+    Parameters
+    ----------
+    search_policy : Union[str, List[SearchPolicy]]
+        The name of search policy, or a list of search policies for the tasks.
+        Candidates are "default", "sketch.xgb" and "sketch.random".
+    tasks : List[SearchTask]
+        The tasks to tune.
+    num_measures_per_round : int
+        The number of schedules to be measured at each search round.
+    verbose : int
+        Verbosity level. 0 for silent, 1 to output information during schedule search.
+    load_log_file : Optional[str]
+        A log file to load measured states from, so that they are not measured again.
+
+    Returns
+    -------
+    policies : List[SearchPolicy]
+        The search policies.
+    """
+    if isinstance(search_policy, (list, tuple)):
+        for policy in search_policy:
+            assert isinstance(policy, SearchPolicy)
+        return list(search_policy)
+
+    if search_policy == "default":
+        search_policy = "sketch.xgb"
+    policy_type, model_type = search_policy.split(".")
+
+    if model_type == "xgb":
+        # The cost model is shared by all tasks, so that the samples of one task help the others
+        cost_model = XGBModel(num_warmup_sample=len(tasks) * num_measures_per_round)
+    elif model_type == "random":
+        cost_model = RandomModel()
+    else:
+        raise ValueError("Invalid search policy: " + search_policy)
+
+    if policy_type != "sketch":
+        raise ValueError("Invalid search policy: " + search_policy)
+
+    init_search_callbacks = None
+    if load_log_file and os.path.isfile(load_log_file):
+        init_search_callbacks = [PreloadMeasuredStates(load_log_file)]
+    return [
+        SketchPolicy(task, cost_model, verbose=verbose, init_search_callbacks=init_search_callbacks)
+        for task in tasks
+    ]
+
+
+class TaskScheduler:
+    """Allocate the measurement rounds of a trial budget across several tasks.
+
+    The scheduler estimates the end-to-end latency of the network as the weighted sum of the best
+    latency of every task, and gives the next round to the task whose improvement is expected to
+    reduce that estimate the most. All tasks share one ProgramMeasurer, so that the builder and
+    runner pools in the tuning options are created once for the whole network.
+
+    Parameters
+    ----------
+    tasks : List[SearchTask]
+        All tasks to tune.
+    task_weights : Optional[List[float]]
+        The weights of tasks, usually the number of occurrences of a task in the network.
+        If None, all weights are 1.
+    objective_func : Optional[Callable[List[float] -> float]]
+        The objective function to minimize, which maps the best latencies of the tasks to the
+        estimated latency of the network. The default is the weighted sum of the latencies.
+    strategy : str = "gradient"
+        The scheduling strategy, "gradient" allocates rounds by the gradient of the objective,
+        "round-robin" tunes the tasks one round each in turn.
+    load_log_file : Optional[str]
+        A log file to resume from. The best costs found in it are the starting point of the
+        tasks, and the measured states are not measured again.
+    verbose : int = 1
+        Verbosity level. 0 for silent, 1 to output information during the scheduling.
+    alpha : float = 0.2
+        The weight of the backward gradient against the forward gradient.
+    backward_window_size : int = 3
+        The number of rounds to look back when estimating the backward gradient.
+    callbacks : Optional[List[TaskSchedulerCallback]]
+        The callbacks called after every round. The default is [PrintTableInfo()].
+    """
+
+    def __init__(
+        self,
+        tasks,
+        task_weights=None,
+        objective_func=None,
+        strategy="gradient",
+        load_log_file=None,
+        verbose=1,
+        alpha=0.2,
+        backward_window_size=3,
+        callbacks=None,
+    ):
+        self.tasks = tasks
+        if objective_func is None:
+            if task_weights is None:
+                task_weights = [1] * len(tasks)
+            assert len(task_weights) == len(tasks)
+            self.task_weights = task_weights
+            self.objective_func = lambda costs: sum(c * w for c, w in zip(costs, task_weights))
+        else:
+            self.task_weights = task_weights or [1] * len(tasks)
+            self.objective_func = objective_func
+
+        if strategy not in ["gradient", "round-robin"]:
+            raise ValueError("Invalid strategy: " + strategy)
+        self.strategy = strategy
+        self.load_log_file = load_log_file
+        self.verbose = verbose
+        self.alpha = alpha
+        self.backward_window_size = backward_window_size
+        self.callbacks = [PrintTableInfo()] if callbacks is None else callbacks
+
+        assert len(self.tasks) != 0, "No tasks"
+
+        # Task related variables
+        self.task_cts = [0 for _ in range(len(self.tasks))]  # number of rounds of every task
+        self.task_costs_history = [[] for _ in range(len(self.tasks))]  # best cost after a round
+        self.best_costs = 1e10 * np.ones(len(self.tasks))
+        self.task_best_cts = [0 for _ in range(len(self.tasks))]
+        self.flop_cts = [task.compute_dag.flop_ct for task in self.tasks]
+
+        # Measurement related variables
+        self.ct = 0
+        self.best_ct = 0
+        self.best_score = 1e10
+        self.cur_score = self._compute_score(self.best_costs)
+        self.tic = None
+        self.num_measures_per_round = None
+        self.dead_tasks = set()
+
+        # The cost of every round, for the progress records
+        self.round_records = []
+
+        if load_log_file and os.path.isfile(load_log_file):
+            self._restore_status(load_log_file)
+
+    def tune(self, tune_option, search_policy="default", target_latency=None):
+        """Tune a batch of tasks together.
+
+        Parameters
+        ----------
+        tune_option : TuningOptions
+            The options of tuning. num_measure_trials is the total budget of all tasks.
+        search_policy : Union[str, List[SearchPolicy]] = "default"
+            The list of search policies, or the name of the search policy shared by all tasks.
+        target_latency : Optional[float]
+            Stop the tuning once the estimated latency (in seconds) is below this value.
+
+        Returns
+        -------
+        best_costs : List[float]
+            The best latency of every task, in seconds.
+        """
+        self.num_measures_per_round = min(
+            tune_option.num_measures_per_round, tune_option.num_measure_trials // len(self.tasks)
+        )
+        if self.num_measures_per_round <= 0:
+            raise ValueError("num_measure_trials is too small. Please set it to a higher value.")
+
+        # Do not use early stopping by default
+        early_stopping = 1e20 if tune_option.early_stopping < 0 else tune_option.early_stopping
+
+        self.search_policies = make_search_policies(
+            search_policy,
+            self.tasks,
+            self.num_measures_per_round,
+            tune_option.verbose,
+            self.load_log_file,
+        )
+
+        # One measurer shares the builder and runner pools across tasks
+        self.measurer = _ffi_api.ProgramMeasurer(
+            tune_option.builder,
+            tune_option.runner,
+            tune_option.measure_callbacks,
+            tune_option.verbose,
+            -1,
+        )
+
+        self.tic = time.time()
+
+        # Warm up, every task gets one round
+        for idx in range(len(self.tasks)):
+            if not self._reached_limit(tune_option, target_latency):
+                self._tune_task(idx)
+
+        # Use the strategy to allocate the rest rounds
+        while not self._reached_limit(tune_option, target_latency):
+            if len(self.dead_tasks) == len(self.tasks):
+                break
+
+            if self.strategy == "round-robin":
+                task_idx = self._next_task_by_round_robin()
+            else:
+                task_idx = self._next_task_by_gradient()
+
+            self._tune_task(task_idx)
+
+            if self.cur_score < self.best_score:
+                self.best_score = self.cur_score
+                self.best_ct = self.ct
+            elif self.ct - self.best_ct >= early_stopping:
+                if self.verbose >= 1:
+                    print(
+                        "Stop early since no performance improvement in the last "
+                        + str(early_stopping)
+                        + " measurement trials."
+                    )
+                break
+
+        return list(self.best_costs)
+
+    def _next_task_by_round_robin(self):
+        alive = [i for i in range(len(self.tasks)) if i not in self.dead_tasks]
+        return min(alive, key=lambda i: self.task_cts[i])
+
+    def _reached_limit(self, tune_option, target_latency):
+        if self.ct >= tune_option.num_measure_trials:
+            return True
+        return target_latency is not None and self.cur_score <= target_latency
+
+    def _next_task_by_gradient(self):
+        gradients = []
+        for i in range(len(self.tasks)):
+            if i in self.dead_tasks:
+                gradients.append(0)
+                continue
+
+            # compute gradient from chain rule : (delta f / delta g_i)
+            delta = 1e-4
+            new_costs = list(self.best_costs)
+            new_costs[i] -= delta
+            cur_score = self._compute_score(self.best_costs)
+            chain_grad = (cur_score - self._compute_score(new_costs)) / delta
+
+            # compute (g_i(t_i) - g(t_i - \Delta t)) / (\Delta t)
+            history = self.task_costs_history[i]
+            if len(history) > self.backward_window_size:
+                backward_grad = (
+                    history[-1] - history[-1 - self.backward_window_size]
+                ) / self.backward_window_size
+            else:
+                backward_grad = 0
+
+            # compute (g_i(t_i + \Delta t) - g(t_i)) / (\Delta t), optimistically assuming
+            # the next round improves the task as much as the average round so far
+            g_next = self.best_costs[i] - (self.best_costs[i] / max(self.task_cts[i], 1))
+            forward_grad = g_next - self.best_costs[i]
+
+            # combine all grads
+            grad = chain_grad * (self.alpha * backward_grad + (1 - self.alpha) * forward_grad)
+            gradients.append(min(grad, 0))
+
+        if max(gradients) == min(gradients):
+            alive = [i for i in range(len(self.tasks)) if i not in self.dead_tasks]
+            return int(np.random.choice(alive))
+        return int(np.argmin(gradients))
+
+    def _tune_task(self, task_idx):
+        """Tune the task with the index task_idx by one round."""
+        measure_inputs, measure_results = _ffi_api.SearchPolicyContinueSearchOneRound(
+            self.search_policies[task_idx], self.num_measures_per_round, self.measurer
+        )
+
+        for res in measure_results:
+            if res.error_no != MeasureErrorNo.NO_ERROR:
+                continue
+            cost = np.mean([v.value for v in res.costs])
+            if cost < self.best_costs[task_idx]:
+                self.task_best_cts[task_idx] = self.task_cts[task_idx]
+                self.best_costs[task_idx] = cost
+
+        # Stop tuning the task if the search space has been exhausted
+        if len(measure_inputs) == 0:
+            self.dead_tasks.add(task_idx)
+
+        self.task_cts[task_idx] += 1
+        self.task_costs_history[task_idx].append(self.best_costs[task_idx])
+
+        self.ct += len(measure_inputs)
+        self.cur_score = self._compute_score(self.best_costs)
+
+        self.round_records.append(
+            {
+                "round": len(self.round_records),
+                "task_idx": task_idx,
+                "trials": self.ct,
+                "task_cts": list(self.task_cts),
+                "best_costs": [float(x) for x in self.best_costs],
+                "estimated_latency": float(self.cur_score),
+                "elapsed": time.time() - self.tic,
+            }
+        )
+        for callback in self.callbacks:
+            callback.post_tune(self, task_idx)
+
+    def _compute_score(self, costs):
+        """Compute the objective function."""
+        return self.objective_func(costs)
+
+    def _restore_status(self, log_file):
+        """Restore the best costs of the tasks from a log file."""
+        index = RecordIndex(log_file)
+        for i, task in enumerate(self.tasks):
+            _, res = index.query(task.workload_key, task.target)
+            if res is not None:
+                self.best_costs[i] = np.mean([v.value for v in res.costs])
+        self.cur_score = self._compute_score(self.best_costs)
+
+
+class TaskSchedulerCallback:
+    """The base class of task scheduler callbacks."""
+
+    def post_tune(self, task_scheduler, task_id):
+        """The callback after tuning a task by one round.
+
+        Parameters
+        ----------
+        task_scheduler : TaskScheduler
+            The task scheduler.
+        task_id : int
+            The index of the task that was just tuned.
+        """
+        # Implement this method in the subclass.
+
+
+class PrintTableInfo(TaskSchedulerCallback):
+    """The callback that prints the progress of every task as a table."""
+
+    def post_tune(self, task_scheduler, task_id):
+        if task_scheduler.verbose < 1:
+            return
+
+        print("|  ID  | Latency (ms) | Speed (GFLOPS) | Trials |")
+        print("-------------------------------------------------")
+        for i in range(len(task_scheduler.tasks)):
+            id_str = "%d" % i
+            latency_str = (
+                "%.3f" % (1e3 * task_scheduler.best_costs[i])
+                if task_scheduler.best_costs[i] < 1e9
+                else "-"
+            )
+            speed_str = (
+                "%.2f" % (task_scheduler.flop_cts[i] / task_scheduler.best_costs[i] / 1e9)
+                if task_scheduler.best_costs[i] < 1e9
+                else "-"
+            )
+            trials_str = "%d" % (task_scheduler.task_cts[i] * task_scheduler.num_measures_per_round)
+            print("| %4s | %12s | % 14s | %6s |" % (id_str, latency_str, speed_str, trials_str))
+        print("-------------------------------------------------")
+
+        total_latency_str = (
+            "%.3f" % (task_scheduler.cur_score * 1e3) if task_scheduler.cur_score < 1e9 else "-"
+        )
+        print(
+            "Estimated total latency: %s ms\tTrials: %d\tUsed time : %.0f s\tNext ID: %d\t"
+            % (total_latency_str, task_scheduler.ct, time.time() - task_scheduler.tic, task_id)
+        )
+
+
+class LogTaskProgress(TaskSchedulerCallback):
+    """The callback that appends the progress of every round to a file, one JSON per line.
+
+    Each line has the keys round, task_idx, trials, task_cts, best_costs, estimated_latency
+    and elapsed.
+
+    Parameters
+    ----------
+    filename : str
+        The file to append to.
+    """
+
+    def __init__(self, filename):
+        self.filename = filename
+
+    def post_tune(self, task_scheduler, task_id):
+        with open(self.filename, "a") as fout:
+            fout.write(json.dumps(task_scheduler.round_records[-1]) + "\n")
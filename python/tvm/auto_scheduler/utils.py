@@ -18,11 +18,15 @@
 """ Common utilities for auto_scheduler. """
 
 from typing import Hashable
+import atexit
 import multiprocessing
+import multiprocessing.connection
 import multiprocessing.pool
 import queue
 import signal
 import threading
+import time
+import traceback
 import os
 
 try:
@@ -198,6 +202,143 @@ def call_func_with_timeout(timeout, func, args=(), kwargs=None):
     return res
 
 
+def _persistent_worker_loop(conn):
+    """The loop of a PersistentPool worker, run (func, args) items until the pipe is closed."""
+    while True:
+        try:
+            item = conn.recv()
+        except EOFError:
+            break
+        if item is None:
+            break
+        func, args = item
+        try:
+            res = (True, func(*args))
+        # pylint: disable=broad-except
+        except Exception:
+            res = (False, str(traceback.format_exc()))
+        conn.send(res)
+
+
+class PersistentPool:
+    """A pool of worker processes that stay alive across calls.
+
+    Unlike call_func_with_timeout, a worker is only killed and replaced when its item times out
+    or crashes the process, so the startup cost and the per-process state (e.g. loaded modules,
+    allocated buffers) are kept for the following items. The workers are forked, so they see
+    the globals of the parent at the time they are started.
+
+    Parameters
+    ----------
+    n_parallel : int
+        The number of worker processes.
+    """
+
+    def __init__(self, n_parallel):
+        self.n_parallel = n_parallel
+        self.workers = [None] * n_parallel
+        _PERSISTENT_POOLS.append(self)
+
+    def _start(self, i):
+        parent_conn, child_conn = multiprocessing.Pipe()
+        process = NoDaemonProcess(target=_persistent_worker_loop, args=(child_conn,))
+        process.start()
+        child_conn.close()
+        self.workers[i] = (process, parent_conn)
+
+    def _kill(self, i):
+        if self.workers[i] is None:
+            return
+        process, conn = self.workers[i]
+        kill_child_processes(process.pid)
+        process.terminate()
+        process.join()
+        conn.close()
+        self.workers[i] = None
+
+    def map_with_timeout(self, func, args_list, timeout):
+        """Run func on every args of args_list in the workers.
+
+        Parameters
+        ----------
+        func : Callable
+            A module level function, so that it can be sent to the workers.
+        args_list : List[Tuple]
+            The arguments of every call.
+        timeout : float
+            The timeout of every call in seconds.
+
+        Returns
+        -------
+        results : List[Any]
+            The return value of every call, a TimeoutError if the call timed out, or a
+            RuntimeError with the traceback if the call raised or crashed the worker.
+        """
+        results = [None] * len(args_list)
+        pending = list(reversed(range(len(args_list))))
+        running = {}  # worker index -> (item index, deadline)
+
+        while pending or running:
+            for i in range(self.n_parallel):
+                if i in running or not pending:
+                    continue
+                if self.workers[i] is None or not self.workers[i][0].is_alive():
+                    self._kill(i)
+                    self._start(i)
+                idx = pending.pop()
+                self.workers[i][1].send((func, args_list[idx]))
+                running[i] = (idx, time.time() + timeout)
+
+            conns = {self.workers[i][1]: i for i in running}
+            wait_time = max(0, min(deadline for _, deadline in running.values()) - time.time())
+            for conn in multiprocessing.connection.wait(list(conns.keys()), wait_time):
+                i = conns[conn]
+                idx, _ = running.pop(i)
+                try:
+                    success, res = conn.recv()
+                except EOFError:
+                    success, res = False, "The worker process exited unexpectedly"
+                    self._kill(i)
+                results[idx] = res if success else RuntimeError(res)
+
+            now = time.time()
+            for i, (idx, deadline) in list(running.items()):
+                if deadline <= now:
+                    del running[i]
+                    self._kill(i)
+                    results[idx] = TimeoutError()
+
+        return results
+
+    def restart(self):
+        """Replace all workers, so that they see the current globals of the parent."""
+        for i in range(self.n_parallel):
+            self._kill(i)
+
+    def close(self):
+        """Stop all workers."""
+        for i in range(self.n_parallel):
+            if self.workers[i] is None:
+                continue
+            process, conn = self.workers[i]
+            try:
+                conn.send(None)
+            except (OSError, ValueError):
+                pass
+            process.join(1)
+            self._kill(i)
+
+
+# All pools created in this process, to stop their workers at exit
+_PERSISTENT_POOLS = []
+
+
+@atexit.register
+def _close_persistent_pools():
+    for pool in _PERSISTENT_POOLS:
+        pool.close()
+
+
 def request_remote(device_key, host=None, port=None, priority=1, timeout=60):
     """Request a remote session.
 
@@ -1,6 +1,7 @@
 from cgitb import enable
 import tvm
 import os
+import math
 import time
 import tempfile
 import shutil
@@ -42,6 +43,11 @@ class MeasureOptions(object):
         host=None,
         port=None,
         priority=1,
+        adaptive=False,
+        adaptive_quick_runs=3,
+        adaptive_target_rel_ci=0.02,
+        adaptive_max_repeat=20,
+        reuse_session=False,
     ):
         self.target = target
         self.build_func = build_func
@@ -59,6 +65,16 @@ class MeasureOptions(object):
         self.host = host
         self.port = port
         self.priority = priority
+        # adaptive measurement: a few quick runs first, stop early if the
+        # candidate is statistically worse than the current best, otherwise
+        # repeat until the relative 95% confidence interval is small enough
+        self.adaptive = adaptive
+        self.adaptive_quick_runs = adaptive_quick_runs
+        self.adaptive_target_rel_ci = adaptive_target_rel_ci
+        self.adaptive_max_repeat = adaptive_max_repeat
+        # rpc measurement: lease one session for all the candidates of a batch
+        # and upload their modules as one archive, request another after an error
+        self.reuse_session = reuse_session
 
 
 GRAPH_EVALUATE_INPUTS = None
@@ -69,7 +85,87 @@ GLOBAL_BUILD_INPUTS = None
 GLOBAL_RUN_INPUTS = None
 GLOBAL_RPC_BUILD_INPUTS = None
 GLOBAL_RPC_RUN_INPUTS = None
+# the rpc lease of a runner worker process and the number of its session holding the modules
+GLOBAL_RPC_LEASE = None
+GLOBAL_RPC_UPLOADED = 0
 MAX_FLOAT = 1e10
+# two-sided 95% quantiles of t-distribution, indexed by degrees of freedom
+T_QUANTILES_95 = OrderedDict(
+    [(1, 12.706), (2, 4.303), (3, 3.182), (4, 2.776), (5, 2.571), (6, 2.447), (7, 2.365),
+     (8, 2.306), (9, 2.262), (10, 2.228), (15, 2.131), (20, 2.086), (30, 2.042)]
+)
+
+
+def get_measure_statistics(costs):
+    """Get the statistics of measured costs.
+
+    Parameters
+    ----------
+    costs : MeasureResult or list of float
+        The adaptive runners store every sample in MeasureResult.costs.
+
+    Returns
+    -------
+    (samples, mean, variance, rel_ci) : (int, float, float, float)
+        rel_ci is the half width of the 95% confidence interval relative to the mean.
+    """
+    if isinstance(costs, auto_scheduler.measure.MeasureResult):
+        costs = costs.costs
+    values = [float(x.value) if hasattr(x, "value") else float(x) for x in costs]
+    samples = len(values)
+    mean = float(np.mean(values))
+    if samples < 2 or mean <= 0:
+        return samples, mean, 0.0, float("inf")
+    variance = float(np.var(values, ddof=1))
+    quantile = 1.96
+    for dof, value in reversed(T_QUANTILES_95.items()):
+        if samples - 1 >= dof:
+            quantile = value
+            break
+    return samples, mean, variance, quantile * math.sqrt(variance / samples) / mean
+
+
+def adaptive_time_evaluate(
+    func,
+    name,
+    ctx,
+    args,
+    number,
+    min_repeat_ms,
+    quick_runs,
+    target_rel_ci,
+    max_repeat,
+    shared_best,
+):
+    """Time a function until the confidence interval is small enough.
+
+    shared_best is a multiprocessing.Value holding the best mean cost seen so far,
+    the measurement stops early once the candidate is statistically worse.
+
+    Returns
+    -------
+    costs : list of float
+        All the samples of the final phase.
+    """
+    quick_f = func.time_evaluator(
+        name, ctx, number=max(1, number // 10), repeat=quick_runs, min_repeat_ms=0
+    )
+    costs = list(quick_f(*args).results)
+    _, mean, _, rel_ci = get_measure_statistics(costs)
+    if mean * (1 - rel_ci) > shared_best.value:
+        return costs
+
+    time_f = func.time_evaluator(name, ctx, number=number, repeat=1, min_repeat_ms=min_repeat_ms)
+    costs = []
+    while len(costs) < max_repeat:
+        costs.extend(time_f(*args).results)
+        _, mean, _, rel_ci = get_measure_statistics(costs)
+        if rel_ci <= target_rel_ci or mean * (1 - rel_ci) > shared_best.value:
+            break
+    with shared_best.get_lock():
+        if mean < shared_best.value:
+            shared_best.value = mean
+    return costs
 
 
 def get_np_arrays(tensors):
@@ -574,6 +670,7 @@ def pebble_local_run_worker(index):
         enable_cpu_cache_flush,
         verbose,
         enable_perf_model,
+        adaptive,
     ) = GLOBAL_RUN_INPUTS
 
     def timed_func(build_res):
@@ -701,7 +798,18 @@ def pebble_local_run_worker(index):
                                 continue
                             random_fill(arg)
                         ctx.sync()
-                        costs = time_f(*args).results
+                        if adaptive is not None:
+                            costs = adaptive_time_evaluate(
+                                func,
+                                func.entry_name if name is None else name,
+                                ctx,
+                                args,
+                                number,
+                                min_repeat_ms,
+                                *adaptive
+                            )
+                        else:
+                            costs = time_f(*args).results
                         # print("peek costs:", costs, flush=True)
                     # pylint: disable=broad-except
                     except Exception:
@@ -724,8 +832,27 @@ def pebble_local_run_worker(index):
     return timed_func(build_results[index])
 
 
+def get_adaptive_inputs(measure_opt, best_cost):
+    """Get the arguments of adaptive_time_evaluate after the timing ones,
+    or None if the adaptive mode is disabled."""
+    if not measure_opt.adaptive:
+        return None
+    shared_best = multi.Value("d", MAX_FLOAT if best_cost is None else best_cost)
+    return (
+        measure_opt.adaptive_quick_runs,
+        measure_opt.adaptive_target_rel_ci,
+        measure_opt.adaptive_max_repeat,
+        shared_best,
+    )
+
+
 def pebble_local_runner_run(
-    build_results, measure_opt, name="main", n_parallel=1, enable_perf_model=False
+    build_results,
+    measure_opt,
+    name="main",
+    n_parallel=1,
+    enable_perf_model=False,
+    best_cost=None,
 ):
     target = measure_opt.target
     dev_id = measure_opt.dev_id
@@ -750,6 +877,8 @@ def pebble_local_runner_run(
         enable_cpu_cache_flush,
         verbose,
         enable_perf_model,
+        # the shared best value is inherited by the forked workers
+        get_adaptive_inputs(measure_opt, best_cost),
     )
     measure_results = []
     with ProcessPool(n_parallel) as pool:
@@ -820,10 +949,16 @@ def pebble_rpc_run_worker(index):
         cooldown_interval,
         enable_cpu_cache_flush,
         verbose,
+        adaptive,
+        reuse_session,
     ) = GLOBAL_RPC_RUN_INPUTS
 
     max_float = MAX_FLOAT
     build_res = build_results[index]
+    remote_name = os.path.split(build_res.filename)[1]
+    if reuse_session:
+        # the modules of the batch are built in different folders with the same name
+        remote_name = "%d_%s" % (index, remote_name)
 
     if build_res.error_no != auto_scheduler.measure.MeasureErrorNo.NO_ERROR:
         return (
@@ -840,9 +975,12 @@ def pebble_rpc_run_worker(index):
         error_msg = None
         try:
             # upload built module
-            remote = auto_scheduler.utils.request_remote(key, host, port, priority, timeout)
-            remote.upload(build_res.filename)
-            func = remote.load_module(os.path.split(build_res.filename)[1])
+            if reuse_session:
+                remote = get_leased_remote(build_results, index, key, host, port, priority, timeout)
+            else:
+                remote = auto_scheduler.utils.request_remote(key, host, port, priority, timeout)
+                remote.upload(build_res.filename)
+            func = remote.load_module(remote_name)
             ctx = remote.context(str(target), dev_id)
             # Limitation:
             # We can not get PackFunction directly in the remote mode as it is wrapped
@@ -883,17 +1021,34 @@ def pebble_rpc_run_worker(index):
                 #     random_fill(arg)
                 ctx.sync()
 
-                costs = time_f(*args).results
+                if adaptive is not None:
+                    costs = adaptive_time_evaluate(
+                        func,
+                        func.entry_name if name is None else name,
+                        ctx,
+                        args,
+                        number,
+                        min_repeat_ms,
+                        *adaptive
+                    )
+                else:
+                    costs = time_f(*args).results
                 # clean up remote files
-                remote.remove(build_res.filename)
-                remote.remove(os.path.splitext(build_res.filename)[0] + ".so")
-                remote.remove("")
+                if reuse_session:
+                    remote.remove(remote_name)
+                else:
+                    remote.remove(build_res.filename)
+                    remote.remove(os.path.splitext(build_res.filename)[0] + ".so")
+                    remote.remove("")
             # pylint: disable=broad-except
             except Exception:
                 costs = (max_float,)
                 error_no = auto_scheduler.measure.MeasureErrorNo.RUNTIME_DEVICE
                 error_msg = auto_scheduler.measure.make_error_msg()
 
+        if error_no != 0 and GLOBAL_RPC_LEASE is not None:
+            # request another session for the next candidates
+            GLOBAL_RPC_LEASE.invalidate()
         shutil.rmtree(os.path.dirname(build_res.filename))
         toc = time.time()
 
@@ -909,7 +1064,40 @@ def pebble_rpc_run_worker(index):
     return timed_func()
 
 
-def pebble_rpc_runner_run(build_results, measure_opt, name="main"):
+def get_leased_remote(build_results, index, key, host, port, priority, timeout):
+    """Get the session leased by the current runner worker process.
+
+    A new session is requested on the first call of the process and after
+    the lease is invalidated, then the modules of the candidates from index
+    onwards are uploaded to it as one archive.
+
+    Returns
+    -------
+    remote : RPCSession
+        The leased session.
+    """
+    global GLOBAL_RPC_LEASE, GLOBAL_RPC_UPLOADED
+    if GLOBAL_RPC_LEASE is None:
+        host = host or os.environ["TVM_TRACKER_HOST"]
+        port = port or int(os.environ["TVM_TRACKER_PORT"])
+        tracker = rpc.connect_tracker(host, port)
+        # the session serves the whole batch
+        GLOBAL_RPC_LEASE = tracker.lease(
+            key, priority=priority, session_timeout=timeout * len(build_results)
+        )
+    remote = GLOBAL_RPC_LEASE.session()
+    if GLOBAL_RPC_LEASE.num_sessions != GLOBAL_RPC_UPLOADED:
+        files = {}
+        for i in range(index, len(build_results)):
+            filename = build_results[i].filename
+            if filename and os.path.isfile(filename):
+                files["%d_%s" % (i, os.path.split(filename)[1])] = filename
+        remote.upload_files(files)
+        GLOBAL_RPC_UPLOADED = GLOBAL_RPC_LEASE.num_sessions
+    return remote
+
+
+def pebble_rpc_runner_run(build_results, measure_opt, name="main", best_cost=None):
     target = measure_opt.target
     dev_id = measure_opt.dev_id
     timeout = measure_opt.timeout
@@ -941,6 +1129,8 @@ def pebble_rpc_runner_run(build_results, measure_opt, name="main"):
         cooldown_interval,
         enable_cpu_cache_flush,
         verbose,
+        get_adaptive_inputs(measure_opt, best_cost),
+        measure_opt.reuse_session,
     )
 
     measure_results = []
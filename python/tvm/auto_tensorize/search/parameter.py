@@ -434,7 +434,13 @@ def find_optimized_parameters(
         build_results = builder(
             schedule_app, params_lst, measure_opt, checker, n_parallel=build_parallel
         )
-        run_results = runner(build_results, measure_opt, n_parallel=run_parallel)
+        if measure_opt.adaptive:
+            # candidates statistically slower than the best are cut short
+            run_results = runner(
+                build_results, measure_opt, n_parallel=run_parallel, best_cost=1 / best_value
+            )
+        else:
+            run_results = runner(build_results, measure_opt, n_parallel=run_parallel)
         for params, res in zip(params_lst, run_results):
             if verbose:
                 print(res)
@@ -510,7 +516,13 @@ def find_optimized_parameters_v2(
             build_results = builder(
                 schedule_app, params_lst, measure_opt, checker, n_parallel=build_parallel
             )
-            run_results = runner(build_results, measure_opt, n_parallel=run_parallel)
+            if measure_opt.adaptive:
+                # candidates statistically slower than the best are cut short
+                run_results = runner(
+                    build_results, measure_opt, n_parallel=run_parallel, best_cost=1 / best_value
+                )
+            else:
+                run_results = runner(build_results, measure_opt, n_parallel=run_parallel)
 
             max_value = 1 / MAX_FLOAT
             for params, res in zip(params_lst, run_results):
@@ -634,7 +646,13 @@ def find_optimized_parameters_v3(
             build_results = builder(
                 schedule_app, params_lst, measure_opt, checker, n_parallel=build_parallel
             )
-            run_results = runner(build_results, measure_opt, n_parallel=run_parallel)
+            if measure_opt.adaptive:
+                # candidates statistically slower than the best are cut short
+                run_results = runner(
+                    build_results, measure_opt, n_parallel=run_parallel, best_cost=1 / best_value
+                )
+            else:
+                run_results = runner(build_results, measure_opt, n_parallel=run_parallel)
 
             max_value = 1 / MAX_FLOAT
             for i, (params, res) in enumerate(zip(params_lst, run_results)):
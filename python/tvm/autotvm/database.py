@@ -20,6 +20,7 @@ Database of MeasureInput/MeasureResult pair.
 This can be used for replaying measurement.
 """
 import os
+import sqlite3
 
 from .record import encode, decode, measure_str_key
 
@@ -61,6 +62,36 @@ class Database(object):
         """
         raise NotImplementedError()
 
+    def load_many(self, inps, get_all=False):
+        """
+        Load the results of a batch of inputs
+
+        Parameters
+        ----------
+        inps: Array of MeasureInput
+        get_all: bool, optional
+            Whether the latest result (or all matching results) should be returned
+
+        Returns
+        -------
+        recs: Array of MeasureResult
+            None for the inputs not saved
+        """
+        return [self.load(inp, get_all) for inp in inps]
+
+    def save_many(self, records, extend=False):
+        """
+        Save a batch of results
+
+        Parameters
+        ----------
+        records: Array of (MeasureInput, MeasureResult)
+        extend:
+            Whether to extend existing MeasureResults if they exist
+        """
+        for inp, res in records:
+            self.save(inp, res, extend)
+
 
 def filter_inputs(db, measure_inputs, retry=False):
     """
@@ -84,8 +115,7 @@ def filter_inputs(db, measure_inputs, retry=False):
     """
     partial_results = list()
     unsaved = list()
-    for inp in measure_inputs:
-        res = db.load(inp)
+    for inp, res in zip(measure_inputs, db.load_many(measure_inputs)):
         if res is None or (retry and res.error_no != 0):
             unsaved.append(inp)
             partial_results.append(None)
@@ -202,3 +232,137 @@ class DummyDatabase(RedisDatabase):
 
     def flush(self):
         self.db = {}
+
+
+class SQLiteDatabase(Database):
+    """
+    Embedded record database in a SQLite file, no server is needed.
+    Several processes on a node can share a same file.
+
+    Parameters
+    ----------
+    path: str
+        The database file, ":memory:" for an in-memory database
+    timeout: float
+        Seconds to wait for the lock of other processes
+    """
+
+    # the max number of host parameters in a query of old SQLite versions is 999
+    MAX_VARS = 900
+
+    def __init__(self, path=":memory:", timeout=60.0):
+        self.path = path
+        self.timeout = timeout
+        self._conn = None
+        self._pid = None
+
+    @property
+    def conn(self):
+        """The connection of this process, a connection can not be used across fork"""
+        if self._conn is None or self._pid != os.getpid():
+            self._conn = sqlite3.connect(self.path, timeout=self.timeout, check_same_thread=False)
+            self._pid = os.getpid()
+            if self.path != ":memory:":
+                self._conn.execute("PRAGMA journal_mode=WAL")
+            with self._conn:
+                self._conn.execute(
+                    "CREATE TABLE IF NOT EXISTS records ("
+                    "id INTEGER PRIMARY KEY AUTOINCREMENT, "
+                    "key TEXT NOT NULL, "
+                    "timestamp REAL, "
+                    "record TEXT NOT NULL)"
+                )
+                self._conn.execute("CREATE INDEX IF NOT EXISTS records_key ON records (key)")
+        return self._conn
+
+    def _query(self, keys):
+        """get all records of keys, grouped by key in saving order"""
+        ret = {}
+        keys = list(set(keys))
+        for i in range(0, len(keys), self.MAX_VARS):
+            chunk = keys[i : i + self.MAX_VARS]
+            cursor = self.conn.execute(
+                "SELECT key, record FROM records WHERE key IN (%s) ORDER BY id"
+                % ",".join(["?"] * len(chunk)),
+                chunk,
+            )
+            for key, record in cursor:
+                ret.setdefault(key, []).append(record)
+        return ret
+
+    @staticmethod
+    def _select(records, get_all):
+        records = [decode(x) for x in records]
+        results = [rec[1] for rec in records if rec is not None]
+        if not results:
+            return None
+        if get_all:
+            return results
+        return max(results, key=lambda result: result.timestamp)
+
+    def load(self, inp, get_all=False):
+        return self.load_many([inp], get_all)[0]
+
+    def load_many(self, inps, get_all=False):
+        keys = [measure_str_key(inp) for inp in inps]
+        found = self._query(keys)
+        return [self._select(found[key], get_all) if key in found else None for key in keys]
+
+    def save(self, inp, res, extend=False):
+        self.save_many([(inp, res)], extend)
+
+    def save_many(self, records, extend=False):
+        rows = [(measure_str_key(inp), res.timestamp, encode(inp, res)) for inp, res in records]
+        with self.conn:
+            if not extend:
+                keys = list(set([row[0] for row in rows]))
+                for i in range(0, len(keys), self.MAX_VARS):
+                    chunk = keys[i : i + self.MAX_VARS]
+                    self.conn.execute(
+                        "DELETE FROM records WHERE key IN (%s)" % ",".join(["?"] * len(chunk)),
+                        chunk,
+                    )
+                # only the last result of a key is kept, as repeated save calls do
+                rows = list(dict([(row[0], row) for row in rows]).values())
+            self.conn.executemany(
+                "INSERT INTO records (key, timestamp, record) VALUES (?, ?, ?)", rows
+            )
+
+    def filter(self, func):
+        """
+        Dump all of the records that match the given rule
+
+        Parameters
+        ----------
+        func: callable
+            The signature of the function is (MeasureInput, [MeasureResult]) -> bool
+
+        Returns
+        -------
+        list of records in tuple (MeasureInput, MeasureResult) matching the rule
+        """
+        grouped = {}
+        for key, record in self.conn.execute("SELECT key, record FROM records ORDER BY id"):
+            grouped.setdefault(key, []).append(record)
+
+        matched_records = list()
+        for current in grouped.values():
+            records = [decode(x) for x in current]
+            records = [rec for rec in records if rec is not None]
+            if not records:
+                continue
+            inps, results = zip(*records)
+            if not func(inps[0], results):
+                continue
+            result = max(results, key=lambda res: res.timestamp)
+            matched_records.append((inps[0], result))
+        return matched_records
+
+    def flush(self):
+        with self.conn:
+            self.conn.execute("DELETE FROM records")
+
+    def close(self):
+        if self._conn is not None and self._pid == os.getpid():
+            self._conn.close()
+        self._conn = None
@@ -18,6 +18,7 @@
 """Base class for graph tuner."""
 import logging
 from abc import abstractmethod
+from collections import OrderedDict
 
 import numpy as np
 from tvm import topi
@@ -271,6 +272,8 @@ class BaseGraphTuner(object):
         """
         input_names = self._input_shapes.keys()
         pair_tracker = set()
+        # placeholders are reused for the same input shape
+        placeholder_dict = {}
         for key, val in self._in_nodes_dict.items():
             node_entry = self._node_list[key]
             target_input_idx = -1
@@ -314,30 +317,36 @@ class BaseGraphTuner(object):
                     continue
                 pair_tracker.add((i_idx, o_idx))
 
-                for m, i_record in enumerate(in_node_entry["record_candidates"]):
-                    for n, o_record in enumerate(node_entry["record_candidates"]):
-                        i_cfg, o_cfg = i_record[0].config, o_record[0].config
-                        with self._target:
-                            i_input_info, i_output_info = i_infer_layout_func(i_wkl, i_cfg)
-                            o_input_info, o_output_info = o_infer_layout_func(o_wkl, o_cfg)
-                        if (
-                            len(i_input_info) > 1
-                            or len(i_output_info) > 1
-                            or len(o_input_info) > 1
-                            or len(o_output_info) > 1
-                        ):
-                            raise RuntimeError(
-                                "Graph tuner only supports target operator "
-                                "with single input and single output. "
-                                "Please check target_ops argument."
-                            )
-
-                        in_shape, in_layout = i_output_info[0]
+                # infer the layouts of each candidate once instead of once per pair
+                with self._target:
+                    i_layouts = [
+                        i_infer_layout_func(i_wkl, i_record[0].config)
+                        for i_record in in_node_entry["record_candidates"]
+                    ]
+                    o_layouts = [
+                        o_infer_layout_func(o_wkl, o_record[0].config)
+                        for o_record in node_entry["record_candidates"]
+                    ]
+                for input_info, output_info in i_layouts + o_layouts:
+                    if len(input_info) > 1 or len(output_info) > 1:
+                        raise RuntimeError(
+                            "Graph tuner only supports target operator "
+                            "with single input and single output. "
+                            "Please check target_ops argument."
+                        )
+
+                for m, (_, i_output_info) in enumerate(i_layouts):
+                    in_shape, in_layout = i_output_info[0]
+                    if in_shape not in placeholder_dict:
+                        placeholder_dict[in_shape] = te.placeholder(
+                            in_shape, name="data", dtype=self._dtype
+                        )
+                    data_placeholder = placeholder_dict[in_shape]
+                    for n, (o_input_info, o_output_info) in enumerate(o_layouts):
                         if node_entry["op"] in self._target_ops:
                             _, out_layout = o_input_info[0]
                         else:
                             _, out_layout = o_output_info[0]
-                        data_placeholder = te.placeholder(in_shape, name="data", dtype=self._dtype)
                         args = [data_placeholder, in_layout, out_layout]
                         callback(i_idx, o_idx, m, n, args)
 
@@ -460,24 +469,19 @@ class BaseGraphTuner(object):
                 total_time += record[1].costs[0]
         avg_time = total_time / num_flops if num_flops > 0 else 0
 
-        args_list = []
+        # many node pairs share a same layout transform, only unique workloads are measured
+        args_dict = OrderedDict()
 
         def _fetch_args_callback(from_node_idx, to_node_idx, from_sch_idx, to_sch_idx, args):
             """Callback function to fetch layout transform args"""
             _, in_layout, out_layout = args
             if in_layout != out_layout:
-                args_list.append(args)
+                ltf_workload = autotvm.task.args_to_workload(args, "layout_transform")
+                if ltf_workload not in self._layout_transform_perf_records:
+                    args_dict.setdefault(ltf_workload, args)
 
         self._iterate_layout_transform(_fetch_args_callback)
-
-        def _log_to_list(record_list):
-            """Callback to log result to a list."""
-
-            def _callback(_, inputs, results):
-                """Callback implementation"""
-                record_list.append((inputs[0], results[0]))
-
-            return _callback
+        self._logger.info("%d unique layout transformations to be benchmarked.", len(args_dict))
 
         builder = autotvm.LocalBuilder(n_parallel=n_parallel, build_func=build_func)
         runner = autotvm.LocalRunner(number=min_exec_num, repeat=1, timeout=timeout)
@@ -494,11 +498,9 @@ class BaseGraphTuner(object):
                 timeout=timeout,
             )
         measure_option = autotvm.measure_option(builder=builder, runner=runner)
-        for args in args_list:
+        measure_keys, measure_inputs = [], []
+        for ltf_workload, args in args_dict.items():
             data, in_layout, out_layout = args
-            ltf_workload = autotvm.task.args_to_workload(args, "layout_transform")
-            if ltf_workload in self._layout_transform_perf_records:
-                continue
 
             if infer_layout:
                 input_shape = ltf_workload[1][1]
@@ -524,15 +526,32 @@ class BaseGraphTuner(object):
                 self._layout_transform_perf_records[ltf_workload] = (record_input, record_output)
                 continue
 
-            records = []
             task = autotvm.task.create(
                 "layout_transform", args=args, target=self._target, target_host=target_host
             )
-            tuner = autotvm.tuner.GridSearchTuner(task)
-            tuner.tune(n_trial=1, measure_option=measure_option, callbacks=[_log_to_list(records)])
-            if not isinstance(records[0][1].costs[0], float):
-                records[0] = (records[0][0], records[0][1]._replace(costs=(INVALID_LAYOUT_TIME,)))
-            self._layout_transform_perf_records[ltf_workload] = records[0]
+            measure_keys.append(ltf_workload)
+            measure_inputs.append(MeasureInput(self._target, task, task.config_space.get(0)))
+
+        if measure_inputs:
+            # measure all layout transforms in batches, so that they are built in parallel
+            measure_batch = autotvm.measure.create_measure_batch(
+                measure_inputs[0].task, measure_option
+            )
+            batch_size = max(n_parallel, 1) * 8
+            for i in range(0, len(measure_inputs), batch_size):
+                keys = measure_keys[i : i + batch_size]
+                inputs = measure_inputs[i : i + batch_size]
+                results = measure_batch(inputs)
+                for ltf_workload, inp, res in zip(keys, inputs, results):
+                    if not isinstance(res.costs[0], float):
+                        res = res._replace(costs=(INVALID_LAYOUT_TIME,))
+                    self._layout_transform_perf_records[ltf_workload] = (inp, res)
+                self._logger.debug(
+                    "Benchmarked %d/%d layout transformations.",
+                    min(i + batch_size, len(measure_inputs)),
+                    len(measure_inputs),
+                )
+            del measure_batch
 
         self._iterate_layout_transform(self._create_matrix_callback)
         self._logger.info("Benchmarking layout transformation successful.")
@@ -311,6 +311,49 @@ class DPStage(object):
         """Get node index of complete states."""
         return self._full_states_idx
 
+    @staticmethod
+    def prune_dominated(kernel_costs, edge_costs):
+        """Find the schedule candidates of a node which are not dominated by other candidates.
+
+        Candidate a dominates candidate b if a has no larger execution time and no larger
+        layout transformation time on every edge of the node. Replacing b with a never
+        increases the total time, so b can be removed before creating states, which shrinks
+        the states of this node and of all stages depending on it.
+
+        Parameters
+        ----------
+        kernel_costs : list of float
+            Execution time of each candidate.
+
+        edge_costs : list of numpy.ndarray
+            Layout transformation time of each edge of the node,
+            with the candidates of the node on axis 0.
+
+        Returns
+        -------
+        keep : list of int
+            Index of the candidates to keep.
+        """
+        num_candidates = len(kernel_costs)
+        kernel_costs = np.array(kernel_costs, dtype="float64")
+        profile = np.concatenate(
+            [kernel_costs.reshape((num_candidates, 1))]
+            + [np.reshape(cost, (num_candidates, -1)) for cost in edge_costs],
+            axis=1,
+        )
+        pruned = np.zeros(num_candidates, dtype=bool)
+        for b in range(num_candidates):
+            for a in range(num_candidates):
+                if a == b or pruned[a]:
+                    continue
+                # for a tie, keep the candidate with smaller index as the DP does
+                if np.all(profile[a] <= profile[b]) and (
+                    a < b or kernel_costs[a] < kernel_costs[b]
+                ):
+                    pruned[b] = True
+                    break
+        return [i for i in range(num_candidates) if not pruned[i]]
+
     @staticmethod
     def align_states(input_index_list, stage_dict, node_list):
         """Align all input node states shapes to be the same and transpose/reshape properly.
@@ -70,6 +70,52 @@ class DPTuner(BaseGraphTuner):
                     % (self._num_states, self._max_num_states)
                 )
 
+    def _prune_candidates(self):
+        """Remove the dominated schedule candidates of target operator nodes
+        before creating states, see DPStage.prune_dominated."""
+        input_names = self._input_shapes.keys()
+        cost_dict = self._layout_transform_interlayer_cost
+        # multi-input nodes share the candidates of their inputs, leave them as is
+        fixed_nodes = set()
+        for idx in self._in_nodes_dict:
+            if has_multiple_inputs(self._node_list, idx, input_names, self._opt_out_op):
+                fixed_nodes.add(idx)
+                fixed_nodes.update(self._in_nodes_dict[idx])
+
+        num_pruned = 0
+        changed = True
+        while changed:
+            changed = False
+            for idx in sorted(self._in_nodes_dict.keys()):
+                node_entry = self._node_list[idx]
+                if idx in fixed_nodes or node_entry["op"] not in self._target_ops:
+                    continue
+                candidates = node_entry["record_candidates"]
+                if len(candidates) <= 1:
+                    continue
+                edge_costs = []
+                for (from_idx, to_idx), cost in cost_dict.items():
+                    if from_idx == idx:
+                        edge_costs.append(np.array(cost))
+                    if to_idx == idx:
+                        edge_costs.append(np.transpose(np.array(cost)))
+                keep = DPStage.prune_dominated(
+                    [record[1].costs[0] for record in candidates], edge_costs
+                )
+                if len(keep) == len(candidates):
+                    continue
+                changed = True
+                num_pruned += len(candidates) - len(keep)
+                # candidate lists may be shared by nodes of a same workload, create a new one
+                node_entry["record_candidates"] = [candidates[i] for i in keep]
+                for key in list(cost_dict.keys()):
+                    if key[0] == idx:
+                        cost_dict[key] = [cost_dict[key][i] for i in keep]
+                    if key[1] == idx:
+                        cost_dict[key] = [[row[i] for i in keep] for row in cost_dict[key]]
+        if num_pruned > 0:
+            self._logger.info("Pruned %d dominated schedule candidates.", num_pruned)
+
     def _forward(self):
         """Forward pass in DP to generate states for all stages."""
         self._logger.info("Start forward pass...")
@@ -198,11 +244,23 @@ class DPTuner(BaseGraphTuner):
         self._logger.info("Finished backward pass...")
 
     def run(self, **kwargs):
-        """Run dynamic programming solver."""
+        """Run dynamic programming solver.
+
+        Parameters
+        ----------
+        max_num_states : int, optional
+            Upper limit of the number of states.
+
+        prune : bool, optional
+            Whether to remove the dominated schedule candidates before
+            running dynamic programming. Default is True.
+        """
         max_num_states = None if "max_num_states" not in kwargs else kwargs["max_num_states"]
         self._num_states = 0
         self._max_num_states = max_num_states
         self._logger.info("Start to run dynamic programming algorithm...")
+        if kwargs.get("prune", True):
+            self._prune_candidates()
         self._forward()
         self._backward()
         self._logger.info("Finished DPExecutor run.")
@@ -29,6 +29,8 @@ import threading
 import time
 from random import getrandbits
 from collections import namedtuple
+from multiprocessing import Process, Queue
+from queue import Empty
 import tempfile
 
 import numpy as np
@@ -46,7 +48,7 @@ from ..env import AutotvmGlobalScope
 from ..task.space import InstantiationError
 
 from .measure import MeasureResult, MeasureErrorNo, Builder, Runner
-from .local_executor import LocalExecutor
+from .local_executor import LocalExecutor, kill_child_processes
 
 logger = logging.getLogger("autotvm")
 
@@ -205,6 +207,10 @@ class RPCRunner(Runner):
         its actual latency during end-to-end inference.
         To make this option effective, the argument `number` should also be set to 1.
         This is only has effect on CPU task.
+    reuse_session: bool
+        Whether to measure each batch of n_parallel candidates on one leased session,
+        uploading their modules as one archive. A new session is requested after an error.
+        Each batch runs in one process, which is replaced when a candidate times out.
     """
 
     def __init__(
@@ -221,6 +227,7 @@ class RPCRunner(Runner):
         cooldown_interval=0.1,
         check_correctness=False,
         enable_cpu_cache_flush=False,
+        reuse_session=False,
     ):
         super(RPCRunner, self).__init__(timeout, n_parallel)
 
@@ -239,6 +246,7 @@ class RPCRunner(Runner):
         self.enable_cpu_cache_flush = enable_cpu_cache_flush
         self.check_correctness = check_correctness
         self.cooldown_interval = cooldown_interval
+        self.reuse_session = reuse_session
 
         self.executor = LocalExecutor()
 
@@ -295,6 +303,9 @@ class RPCRunner(Runner):
         return kwargs
 
     def run(self, measure_inputs, build_results):
+        if self.reuse_session:
+            return self._run_batches(measure_inputs, build_results)
+
         results = []
         remote_args = (self.key, self.host, self.port, self.priority, self.timeout)
 
@@ -331,6 +342,95 @@ class RPCRunner(Runner):
 
         return results
 
+    def _run_batches(self, measure_inputs, build_results):
+        """Split the candidates into n_parallel batches, each measured on its own lease.
+
+        Each batch runs in a process streaming back the result of every candidate.
+        A candidate taking longer than the timeout is charged RUN_TIMEOUT and the
+        process is killed, the rest of the batch goes on in a new process.
+        """
+        n_batch = min(self.n_parallel, len(measure_inputs))
+        results = [None] * len(measure_inputs)
+        queue = Queue()
+        # batch id -> [process, indexes of the candidates left, deadline of the first one]
+        workers = {}
+
+        def start(batch_id, indexes):
+            # the first candidate of a process also waits for the session and the upload
+            deadline = time.time() + self.executor.timeout + self.timeout
+            process = Process(
+                target=_run_batch_worker,
+                args=(
+                    queue,
+                    batch_id,
+                    indexes,
+                    [measure_inputs[i] for i in indexes],
+                    [build_results[i] for i in indexes],
+                    self.number,
+                    self.repeat,
+                    self.min_repeat_ms,
+                    self.cooldown_interval,
+                    (self.key, self.host, self.port, self.priority, self.timeout * len(indexes)),
+                    self.ref_input,
+                    self.ref_output,
+                    self.enable_cpu_cache_flush,
+                ),
+            )
+            process.start()
+            workers[batch_id] = [process, indexes, deadline]
+
+        def stop(batch_id, wait=0):
+            process = workers.pop(batch_id)[0]
+            process.join(wait)
+            if process.is_alive():
+                kill_child_processes(process.pid)
+                process.terminate()
+            process.join()
+
+        def deliver(batch_id, i, res):
+            if batch_id not in workers or i not in workers[batch_id][1]:
+                # sent by a killed process before its candidate was charged the timeout
+                return
+            results[i] = res
+            worker = workers[batch_id]
+            worker[1] = [x for x in worker[1] if x != i]
+            worker[2] = time.time() + self.timeout + self.cooldown_interval
+            if not worker[1]:
+                stop(batch_id, wait=1)
+
+        for batch_id in range(n_batch):
+            start(batch_id, list(range(len(measure_inputs)))[batch_id::n_batch])
+
+        while workers:
+            try:
+                deliver(
+                    *queue.get(
+                        timeout=max(0.01, min(min(w[2] for w in workers.values()) - time.time(), 1))
+                    )
+                )
+                continue
+            except Empty:
+                pass
+            # an exited process has flushed its results, take them before charging it
+            exited = [batch_id for batch_id, w in workers.items() if not w[0].is_alive()]
+            while True:
+                try:
+                    deliver(*queue.get_nowait())
+                except Empty:
+                    break
+            for batch_id, (_, indexes, deadline) in list(workers.items()):
+                if batch_id not in exited and time.time() < deadline:
+                    continue
+                # the first candidate left hangs or crashed the process
+                msg = "worker exited" if batch_id in exited else "timeout"
+                stop(batch_id)
+                results[indexes[0]] = MeasureResult(
+                    (msg,), MeasureErrorNo.RUN_TIMEOUT, self.timeout, time.time()
+                )
+                if indexes[1:]:
+                    start(batch_id, indexes[1:])
+        return results
+
 
 class LocalRunner(RPCRunner):
     """Run generated code on local devices.
@@ -559,85 +659,235 @@ def run_through_rpc(
         return build_result
 
     tic = time.time()
-    errno = MeasureErrorNo.NO_ERROR
     try:
         # upload built module
         remote = request_remote(*remote_args)
-        # Program the FPGA every single time when targeting VTA
-        if (
-            hasattr(measure_input.target, "device_name")
-            and measure_input.target.device_name == "vta"
-        ):
-            # pylint: disable=import-outside-toplevel
-            from vta import program_fpga, reconfig_runtime
-
-            program_fpga(remote, None)
-            reconfig_runtime(remote)
         remote.upload(build_result.filename)
-        func = remote.load_module(os.path.split(build_result.filename)[1])
-        ctx = remote.context(str(measure_input.target), 0)
-
-        # Limitation:
-        # We can not get PackFunction directly in the remote mode as it is wrapped
-        # under the std::function. We could lift the restriction later once we fold
-        # the PackedFunc as an object. Currently, we pass function name to work
-        # around it.
-        f_prepare = "cache_flush_cpu_non_first_arg" if enable_cpu_cache_flush else ""
-        time_f = func.time_evaluator(
-            func.entry_name,
-            ctx,
-            number=number,
-            repeat=repeat,
-            min_repeat_ms=min_repeat_ms,
-            f_preproc=f_prepare,
+        costs, errno = _run_on_remote(
+            remote,
+            measure_input,
+            build_result,
+            number,
+            repeat,
+            min_repeat_ms,
+            ref_input,
+            ref_output,
+            enable_cpu_cache_flush,
         )
-
-        # set input
-        if ref_input:
-            args = [nd.array(x, ctx=ctx) for x in ref_input]
-        else:
-            try:
-                random_fill = remote.get_function("tvm.contrib.random.random_fill")
-            except AttributeError:
-                raise AttributeError(
-                    "Please make sure USE_RANDOM is ON in the config.cmake " "on the remote devices"
-                )
-            args = [nd.empty(x[0], dtype=x[1], ctx=ctx) for x in build_result.arg_info]
-            for arg in args:
-                random_fill(arg)
-            ctx.sync()
-
-        costs = time_f(*args).results
-
-        # clean up remote files
-        remote.remove(build_result.filename)
-        remote.remove(os.path.splitext(build_result.filename)[0] + ".so")
         remote.remove("")
-
-        if len(costs) > 2:  # remove largest and smallest value to reduce variance
-            costs = list(costs)
-            costs.sort()
-            costs = tuple(costs[1:-1])
-
-        # check correctness of output
-        if ref_output:
-            for expected, real in zip(ref_output, args):
-                if not np.allclose(expected, real.asnumpy(), rtol=1e-4):
-                    logger.warning("Wrong Answer!")
-                    errno = MeasureErrorNo.WRONG_ANSWER
     except TVMError as exc:
-        msg = str(exc)
-        if "Stack trace returned" in msg:
-            msg = msg[: msg.index("Stack trace returned")]
-        if "CUDA Source" in msg:
-            msg = msg[: msg.index("CUDA Source")]
-        costs = (RuntimeError(msg[:1024]),)
-        errno = MeasureErrorNo.RUNTIME_DEVICE
+        costs, errno = _runtime_error(exc)
     tstamp = time.time()
     time.sleep(cooldown_interval)
     return MeasureResult(costs, errno, tstamp - tic + build_result.time_cost, tstamp)
 
 
+def run_batch_through_rpc(
+    measure_inputs,
+    build_results,
+    number,
+    repeat,
+    min_repeat_ms,
+    cooldown_interval,
+    remote_args,
+    ref_input=None,
+    ref_output=None,
+    enable_cpu_cache_flush=False,
+    callback=None,
+):
+    """Run a batch of generated libraries through rpc on one leased session.
+
+    The libraries are uploaded as one archive. After an error, a new session
+    is requested for the remaining libraries, which are uploaded again.
+
+    Parameters
+    ----------
+    measure_inputs: List[MeasureInput]
+        The raw measure inputs
+    build_results: List[BuildResult]
+        The results returned from Builder.
+    number: int
+        The number of times to run the generated code for taking average.
+    repeat : int, optional
+        The number of times to repeat the measurement.
+    min_repeat_ms: int, optional
+        The minimum duration of one `repeat` in milliseconds.
+    cooldown_interval: float
+        The cool down interval between two measurements
+    remote_args: Tuple
+        The argument for request_remote, the timeout being the one of the whole batch
+    ref_input: List of np.ndarray
+        The reference input used for checking correctness
+    ref_output: List of np.ndarray
+        The reference output used for checking correctness
+    enable_cpu_cache_flush: bool
+        Whether to flush cache on CPU between repeated measurements.
+    callback: function of (int, MeasureResult), optional
+        Called with the index and the result of each library once measured.
+
+    Returns
+    -------
+    results: List[MeasureResult]
+        The measure result of each library.
+
+    See Also
+    --------
+    run_through_rpc
+    """
+    device_key, host, port, priority, timeout = remote_args
+    host = host or os.environ["TVM_TRACKER_HOST"]
+    port = port or int(os.environ["TVM_TRACKER_PORT"])
+
+    results = [None] * len(measure_inputs)
+    lease = None
+    uploaded = 0
+    try:
+        for i, (measure_input, build_result) in enumerate(zip(measure_inputs, build_results)):
+            if isinstance(build_result, MeasureResult):
+                results[i] = build_result
+                if callback:
+                    callback(i, results[i])
+                continue
+
+            tic = time.time()
+            try:
+                if lease is None:
+                    lease = _rpc.connect_tracker(host, port).lease(
+                        device_key, priority=priority, session_timeout=timeout
+                    )
+                remote = lease.session()
+                if lease.num_sessions != uploaded:
+                    remote.upload_files(
+                        {
+                            os.path.basename(res.filename): res.filename
+                            for res in build_results[i:]
+                            if not isinstance(res, MeasureResult) and os.path.isfile(res.filename)
+                        }
+                    )
+                    uploaded = lease.num_sessions
+                costs, errno = _run_on_remote(
+                    remote,
+                    measure_input,
+                    build_result,
+                    number,
+                    repeat,
+                    min_repeat_ms,
+                    ref_input,
+                    ref_output,
+                    enable_cpu_cache_flush,
+                )
+            except TVMError as exc:
+                costs, errno = _runtime_error(exc)
+            except Exception as exc:  # pylint: disable=broad-except
+                # e.g. no device from the tracker, or no random_fill on the remote
+                costs, errno = (exc,), MeasureErrorNo.RUNTIME_DEVICE
+            if errno == MeasureErrorNo.RUNTIME_DEVICE:
+                remote = None
+                if lease is not None:
+                    lease.invalidate()
+            tstamp = time.time()
+            time.sleep(cooldown_interval)
+            results[i] = MeasureResult(costs, errno, tstamp - tic + build_result.time_cost, tstamp)
+            if callback:
+                callback(i, results[i])
+    finally:
+        if lease is not None:
+            lease.invalidate()
+    return results
+
+
+def _run_batch_worker(queue, batch_id, indexes, *args):
+    """Run a batch of libraries through rpc, putting the result of each one to the queue"""
+
+    def callback(k, result):
+        queue.put((batch_id, indexes[k], result))
+
+    run_batch_through_rpc(*args, callback=callback)
+
+
+def _runtime_error(exc):
+    """Get the costs and the error number of a TVMError raised on the remote"""
+    msg = str(exc)
+    if "Stack trace returned" in msg:
+        msg = msg[: msg.index("Stack trace returned")]
+    if "CUDA Source" in msg:
+        msg = msg[: msg.index("CUDA Source")]
+    return (RuntimeError(msg[:1024]),), MeasureErrorNo.RUNTIME_DEVICE
+
+
+def _run_on_remote(
+    remote,
+    measure_input,
+    build_result,
+    number,
+    repeat,
+    min_repeat_ms,
+    ref_input,
+    ref_output,
+    enable_cpu_cache_flush,
+):
+    """Measure a library uploaded to the remote, return the costs and the error number"""
+    errno = MeasureErrorNo.NO_ERROR
+    # Program the FPGA every single time when targeting VTA
+    if hasattr(measure_input.target, "device_name") and measure_input.target.device_name == "vta":
+        # pylint: disable=import-outside-toplevel
+        from vta import program_fpga, reconfig_runtime
+
+        program_fpga(remote, None)
+        reconfig_runtime(remote)
+    func = remote.load_module(os.path.split(build_result.filename)[1])
+    ctx = remote.context(str(measure_input.target), 0)
+
+    # Limitation:
+    # We can not get PackFunction directly in the remote mode as it is wrapped
+    # under the std::function. We could lift the restriction later once we fold
+    # the PackedFunc as an object. Currently, we pass function name to work
+    # around it.
+    f_prepare = "cache_flush_cpu_non_first_arg" if enable_cpu_cache_flush else ""
+    time_f = func.time_evaluator(
+        func.entry_name,
+        ctx,
+        number=number,
+        repeat=repeat,
+        min_repeat_ms=min_repeat_ms,
+        f_preproc=f_prepare,
+    )
+
+    # set input
+    if ref_input:
+        args = [nd.array(x, ctx=ctx) for x in ref_input]
+    else:
+        try:
+            random_fill = remote.get_function("tvm.contrib.random.random_fill")
+        except AttributeError:
+            raise AttributeError(
+                "Please make sure USE_RANDOM is ON in the config.cmake " "on the remote devices"
+            )
+        args = [nd.empty(x[0], dtype=x[1], ctx=ctx) for x in build_result.arg_info]
+        for arg in args:
+            random_fill(arg)
+        ctx.sync()
+
+    costs = time_f(*args).results
+
+    # clean up remote files
+    remote.remove(build_result.filename)
+    remote.remove(os.path.splitext(build_result.filename)[0] + ".so")
+
+    if len(costs) > 2:  # remove largest and smallest value to reduce variance
+        costs = list(costs)
+        costs.sort()
+        costs = tuple(costs[1:-1])
+
+    # check correctness of output
+    if ref_output:
+        for expected, real in zip(ref_output, args):
+            if not np.allclose(expected, real.asnumpy(), rtol=1e-4):
+                logger.warning("Wrong Answer!")
+                errno = MeasureErrorNo.WRONG_ANSWER
+    return costs, errno
+
+
 def request_remote(device_key, host=None, port=None, priority=1, timeout=60):
     """Request a remote session
 
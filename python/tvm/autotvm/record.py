@@ -215,6 +215,179 @@ def load_from_file(filename):
             yield ret
 
 
+def _workload_key(workload):
+    """The str key of a workload in RecordStore index"""
+    return json.dumps(workload, default=str)
+
+
+def _scan_log_chunk(args):
+    """Scan the lines starting in [start, end) of a json log file,
+    keep the best line of each (target, workload) without decoding the records.
+    """
+    filename, start, end = args
+    best = {}
+    with open(filename, "rb") as fin:
+        if start > 0:
+            # a line belongs to the chunk where it starts
+            fin.seek(start - 1)
+            fin.readline()
+        while fin.tell() < end:
+            line = fin.readline()
+            if not line:
+                break
+            line = line.strip()
+            if not line or line.startswith(b"#"):
+                continue
+            try:
+                row = json.loads(line)
+            except ValueError:
+                continue
+            if "input" not in row or row.get("v") == 0.1:
+                continue
+            costs, error_no = row["result"][0], row["result"][1]
+            if error_no != 0:
+                continue
+            tgt, task_name, task_args, _ = row["input"]
+            key = (str(tgt), _workload_key([task_name] + list(task_args)))
+            cost = float(np.mean(costs))
+            if key not in best or cost < best[key][0]:
+                best[key] = (cost, line)
+    return best
+
+
+class RecordStore(object):
+    """Indexed on-disk store of the best tuning records.
+
+    The store keeps one record per (target, workload) and an index from
+    (target key, workload) and (target model, workload) to the record offset,
+    so ApplyHistoryBest decodes only the records of queried workloads.
+    Use :any:`build_record_store` to create it from json logs.
+
+    Parameters
+    ----------
+    path : str
+        The directory of the store.
+    """
+
+    INDEX = "index.json"
+    RECORDS = "records.log"
+
+    def __init__(self, path):
+        self.path = path
+        with open(os.path.join(path, self.INDEX)) as fin:
+            self.index = json.load(fin)
+        self._fin = None
+
+    @staticmethod
+    def is_store(path):
+        return os.path.isfile(os.path.join(path, RecordStore.INDEX))
+
+    def __len__(self):
+        return self.index["num_records"]
+
+    def _read(self, offset):
+        if self._fin is None:
+            self._fin = open(os.path.join(self.path, self.RECORDS), "rb")
+        self._fin.seek(offset)
+        return decode(self._fin.readline().decode())
+
+    def query(self, kind, key, workload):
+        """Get the best record of a workload
+
+        Parameters
+        ----------
+        kind: str
+            "targetkey" or "model"
+        key: str
+            The target key or target model
+        workload: tuple
+            The workload of the task
+
+        Returns
+        -------
+        ret: tuple(autotvm.measure.MeasureInput, autotvm.measure.MeasureResult), or None
+        """
+        item = self.index[kind].get(key, {}).get(_workload_key(workload))
+        if item is None:
+            return None
+        return self._read(item[0])
+
+    def records(self):
+        """Generator: decode all the records in the store"""
+        return load_from_file(os.path.join(self.path, self.RECORDS))
+
+
+def build_record_store(in_files, path, n_parallel=None, chunk_size=64 * 1024 * 1024):
+    """Compact json log files into a RecordStore.
+    The log files are scanned in parallel by byte ranges,
+    only the best record of each (target, workload) is kept.
+    If the store already exists, its records are merged.
+
+    Parameters
+    ----------
+    in_files: str or list of str
+        The json log files
+    path: str
+        The directory of the store
+    n_parallel: int, optional
+        The number of worker processes
+    chunk_size: int
+        The bytes scanned by one job
+
+    Returns
+    -------
+    store: RecordStore
+    """
+    if isinstance(in_files, str):
+        in_files = [in_files]
+    os.makedirs(path, exist_ok=True)
+    in_files = list(in_files)
+    old_records = os.path.join(path, RecordStore.RECORDS)
+    if RecordStore.is_store(path) and os.path.isfile(old_records):
+        in_files.append(old_records)
+
+    jobs = []
+    for filename in in_files:
+        size = os.path.getsize(filename)
+        for start in range(0, max(size, 1), chunk_size):
+            jobs.append((filename, start, min(start + chunk_size, size)))
+
+    tic = time.time()
+    best = {}
+    with multiprocessing.Pool(n_parallel) as pool:
+        # ordered, so the first record wins among equal costs as in ApplyHistoryBest
+        for part in pool.imap(_scan_log_chunk, jobs):
+            for key, (cost, line) in part.items():
+                if key not in best or cost < best[key][0]:
+                    best[key] = (cost, line)
+    logger.info("Scan %d records in %.2f s", len(best), time.time() - tic)
+
+    index = {"targetkey": {}, "model": {}, "num_records": len(best)}
+    targets = {}
+
+    def update(kind, key, wkl, cost, offset):
+        table = index[kind].setdefault(key, {})
+        if wkl not in table or cost < table[wkl][1]:
+            table[wkl] = (offset, cost)
+
+    tmp_records = old_records + ".tmp"
+    with open(tmp_records, "wb") as fout:
+        for (tgt, wkl), (cost, line) in best.items():
+            if tgt not in targets:
+                tgt_str = tgt.replace("-target", "-mtriple") if "-target" in tgt else tgt
+                targets[tgt] = Target(tgt_str)
+            offset = fout.tell()
+            fout.write(line + b"\n")
+            for k in targets[tgt].keys:
+                update("targetkey", k, wkl, cost, offset)
+            if targets[tgt].model != "unknown":
+                update("model", targets[tgt].model, wkl, cost, offset)
+    os.replace(tmp_records, old_records)
+    with open(os.path.join(path, RecordStore.INDEX), "w") as fout:
+        json.dump(index, fout)
+    return RecordStore(path)
+
+
 def split_workload(in_file, clean=True):
     """Split a log file into separate files, each of which contains only a single workload
     This function can also delete duplicated records in log file
@@ -305,7 +478,7 @@ def pick_best(in_file, out_file):
 
 """
 Usage:
-This record executable module has three modes.
+This record executable module has four modes.
 
 * Print log file in readable format
 e.g. python -m tvm.autotvm.record --mode read --i collect_conv.log --begin 0 --end 5 --ir --code
@@ -315,10 +488,13 @@ e.g. python -m tvm.autotvm.record --mode pick --i collect.log
 
 * Split a log file into separate files, each of which contains only a single wkl
 e.g. python -m tvm.autotvm.record --mode split --i collect.log
+
+* Compact a large log file into an indexed RecordStore
+e.g. python -m tvm.autotvm.record --mode index --i collect.log --o collect.store
 """
 if __name__ == "__main__":
     parser = argparse.ArgumentParser()
-    parser.add_argument("--mode", choices=["read", "pick", "split"], default="read")
+    parser.add_argument("--mode", choices=["read", "pick", "split", "index"], default="read")
     parser.add_argument("--i", type=str, help="input file")
     parser.add_argument("--o", type=str, default=None, help="output file")
     parser.add_argument("--begin", type=int, default=0)
@@ -352,3 +528,6 @@ if __name__ == "__main__":
                         print(func.imported_modules[0].get_source())
     elif args.mode == "split":
         split_workload(args.i)
+    elif args.mode == "index":
+        args.o = args.o or args.i + ".store"
+        build_record_store(args.i, args.o)
@@ -184,10 +184,12 @@ class ApplyHistoryBest(DispatchContext):
 
     Parameters
     ----------
-    records : str or iterator of (autotvm.measure.MeasureInput, autotvm.measure.MeasureResult)
+    records : str or RecordStore or iterator of (MeasureInput, MeasureResult)
         Collection of tuning records.
-        If is str, then it should be the filename of a records log file.
+        If is str, then it should be the filename of a records log file
+        or the directory of a RecordStore.
         Each row of this file is an encoded record pair. Otherwise, it is an iterator.
+        Records in a RecordStore are decoded lazily when their workloads are queried.
     """
 
     def __init__(self, records):
@@ -196,6 +198,8 @@ class ApplyHistoryBest(DispatchContext):
         self.best_by_targetkey = {}
         self.best_by_model = {}
         self._best_user_defined = {}
+        self._record_stores = []
+        self._store_queried = set()
 
         if records:
             self.load(records)
@@ -212,11 +216,18 @@ class ApplyHistoryBest(DispatchContext):
         """
         # pylint: disable=import-outside-toplevel
         from pathlib import Path
-        from ..record import load_from_file
+        from ..record import load_from_file, RecordStore
 
         if isinstance(records, Path):
             records = str(records)
 
+        if isinstance(records, str) and RecordStore.is_store(records):
+            records = RecordStore(records)
+        if isinstance(records, RecordStore):
+            self._record_stores.append(records)
+            self._store_queried.clear()
+            return
+
         if isinstance(records, str):
             records = load_from_file(records)
         if not records:
@@ -253,6 +264,20 @@ class ApplyHistoryBest(DispatchContext):
 
         logger.debug("Finish loading %d records", counter)
 
+    def _query_stores(self, kind, key):
+        """Decode the best record of key from the record stores into the best maps"""
+        if not self._record_stores or (kind, key) in self._store_queried:
+            return
+        self._store_queried.add((kind, key))
+        best = self.best_by_model if kind == "model" else self.best_by_targetkey
+        for store in self._record_stores:
+            ret = store.query(kind, key[0], key[1])
+            if ret is None:
+                continue
+            inp, res = ret
+            if key not in best or np.mean(best[key][1].costs) > np.mean(res.costs):
+                best[key] = (inp, res)
+
     def _query_inside(self, target, workload):
         if target is None:
             raise RuntimeError(
@@ -265,6 +290,7 @@ class ApplyHistoryBest(DispatchContext):
         key = (target.model, workload)
         if key in self._best_user_defined:
             return self._best_user_defined[key]
+        self._query_stores("model", key)
         if key in self.best_by_model:
             inp, _ = self.best_by_model[key]
             return inp.config
@@ -274,6 +300,7 @@ class ApplyHistoryBest(DispatchContext):
             key = (k, workload)
             if key in self._best_user_defined:
                 return self._best_user_defined[key]
+            self._query_stores("targetkey", key)
             if key in self.best_by_targetkey:
                 inp, _ = self.best_by_targetkey[key]
                 return inp.config
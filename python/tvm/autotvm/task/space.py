@@ -667,6 +667,7 @@ class ConfigSpace(object):
         self._length = None
         self._entity_map = OrderedDict()  # name -> entity
         self._constraints = []
+        self._columnar = None
         self.errors = []
         self.code_hash = None
         self.flop = 0
@@ -783,6 +784,39 @@ class ConfigSpace(object):
         """
         return self._add_new_transform(OtherOptionSpace, name, [], None, candidate=candidate)
 
+    def add_constraint(self, func):
+        """Add a constraint on the knobs, configs violating it are invalid.
+        The constraints are checked by ConfigEntity.valid for the configs got by
+        :any:`ConfigSpace.get`, and in bulk by :any:`ColumnarConfigSpace.valid`.
+
+        Parameters
+        ----------
+        func: callable
+            func(knobs) returns a bool array. knobs maps the name of a knob to the
+            values of a batch of configs, the first dimension is the batch:
+            split sizes, reorder permutations and annotation numbers are 2-D int
+            arrays, the candidates of define_knob are 1-D arrays.
+
+        Examples
+        --------
+        >>> # the number of threads can not exceed 1024
+        >>> cfg.add_constraint(lambda k: k["tile_x"][:, 2] * k["tile_y"][:, 2] <= 1024)
+        """
+        if self._collect:
+            self._constraints.append(func)
+            self._columnar = None
+
+    def columnar(self):
+        """Get the columnar encoding of this space
+
+        Returns
+        -------
+        columnar: ColumnarConfigSpace
+        """
+        if self._columnar is None:
+            self._columnar = ColumnarConfigSpace(self)
+        return self._columnar
+
     def add_flop(self, flop):
         """Add float operation statistics for this tuning task
 
@@ -832,6 +866,8 @@ class ConfigSpace(object):
             space = space_class(axes, policy, **kwargs)
             self.space_map[name] = space
             self._entity_map[name] = space[0]
+            self._length = None
+            self._columnar = None
             return [Axis(space, i) for i in range(space.num_output)]
         return [Axis(None, i) for i in range(space_class.get_num_output(axes, policy, **kwargs))]
 
@@ -892,6 +928,183 @@ _ann_to_number = {
 }
 
 
+def _flatten_entity(entity):
+    """flatten a transform entity to a list of numbers"""
+    if isinstance(entity, SplitEntity):
+        return list(entity.size)
+    if isinstance(entity, ReorderEntity):
+        # use a naive way: directly copy the permutation
+        return list(entity.perm)
+    if isinstance(entity, AnnotateEntity):
+        # one-hot encoding
+        fea = []
+        for ann in entity.anns:
+            tmp = [0] * len(_ann_to_number)
+            tmp[_ann_to_number[ann]] = 1
+            fea.extend(tmp)
+        return fea
+    if isinstance(entity, OtherOptionEntity):
+        return [entity.val]
+    return []
+
+
+def _entity_value(entity):
+    """the value of a transform entity seen by constraints"""
+    if isinstance(entity, SplitEntity):
+        return list(entity.size)
+    if isinstance(entity, ReorderEntity):
+        return list(entity.perm)
+    if isinstance(entity, AnnotateEntity):
+        return [_ann_to_number[ann] for ann in entity.anns]
+    if isinstance(entity, OtherOptionEntity):
+        return entity.val
+    return None
+
+
+class ColumnarConfigSpace(object):
+    """Columnar encoding of a ConfigSpace.
+
+    Each knob is stored as a small table whose rows are the flatten features of its
+    entities. A batch of config indexes is decoded into knob indexes with vectorized
+    mixed-radix arithmetic (the first knob is the least significant digit, as in
+    ConfigSpace.get), then features and constraints of the whole batch are computed
+    by a few gathers instead of creating a ConfigEntity for every config.
+
+    Parameters
+    ----------
+    space: ConfigSpace
+        The space to encode. Its length must fit in int64.
+    """
+
+    def __init__(self, space):
+        self.names = list(space.space_map.keys())
+        self.dims = np.array([len(x) for x in space.space_map.values()], dtype=np.int64)
+        self.constraints = list(space._constraints)
+        self.tables = []
+        self.values = OrderedDict()
+        for name, knob in space.space_map.items():
+            rows = [_flatten_entity(x) for x in knob.entities]
+            try:
+                self.tables.append(np.array(rows, dtype=np.float32).reshape((len(rows), -1)))
+            except (TypeError, ValueError):
+                # candidates of define_knob are not numbers
+                self.tables.append(None)
+            values = [_entity_value(x) for x in knob.entities]
+            try:
+                self.values[name] = np.array(values)
+            except ValueError:
+                self.values[name] = np.empty(len(values), dtype=object)
+                self.values[name][:] = values
+        self.feature_len = sum([x.shape[1] for x in self.tables if x is not None])
+
+    def __len__(self):
+        return functools.reduce(lambda x, y: x * int(y), self.dims, 1)
+
+    def decode(self, indexes):
+        """Decode config indexes into knob indexes
+
+        Parameters
+        ----------
+        indexes: Array of int
+            The config indexes
+
+        Returns
+        -------
+        knob_indexes: np.ndarray
+            2-D int64 array, the entity index of each knob for each config
+        """
+        t = np.asarray(indexes, dtype=np.int64).reshape(-1)
+        ret = np.empty((len(t), len(self.dims)), dtype=np.int64)
+        for i, dim in enumerate(self.dims):
+            ret[:, i] = t % dim
+            t = t // dim
+        return ret
+
+    def encode(self, knob_indexes):
+        """Encode knob indexes into config indexes, the inverse of decode
+
+        Parameters
+        ----------
+        knob_indexes: np.ndarray
+            2-D int array, the entity index of each knob for each config
+
+        Returns
+        -------
+        indexes: np.ndarray
+            1-D int64 array
+        """
+        knob_indexes = np.asarray(knob_indexes, dtype=np.int64)
+        ret = np.zeros(len(knob_indexes), dtype=np.int64)
+        multiplier = 1
+        for i, dim in enumerate(self.dims):
+            ret += knob_indexes[:, i] * multiplier
+            multiplier *= int(dim)
+        return ret
+
+    def get_flatten_feature(self, indexes):
+        """Get the flatten features of a batch of configs,
+        same as ConfigEntity.get_flatten_feature for each of them
+
+        Parameters
+        ----------
+        indexes: Array of int
+            The config indexes
+
+        Returns
+        -------
+        feas: np.ndarray
+            2-D float32 array, one row per config
+        """
+        knob_indexes = self.decode(indexes)
+        for name, table in zip(self.names, self.tables):
+            if table is None:
+                raise ValueError("The candidates of knob %s can not be flattened" % name)
+        if not self.tables:
+            return np.zeros((len(knob_indexes), 0), dtype=np.float32)
+        return np.concatenate(
+            [table[knob_indexes[:, i]] for i, table in enumerate(self.tables)], axis=1
+        )
+
+    def get_knob_values(self, indexes):
+        """Get the knob values of a batch of configs
+
+        Parameters
+        ----------
+        indexes: Array of int
+            The config indexes
+
+        Returns
+        -------
+        knobs: OrderedDict of str to np.ndarray
+            The values of each knob, the first dimension is the batch
+        """
+        knob_indexes = self.decode(indexes)
+        return OrderedDict(
+            [(name, self.values[name][knob_indexes[:, i]]) for i, name in enumerate(self.names)]
+        )
+
+    def valid(self, indexes):
+        """Evaluate the constraints of a batch of configs in one vectorized call
+
+        Parameters
+        ----------
+        indexes: Array of int
+            The config indexes
+
+        Returns
+        -------
+        mask: np.ndarray
+            1-D bool array, whether each config meets all the constraints
+        """
+        num = len(np.asarray(indexes).reshape(-1))
+        mask = np.ones(num, dtype=bool)
+        if self.constraints:
+            knobs = self.get_knob_values(indexes)
+            for func in self.constraints:
+                mask &= np.broadcast_to(np.asarray(func(knobs), dtype=bool), (num,))
+        return mask
+
+
 class ConfigEntity(ConfigSpace):
     """A configuration with detailed parameters
 
@@ -916,6 +1129,26 @@ class ConfigEntity(ConfigSpace):
         self._constraints = constraints
         self.code_hash = code_hash
 
+    def valid(self):
+        """Check whether the config meets all the constraints, i.e. it has no
+        instantiation error and satisfies the constraints added by
+        :any:`ConfigSpace.add_constraint`
+
+        Returns
+        -------
+        valid: bool
+            whether the config meets all the constraints
+        """
+        if self.errors:
+            return False
+        if not self._constraints:
+            return True
+        # a batch of one config, as seen by ColumnarConfigSpace.valid
+        knobs = OrderedDict(
+            [(name, np.array([_entity_value(v)])) for name, v in self._entity_map.items()]
+        )
+        return all(bool(np.asarray(func(knobs)).reshape(-1)[0]) for func in self._constraints)
+
     def get_flatten_feature(self):
         """flatten entities to a numerical one-dimensional feature vector
 
@@ -926,19 +1159,7 @@ class ConfigEntity(ConfigSpace):
         """
         fea = []
         for _, v in self._entity_map.items():
-            if isinstance(v, SplitEntity):
-                fea.extend(v.size)
-            elif isinstance(v, ReorderEntity):
-                # use a naive way: directly copy the permutation
-                fea.extend(v.perm)
-            elif isinstance(v, AnnotateEntity):
-                # one-hot encoding
-                for ann in v.anns:
-                    tmp = [0] * len(_ann_to_number)
-                    tmp[_ann_to_number[ann]] = 1
-                    fea.extend(tmp)
-            elif isinstance(v, OtherOptionEntity):
-                fea.append(v.val)
+            fea.extend(_flatten_entity(v))
         return np.array(fea, dtype=np.float32)
 
     def get_other_option(self):
@@ -20,6 +20,9 @@ This type of tuner will fit a cost model and use some optimization methods to
 find optimums points of cost model in space.
 """
 import gc
+import os
+import tempfile
+from collections import OrderedDict
 
 import numpy as np
 
@@ -27,36 +30,231 @@ from .tuner import Tuner
 from ..env import GLOBAL_SCOPE
 
 
+class FeatureTable(object):
+    """Array-backed feature cache of one feature type.
+
+    Features are rows of a preallocated 2-D float32 matrix, with a map from
+    config index to row. When the table is full, the least recently used rows
+    are evicted. The matrix can be memory-mapped to a file to spill it to disk.
+
+    Parameters
+    ----------
+    capacity: int
+        The max number of cached features
+    spill_dir: str, optional
+        If is not None, the matrix is a memory-mapped file in this directory
+    """
+
+    def __init__(self, capacity=100000, spill_dir=None):
+        self.capacity = capacity
+        self.spill_dir = spill_dir
+        self.index = {}
+        self.row_points = []
+        self.free_rows = []
+        self.feature_len = None
+        self.matrix = None
+        self.is_none = np.zeros(0, dtype=bool)
+        self.last_use = np.zeros(0, dtype=np.int64)
+        self.tick = 0
+
+    def __contains__(self, point):
+        return point in self.index
+
+    def __len__(self):
+        return len(self.index)
+
+    def __getitem__(self, point):
+        row = self.index[point]
+        self.last_use[row] = self.tick
+        return None if self.is_none[row] else self.matrix[row]
+
+    def __setitem__(self, point, fea):
+        self.put([point], [fea])
+
+    def _allocate(self, n_rows, feature_len):
+        shape = (n_rows, feature_len)
+        if self.spill_dir is not None and n_rows * feature_len > 0:
+            os.makedirs(self.spill_dir, exist_ok=True)
+            fd, path = tempfile.mkstemp(dir=self.spill_dir, suffix=".fea")
+            os.close(fd)
+            matrix = np.memmap(path, dtype=np.float32, mode="w+", shape=shape)
+            # the mapping stays valid, the file is removed with the table
+            os.remove(path)
+        else:
+            matrix = np.zeros(shape, dtype=np.float32)
+        if self.matrix is not None and self.matrix.shape[1] == feature_len:
+            matrix[: len(self.matrix)] = self.matrix
+        self.matrix = matrix
+        is_none = np.zeros(n_rows, dtype=bool)
+        is_none[: len(self.is_none)] = self.is_none
+        self.is_none = is_none
+        last_use = np.zeros(n_rows, dtype=np.int64)
+        last_use[: len(self.last_use)] = self.last_use
+        self.last_use = last_use
+
+    def _get_rows(self, n):
+        """Get n free rows, evict the least recently used rows if needed"""
+        n_allocated = len(self.row_points)
+        n_new = min(max(n - len(self.free_rows), 0), max(self.capacity - n_allocated, 0))
+        if n_new > 0:
+            if self.matrix is None or len(self.matrix) < n_allocated + n_new:
+                size = n_allocated + n_new if self.matrix is None else 2 * len(self.matrix)
+                size = min(max(size, n_allocated + n_new, 64), max(self.capacity, n))
+                self._allocate(size, self.feature_len or 0)
+            self.free_rows.extend(range(n_allocated, n_allocated + n_new))
+            self.row_points.extend([None] * n_new)
+
+        n_evict = n - len(self.free_rows)
+        if n_evict > 0:
+            used = np.array(
+                [row for row, p in enumerate(self.row_points) if p is not None], dtype=np.int64
+            )
+            # do not evict the rows in use since the last lookup
+            used = used[self.last_use[used] < self.tick]
+            if len(used) > 0:
+                # evict some more rows to amortize the cost
+                n_victim = min(len(used), max(n_evict, self.capacity // 16))
+                victims = used[np.argpartition(self.last_use[used], n_victim - 1)[:n_victim]]
+                for row in victims.tolist():
+                    del self.index[self.row_points[row]]
+                    self.row_points[row] = None
+                    self.free_rows.append(row)
+
+        n_grow = n - len(self.free_rows)
+        if n_grow > 0:
+            # a single request larger than the capacity
+            n_allocated = len(self.row_points)
+            if len(self.matrix) < n_allocated + n_grow:
+                self._allocate(n_allocated + n_grow, self.feature_len or 0)
+            self.free_rows.extend(range(n_allocated, n_allocated + n_grow))
+            self.row_points.extend([None] * n_grow)
+
+        rows = self.free_rows[-n:] if n > 0 else []
+        del self.free_rows[len(self.free_rows) - n :]
+        return rows
+
+    def missing(self, points):
+        """Mark the cached points as used and get the points not cached
+
+        Parameters
+        ----------
+        points: Array of int
+            The config indexes
+
+        Returns
+        -------
+        missing: list of int
+        """
+        self.tick += 1
+        ret = []
+        for p in points:
+            row = self.index.get(p)
+            if row is None:
+                ret.append(p)
+            else:
+                self.last_use[row] = self.tick
+        return ret
+
+    def put(self, points, feas):
+        """Add features into the cache
+
+        Parameters
+        ----------
+        points: Array of int
+            The config indexes
+        feas: Array of Array of float
+            The features, can be None if extraction fails
+        """
+        feas = {p: fea for p, fea in zip(points, feas) if p not in self.index}
+        points = list(feas.keys())
+        if self.feature_len is None:
+            for fea in feas.values():
+                if fea is not None:
+                    self.feature_len = np.asarray(fea).shape[-1]
+                    if self.matrix is not None:
+                        self._allocate(len(self.matrix), self.feature_len)
+                    break
+        rows = self._get_rows(len(points))
+        for p, row in zip(points, rows):
+            fea = feas[p]
+            self.index[p] = row
+            self.row_points[row] = p
+            self.last_use[row] = self.tick
+            self.is_none[row] = fea is None
+            self.matrix[row] = 0 if fea is None else fea
+
+    def take(self, points):
+        """Get the feature matrix of cached points.
+        Returns a view of the cache if the rows are contiguous, otherwise
+        a single vectorized gather. None features are zero rows.
+        The result is only valid until the next put.
+
+        Parameters
+        ----------
+        points: Array of int
+            The config indexes
+
+        Returns
+        -------
+        features: Array of Array of float
+        """
+        index = self.index
+        rows = np.fromiter((index[p] for p in points), dtype=np.int64, count=len(points))
+        self.last_use[rows] = self.tick
+        if len(rows) > 0 and rows[-1] - rows[0] + 1 == len(rows) and np.all(np.diff(rows) == 1):
+            return self.matrix[rows[0] : rows[-1] + 1]
+        if self.matrix is None:
+            return np.zeros((len(rows), 0), dtype=np.float32)
+        return np.take(self.matrix, rows, axis=0)
+
+
 class FeatureCache(object):
-    """Feature cache manager for cache sharing between different cost models"""
+    """Feature cache manager for cache sharing between different cost models
+    and tuning tasks. Each key owns a bounded :any:`FeatureTable`, the least
+    recently used tables are dropped when there are more than `max_tables`.
 
-    def __init__(self):
-        self.feature_cache = {}
+    Parameters
+    ----------
+    capacity: int
+        The max number of cached features of one key
+    spill_dir: str, optional
+        If is not None, memory-map the feature matrices to files in this directory
+    max_tables: int, optional
+        The max number of keys
+    """
+
+    def __init__(self, capacity=100000, spill_dir=None, max_tables=16):
+        self.capacity = capacity
+        self.spill_dir = spill_dir
+        self.max_tables = max_tables
+        self.feature_cache = OrderedDict()
 
     def get(self, key):
-        """Get feature cache dictionary for a key
+        """Get feature cache table for a key
 
         Parameters
         ----------
-        key: str
+        key: hashable
             The key of a feature type
 
         Returns
         -------
-        fea_cache: dict
-            cache dictionary
+        fea_cache: FeatureTable
+            cache table
         """
         if key not in self.feature_cache:
-            self.feature_cache[key] = {}
-
+            self.feature_cache[key] = FeatureTable(self.capacity, self.spill_dir)
+            while self.max_tables and len(self.feature_cache) > self.max_tables:
+                self.feature_cache.popitem(last=False)
+        self.feature_cache.move_to_end(key)
         return self.feature_cache[key]
 
     def size(self, key):
-        """ " Get the size of a feature cache dictionary
+        """ " Get the size of a feature cache table
 
         Parameters
         ----------
-        key: str
+        key: hashable
             The key of a feature type
 
         Returns
@@ -70,11 +268,11 @@ class FeatureCache(object):
 
         Parameters
         ----------
-        key: str
+        key: hashable
             The key of a feature type
         """
-        del self.feature_cache[key]
-        self.feature_cache[key] = {}
+        if key in self.feature_cache:
+            del self.feature_cache[key]
         gc.collect()
 
 
@@ -19,8 +19,8 @@
 Cost model optimizer based on simulated annealing
 """
 
-import heapq
 import logging
+import multiprocessing
 import time
 
 import numpy as np
@@ -47,6 +47,11 @@ class SimulatedAnnealingOptimizer(ModelOptimizer):
         Stop iteration if the optimal set do not change in `early_stop` rounds
     log_interval: int, optional
         Print log every `log_interval` iterations
+    n_chains: int, optional
+        The number of independent SA chains, each one walks `parallel_size` points
+    n_workers: int, optional
+        The number of worker processes that run the chains.
+        If is 1, all the chains run in this process.
     """
 
     def __init__(
@@ -58,21 +63,130 @@ class SimulatedAnnealingOptimizer(ModelOptimizer):
         parallel_size=128,
         early_stop=50,
         log_interval=50,
+        n_chains=1,
+        n_workers=1,
     ):
         super(SimulatedAnnealingOptimizer, self).__init__()
 
         self.task = task
         self.dims = [len(x) for x in self.task.config_space.space_map.values()]
+        columnar = self.task.config_space.columnar()
+        # only needed to check the constraints of the space
+        self.columnar = columnar if columnar.constraints else None
 
         self.n_iter = n_iter
         self.temp = temp
         self.persistent = persistent
-        self.parallel_size = min(parallel_size, len(self.task.config_space))
+        self.n_chains = max(1, n_chains)
+        self.n_workers = max(1, n_workers)
+        self.parallel_size = min(parallel_size, len(self.task.config_space) // self.n_chains)
+        self.parallel_size = max(1, self.parallel_size)
         self.early_stop = early_stop or 1e9
         self.log_interval = log_interval
         self.points = None
 
     def find_maximums(self, model, num, exclusive):
+        tic = time.time()
+        if self.persistent and self.points is not None:
+            points = self.points
+        else:
+            points = self.sample_points(
+                min(self.parallel_size * self.n_chains, len(self.task.config_space))
+            )
+        exclusive = np.array(list(exclusive), dtype=points.dtype)
+        chains = np.array_split(points, self.n_chains)
+
+        if self.n_workers > 1 and self.n_chains > 1:
+            # the forked workers inherit the model
+            global _sa_context
+            _sa_context = (self, model, num, exclusive)
+            seeds = np.random.randint(np.iinfo(np.int32).max, size=self.n_chains)
+            with multiprocessing.get_context("fork").Pool(
+                min(self.n_workers, self.n_chains)
+            ) as pool:
+                results = pool.map(_anneal_chain, list(zip(seeds, chains)))
+            _sa_context = None
+        else:
+            results = [self.anneal(model, chain, num, exclusive) for chain in chains]
+
+        top_scores = np.concatenate([x[0] for x in results])
+        top_points = np.concatenate([x[1] for x in results])
+        points = np.concatenate([x[2] for x in results])
+        # merge the maximums of all chains
+        top_points, index = np.unique(top_points, return_index=True)
+        top_scores = top_scores[index]
+        order = np.argsort(-top_scores, kind="stable")[:num]
+        top_scores, top_points = top_scores[order], top_points[order]
+        valid = top_scores >= 0
+        top_scores, top_points = top_scores[valid], top_points[valid]
+        logger.debug(
+            "SA iter: %d\tlast_update: %d\telapsed: %.2f",
+            max([x[3] for x in results]),
+            max([x[4] for x in results]),
+            time.time() - tic,
+        )
+        logger.debug("SA Maximums: %s", list(zip(top_scores, top_points)))
+
+        if self.persistent:
+            self.points = points
+
+        return [int(x) for x in top_points]
+
+    def sample_points(self, num, max_rounds=100):
+        """Sample distinct start points, and resample the ones violating
+        the constraints of the space
+
+        Parameters
+        ----------
+        num: int
+            The number of points
+        max_rounds: int
+            The max number of resampling rounds, after which the invalid points are kept
+
+        Returns
+        -------
+        points: Array of int
+            int64 indexes, or python ints if the space does not fit in int64
+        """
+        space_len = len(self.task.config_space)
+        dtype = np.int64 if space_len < np.iinfo(np.int64).max else object
+        points = np.array(sample_ints(0, space_len, num), dtype=dtype)
+        if self.columnar is None:
+            return points
+        for _ in range(max_rounds):
+            invalid = np.logical_not(self.columnar.valid(points))
+            if not np.any(invalid):
+                break
+            points[invalid] = sample_ints(0, space_len, int(np.sum(invalid)))
+        return points
+
+    def anneal(self, model, points, num, exclusive):
+        """Run one SA chain
+
+        Parameters
+        ----------
+        model: CostModel
+            The cost model
+        points: Array of int
+            The start points of the chain
+        num: int
+            The number of returned maximums
+        exclusive: Array of int
+            The points that should not be returned
+
+        Returns
+        -------
+        top_scores: Array of float
+            The scores of maximums
+        top_points: Array of int
+            The maximums
+        points: Array of int
+            The end points of the chain
+        k: int
+            The number of iterations
+        k_last_modify: int
+            The iteration of last update of the maximums
+        """
         tic = time.time()
         temp, n_iter, early_stop, log_interval = (
             self.temp,
@@ -81,24 +195,18 @@ class SimulatedAnnealingOptimizer(ModelOptimizer):
             self.log_interval,
         )
 
-        if self.persistent and self.points is not None:
-            points = self.points
-        else:
-            points = np.array(sample_ints(0, len(self.task.config_space), self.parallel_size))
-
+        points = np.array(points)
         scores = model.predict(points)
-
-        # build heap and insert initial points
-        heap_items = [(float("-inf"), -1 - i) for i in range(num)]
-        heapq.heapify(heap_items)
-        in_heap = set(exclusive)
-        in_heap.update([x[1] for x in heap_items])
-
-        for s, p in zip(scores, points):
-            if s > heap_items[0][0] and p not in in_heap:
-                pop = heapq.heapreplace(heap_items, (s, p))
-                in_heap.remove(pop[1])
-                in_heap.add(p)
+        if self.columnar is not None:
+            # invalid start points are never maximums, and any valid move leaves them
+            scores = np.where(self.columnar.valid(points), scores, float("-inf"))
+
+        # dummy negative points as initial maximums
+        top_scores = np.full(num, float("-inf"))
+        top_points = -1 - np.arange(num, dtype=points.dtype)
+        top_scores, top_points, _ = update_maximums(
+            top_scores, top_points, scores, points, exclusive
+        )
 
         k = 0
         k_last_modify = 0
@@ -111,24 +219,25 @@ class SimulatedAnnealingOptimizer(ModelOptimizer):
             cool = 0
 
         while k < n_iter and k < k_last_modify + early_stop:
-            new_points = np.empty_like(points)
-            for i, p in enumerate(points):
-                new_points[i] = random_walk(p, self.dims)
-
+            new_points = random_walk_batch(points, self.dims)
             new_scores = model.predict(new_points)
+            if self.columnar is not None:
+                # configs violating the constraints of the space are never accepted
+                new_scores = np.where(self.columnar.valid(new_points), new_scores, float("-inf"))
 
-            ac_prob = np.exp(np.minimum((new_scores - scores) / (t + 1e-5), 1))
+            with np.errstate(invalid="ignore"):
+                # nan for moves between invalid points, which are rejected
+                ac_prob = np.exp(np.minimum((new_scores - scores) / (t + 1e-5), 1))
             ac_index = np.random.random(len(ac_prob)) < ac_prob
 
             points[ac_index] = new_points[ac_index]
             scores[ac_index] = new_scores[ac_index]
 
-            for s, p in zip(new_scores, new_points):
-                if s > heap_items[0][0] and p not in in_heap:
-                    pop = heapq.heapreplace(heap_items, (s, p))
-                    in_heap.remove(pop[1])
-                    in_heap.add(p)
-                    k_last_modify = k
+            top_scores, top_points, modified = update_maximums(
+                top_scores, top_points, new_scores, new_points, exclusive
+            )
+            if modified:
+                k_last_modify = k
 
             k += 1
             t -= cool
@@ -140,23 +249,102 @@ class SimulatedAnnealingOptimizer(ModelOptimizer):
                     "elapsed: %.2f",
                     k,
                     k_last_modify,
-                    heap_items[0][0],
-                    np.max([v for v, _ in heap_items]),
+                    np.min(top_scores),
+                    np.max(top_scores),
                     t_str,
                     time.time() - tic,
                 )
 
-        heap_items.sort(key=lambda item: -item[0])
-        heap_items = [x for x in heap_items if x[0] >= 0]
-        logger.debug(
-            "SA iter: %d\tlast_update: %d\telapsed: %.2f", k, k_last_modify, time.time() - tic
-        )
-        logger.debug("SA Maximums: %s", heap_items)
+        return top_scores, top_points, points, k, k_last_modify
 
-        if self.persistent:
-            self.points = points
 
-        return [x[1] for x in heap_items]
+_sa_context = None
+
+
+def _anneal_chain(args):
+    """run one SA chain in a worker process"""
+    seed, points = args
+    np.random.seed(seed)
+    optimizer, model, num, exclusive = _sa_context
+    return optimizer.anneal(model, points, num, exclusive)
+
+
+def update_maximums(top_scores, top_points, scores, points, exclusive):
+    """Batched top-k update of the maximums
+
+    Parameters
+    ----------
+    top_scores: Array of float
+        The scores of current maximums
+    top_points: Array of int
+        The current maximums
+    scores: Array of float
+        The scores of new points
+    points: Array of int
+        The new points
+    exclusive: Array of int
+        The points that should not be maximums
+
+    Returns
+    -------
+    top_scores: Array of float
+    top_points: Array of int
+    modified: bool
+        Whether the maximums changed
+    """
+    num = len(top_scores)
+    if num == 0:
+        return top_scores, top_points, False
+    mask = scores > np.min(top_scores)
+    if not np.any(mask):
+        return top_scores, top_points, False
+    scores, points = scores[mask], points[mask]
+    mask = np.logical_not(np.isin(points, exclusive) | np.isin(points, top_points))
+    points, index = np.unique(points[mask], return_index=True)
+    if len(points) == 0:
+        return top_scores, top_points, False
+    scores = scores[mask][index]
+
+    all_scores = np.concatenate([top_scores, scores])
+    all_points = np.concatenate([top_points, points])
+    keep = np.argpartition(-all_scores, num - 1)[:num]
+    return all_scores[keep], all_points[keep], bool(np.any(keep >= num))
+
+
+def random_walk_batch(points, dims):
+    """random walk as local transition of many points at once.
+    Each point changes one knob, in the same distribution as :any:`random_walk`.
+
+    Parameters
+    ----------
+    points: Array of int
+        indexes of the ConfigEntity, python ints if the space does not fit in int64
+    dims: Array of int
+        sizes of each dimension
+
+    Returns
+    -------
+    new_points: Array of int
+        new neighborhood indexes, of the same dtype as points
+    """
+    points = np.asarray(points)
+    dims = np.array(dims, dtype=np.int64)
+    if int(np.prod(dims.astype(np.float64))) >= np.iinfo(np.int64).max:
+        # mixed radix does not fit in int64
+        new_points = np.empty(len(points), dtype=points.dtype)
+        new_points[:] = [random_walk(int(p), dims.tolist()) for p in points]
+        return new_points
+    mutable = np.nonzero(dims > 1)[0]
+    if len(mutable) == 0:
+        return points.copy()
+    strides = np.concatenate([[1], np.cumprod(dims[:-1])]).astype(np.int64)
+
+    # random_walk picks a knob uniformly and retries if the value does not change
+    prob = (dims[mutable] - 1) / dims[mutable]
+    from_i = mutable[np.random.choice(len(mutable), size=len(points), p=prob / np.sum(prob))]
+    old_v = (points // strides[from_i]) % dims[from_i]
+    new_v = (old_v + np.random.randint(1, dims[from_i])) % dims[from_i]
+    return points + (new_v - old_v) * strides[from_i]
 
 
 def random_walk(p, dims):
@@ -17,9 +17,14 @@
 # pylint: disable=invalid-name
 """XGBoost as cost model"""
 
+import atexit
 import multiprocessing
+import multiprocessing.connection
 import logging
+import os
+import pickle
 import time
+from collections import OrderedDict, deque
 
 import numpy as np
 
@@ -66,14 +71,25 @@ class XGBoostCostModel(CostModel):
                      The cost model predicts relative rank score.
     num_threads: int, optional
         The number of threads.
+        Feature extraction runs in the shared FeatureExtractionService of this number of workers.
     log_interval: int, optional
         If is not none, the cost model will print training log every `log_interval` iterations.
     upper_model: XGBoostCostModel, optional
         The upper model used in transfer learning
+    feature_cache: FeatureCache, optional
+        The feature cache shared by the cost models of several tuning tasks.
+        If is None, create a new one (or use the one of upper model).
     """
 
     def __init__(
-        self, task, feature_type, loss_type, num_threads=None, log_interval=25, upper_model=None
+        self,
+        task,
+        feature_type,
+        loss_type,
+        num_threads=None,
+        log_interval=25,
+        upper_model=None,
+        feature_cache=None,
     ):
         super(XGBoostCostModel, self).__init__()
 
@@ -134,49 +150,35 @@ class XGBoostCostModel(CostModel):
 
         if upper_model:  # share a same feature cache with upper model
             self.feature_cache = upper_model.feature_cache
+        elif feature_cache is not None:
+            self.feature_cache = feature_cache
         else:
             self.feature_cache = FeatureCache()
+        # config indexes are only meaningful in one task
+        self.cache_key = (feature_type, task.name, str(task.args)) if task else feature_type
+        self.task_key = (task.name, str(task.args), str(self.target))
         self.upper_model = upper_model
         self.feature_extra_ct = 0
-        self.pool = None
         self.base_model = None
 
         self._sample_size = 0
-        self._reset_pool(self.space, self.target, self.task)
 
-    def _reset_pool(self, space, target, task):
-        """reset processing pool for feature extraction"""
+    def _get_service(self):
+        """get the extraction service and send the task definition to it"""
+        if self.upper_model:  # base model will reuse upper model's service
+            return self.upper_model._get_service()
 
-        if self.upper_model:  # base model will reuse upper model's pool,
-            self.upper_model._reset_pool(space, target, task)
-            return
-
-        self._close_pool()
-
-        # use global variable to pass common arguments
-        global _extract_space, _extract_target, _extract_task
-        _extract_space = space
-        _extract_target = target
-        _extract_task = task
-        self.pool = multiprocessing.Pool(self.num_threads)
-
-    def _close_pool(self):
-        if self.pool:
-            self.pool.terminate()
-            self.pool.join()
-            self.pool = None
-
-    def _get_pool(self):
-        if self.upper_model:
-            return self.upper_model._get_pool()
-        return self.pool
+        # the service can not be used in a forked process, e.g. SA chain workers
+        service = get_feature_service(self.num_threads)
+        if service is not None:
+            service.register(self.task_key, self.space, self.target, self.task)
+        return service
 
     def _base_model_discount(self):
         return 1.0 / (2 ** (self._sample_size / 64.0))
 
     def fit(self, xs, ys, plan_size):
         tic = time.time()
-        self._reset_pool(self.space, self.target, self.task)
 
         x_train = self._get_feature(xs)
         y_train = np.array(ys)
@@ -219,7 +221,7 @@ class XGBoostCostModel(CostModel):
             time.time() - tic,
             len(xs),
             len(xs) - np.sum(valid_index),
-            self.feature_cache.size(self.fea_type),
+            self.feature_cache.size(self.cache_key),
         )
 
     def fit_log(self, records, plan_size):
@@ -234,8 +236,6 @@ class XGBoostCostModel(CostModel):
         logger.debug("XGB load %d entries from history log file", len(data))
 
         # extract feature
-        self._reset_pool(self.space, self.target, self.task)
-        pool = self._get_pool()
         if self.fea_type == "itervar":
             feature_extract_func = _extract_itervar_feature_log
         elif self.fea_type == "knob":
@@ -244,7 +244,11 @@ class XGBoostCostModel(CostModel):
             feature_extract_func = _extract_curve_feature_log
         else:
             raise RuntimeError("Invalid feature type: " + self.fea_type)
-        res = pool.map(feature_extract_func, data)
+        service = self._get_service()
+        if service is not None:
+            res = service.map(feature_extract_func, data)
+        else:
+            res = [feature_extract_func(x) for x in data]
 
         # filter out feature with different shapes
         fea_len = len(self._get_feature([0])[0])
@@ -303,7 +307,6 @@ class XGBoostCostModel(CostModel):
 
     def load_basemodel(self, base_model):
         self.base_model = base_model
-        self.base_model._close_pool()
         self.base_model.upper_model = self
 
     def spawn_base_model(self):
@@ -313,35 +316,282 @@ class XGBoostCostModel(CostModel):
 
     def _get_feature(self, indexes):
         """get features for indexes, run extraction if we do not have cache for them"""
-        # free feature cache
-        if self.feature_cache.size(self.fea_type) >= 100000:
-            self.feature_cache.clear(self.fea_type)
-
-        fea_cache = self.feature_cache.get(self.fea_type)
+        # the cache is bounded, least recently used features are evicted
+        fea_cache = self.feature_cache.get(self.cache_key)
 
         indexes = np.array(indexes)
-        need_extract = [x for x in indexes if x not in fea_cache]
+        need_extract = fea_cache.missing(indexes.tolist())
+
+        if need_extract and self.fea_type == "knob":
+            # knob features are decoded in bulk from the columnar encoding of the space
+            try:
+                feas = self.space.columnar().get_flatten_feature(need_extract)
+                fea_cache.put(need_extract, feas)
+                need_extract = []
+            except (TypeError, ValueError, OverflowError):
+                pass
 
         if need_extract:
-            pool = self._get_pool()
-            feas = pool.map(self.feature_extract_func, need_extract)
-            for i, fea in zip(need_extract, feas):
-                fea_cache[i] = fea
-
-        feature_len = None
-        for idx in indexes:
-            if fea_cache[idx] is not None:
-                feature_len = fea_cache[idx].shape[-1]
-                break
+            service = self._get_service()
+            if service is not None:
+                # batches are cached as soon as they are streamed back
+                for start, feas in service.imap(
+                    self.feature_extract_func, need_extract, self.task_key
+                ):
+                    fea_cache.put(need_extract[start : start + len(feas)], feas)
+            else:
+                _set_extract_context(self.space, self.target, self.task)
+                feas = [self.feature_extract_func(x) for x in need_extract]
+                fea_cache.put(need_extract, feas)
+
+        return fea_cache.take(indexes.tolist())
+
+
+class _ExtractionWorker(object):
+    """A worker process and the task keys sent to it"""
+
+    def __init__(self, contexts, max_tasks):
+        self.conn, child_conn = multiprocessing.Pipe()
+        self.process = multiprocessing.Process(
+            target=_extraction_worker_loop, args=(child_conn, contexts, max_tasks)
+        )
+        self.process.daemon = True
+        self.process.start()
+        child_conn.close()
+        # a forked worker inherits all task definitions registered so far
+        self.keys = set(contexts.keys())
+
+    def close(self, timeout=1):
+        try:
+            self.conn.send(None)
+        except (OSError, ValueError):
+            pass
+        self.process.join(timeout)
+        if self.process.is_alive():
+            self.process.terminate()
+            self.process.join()
+        self.conn.close()
+
+
+class FeatureExtractionService(object):
+    """Long-lived worker processes for feature extraction.
+
+    Unlike a pool recreated for every fit, the workers survive across fit calls
+    and tuning tasks. The definition of a task is sent to each worker once,
+    then only the config indexes (or log items) are sent and the features are
+    streamed back in batches. A crashed worker is restarted, and the items it
+    was working on get None features.
+
+    Parameters
+    ----------
+    num_workers: int, optional
+        The number of worker processes. If is None, use the number of cpus.
+    batch_size: int
+        The number of items sent to a worker in one message
+    max_tasks: int
+        The max number of task definitions kept in the workers
+    """
 
-        ret = np.empty((len(indexes), feature_len), dtype=np.float32)
-        for i, ii in enumerate(indexes):
-            t = fea_cache[ii]
-            ret[i, :] = t if t is not None else 0
+    def __init__(self, num_workers=None, batch_size=64, max_tasks=16):
+        self.num_workers = num_workers or multiprocessing.cpu_count()
+        self.batch_size = batch_size
+        self.max_tasks = max_tasks
+        self.contexts = OrderedDict()
+        self.payloads = {}
+        self.workers = []
+        self.pid = os.getpid()
+
+    def register(self, key, space, target, task):
+        """Register the definition of a task, it is sent to workers when first used
+
+        Parameters
+        ----------
+        key: hashable
+            The key of the task
+        space: ConfigSpace
+        target: Target
+        task: Task
+        """
+        if key in self.contexts:
+            self.contexts.move_to_end(key)
+            return
+        self.contexts[key] = (space, target, task)
+        while len(self.contexts) > self.max_tasks:
+            old_key, _ = self.contexts.popitem(last=False)
+            self.payloads.pop(old_key, None)
+
+    def _payload(self, key):
+        if key not in self.payloads:
+            try:
+                self.payloads[key] = pickle.dumps(self.contexts[key])
+            except Exception:  # pylint: disable=broad-except
+                # will be inherited by forking a new worker instead
+                self.payloads[key] = None
+        return self.payloads[key]
+
+    def _start(self):
+        while len(self.workers) < self.num_workers:
+            self.workers.append(_ExtractionWorker(self.contexts, self.max_tasks))
+
+    def _restart(self, worker):
+        worker.close(timeout=0)
+        new_worker = _ExtractionWorker(self.contexts, self.max_tasks)
+        self.workers[self.workers.index(worker)] = new_worker
+        return new_worker
+
+    def _send(self, worker, func, key, items):
+        if key is not None and key not in worker.keys:
+            payload = self._payload(key)
+            if payload is not None:
+                worker.conn.send(("register", key, payload))
+            worker.keys.add(key)
+        worker.conn.send(("extract", key, func, items))
+
+    def imap(self, func, items, key=None):
+        """Run func on items in the workers.
+
+        Parameters
+        ----------
+        func: callable
+            A module level function, called as func(item)
+        items: list
+            The arguments
+        key: hashable, optional
+            The key of a registered task, its definition is set as the
+            extraction context before calling func
+
+        Returns
+        -------
+        batches: generator of (int, list)
+            The start position and the results of every batch,
+            in the order they finish
+        """
+        self._start()
+        items = list(items)
+        # (start, items, attempt)
+        pending = deque(
+            [(i, items[i : i + self.batch_size], 0) for i in range(0, len(items), self.batch_size)]
+        )
+        idle = list(self.workers)
+        busy = {}
+        try:
+            while pending or busy:
+                while pending and idle:
+                    worker = idle.pop()
+                    batch = pending.popleft()
+                    self._send(worker, func, key, batch[1])
+                    busy[worker.conn] = (worker, batch)
+
+                for conn in multiprocessing.connection.wait(list(busy.keys())):
+                    worker, (start, batch_items, attempt) = busy.pop(conn)
+                    try:
+                        status, ret = conn.recv()
+                    except (EOFError, OSError):
+                        # the worker crashed, retry the items one by one to isolate the bad one
+                        idle.append(self._restart(worker))
+                        if len(batch_items) > 1:
+                            pending.extend([(start + i, [x], 0) for i, x in enumerate(batch_items)])
+                        else:
+                            yield start, [None]
+                        continue
+
+                    if status == "missing":
+                        # the worker failed to load the task, fork a new one which inherits it
+                        idle.append(self._restart(worker))
+                        if attempt == 0:
+                            pending.appendleft((start, batch_items, attempt + 1))
+                        else:
+                            yield start, [None] * len(batch_items)
+                        continue
+
+                    idle.append(worker)
+                    yield start, ret
+        finally:
+            # drain the outstanding results if the generator is not consumed to the end
+            for conn, (worker, _) in busy.items():
+                try:
+                    conn.recv()
+                except (EOFError, OSError):
+                    self._restart(worker)
+
+    def map(self, func, items, key=None):
+        """Run func on items in the workers, the results keep the order of items.
+        See imap for the arguments."""
+        ret = [None] * len(items)
+        for start, results in self.imap(func, items, key):
+            ret[start : start + len(results)] = results
         return ret
 
-    def __del__(self):
-        self._close_pool()
+    def close(self):
+        """Stop the workers"""
+        if self.pid != os.getpid():
+            return
+        for worker in self.workers:
+            worker.close()
+        self.workers = []
+
+
+_feature_services = {}
+
+
+def get_feature_service(num_workers=None):
+    """Get the shared feature extraction service of this process
+
+    Parameters
+    ----------
+    num_workers: int, optional
+        The number of worker processes. If is None, use the number of cpus.
+
+    Returns
+    -------
+    service: FeatureExtractionService or None
+        None in a process forked from the owner of the services
+    """
+    num_workers = num_workers or multiprocessing.cpu_count()
+    service = _feature_services.get(num_workers)
+    if service is not None and service.pid != os.getpid():
+        return None
+    if service is None:
+        service = _feature_services[num_workers] = FeatureExtractionService(num_workers)
+    return service
+
+
+@atexit.register
+def _close_feature_services():
+    for service in _feature_services.values():
+        service.close()
+    _feature_services.clear()
+
+
+def _extraction_worker_loop(conn, contexts, max_tasks):
+    """serve the extraction requests of FeatureExtractionService"""
+    contexts = OrderedDict(contexts)
+    while True:
+        try:
+            msg = conn.recv()
+        except EOFError:
+            break
+        if msg is None:
+            break
+
+        if msg[0] == "register":
+            _, key, payload = msg
+            try:
+                contexts[key] = pickle.loads(payload)
+            except Exception:  # pylint: disable=broad-except
+                continue
+            while len(contexts) > max_tasks:
+                contexts.popitem(last=False)
+            continue
+
+        _, key, func, items = msg
+        if key is not None:
+            if key not in contexts:
+                conn.send(("missing", None))
+                continue
+            contexts.move_to_end(key)
+            _set_extract_context(*contexts[key])
+        conn.send(("ok", [func(x) for x in items]))
 
 
 _extract_space = None
@@ -349,6 +599,14 @@ _extract_target = None
 _extract_task = None
 
 
+def _set_extract_context(space, target, task):
+    """use global variable to pass common arguments"""
+    global _extract_space, _extract_target, _extract_task
+    _extract_space = space
+    _extract_target = target
+    _extract_task = task
+
+
 def _extract_itervar_feature_index(index):
     """extract iteration var feature for an index in extract_space"""
     try:
@@ -98,9 +98,3 @@ class XGBTuner(ModelBasedTuner):
         super(XGBTuner, self).__init__(
             task, cost_model, optimizer, plan_size, diversity_filter_ratio
         )
-
-    def tune(self, *args, **kwargs):  # pylint: disable=arguments-differ
-        super(XGBTuner, self).tune(*args, **kwargs)
-
-        # manually close pool to avoid multiprocessing issues
-        self.cost_model._close_pool()
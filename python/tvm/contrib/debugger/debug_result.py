@@ -24,6 +24,7 @@ import tvm
 
 GRAPH_DUMP_FILE_NAME = "_tvmdbg_graph_dump.json"
 CHROME_TRACE_FILE_NAME = "_tvmdbg_execution_trace.json"
+PROFILE_SUMMARY_FILE_NAME = "_tvmdbg_profile_summary.json"
 
 ChromeTraceEvent = collections.namedtuple("ChromeTraceEvent", ["ts", "tid", "pid", "name", "ph"])
 
@@ -50,6 +51,7 @@ class DebugResult(object):
         self._dump_path = dump_path
         self._output_tensor_list = []
         self._time_list = []
+        self._profile_samples = collections.deque()
         json_obj = self._parse_graph(graph_json)
         # dump the json information
         self._dump_graph_json(json_obj)
@@ -143,14 +145,22 @@ class DebugResult(object):
         with open(os.path.join(self._dump_path, "output_tensors.params"), "wb") as param_f:
             param_f.write(save_tensors(output_tensors))
 
-    def dump_chrome_trace(self):
-        """Dump the trace to the Chrome trace.json format."""
+    def dump_chrome_trace(self, time_list=None):
+        """Dump the trace to the Chrome trace.json format.
+
+        Parameters
+        ----------
+        time_list : list of list of float, optional
+            The time in seconds of each node, the time of the last debug run by default.
+        """
+        if time_list is None:
+            time_list = self._time_list
 
         def s_to_us(t):
             return t * 10 ** 6
 
-        starting_times = np.zeros(len(self._time_list) + 1)
-        starting_times[1:] = np.cumsum([times[0] for times in self._time_list])
+        starting_times = np.zeros(len(time_list) + 1)
+        starting_times[1:] = np.cumsum([times[0] for times in time_list])
 
         def node_to_events(node, times, starting_time):
             return [
@@ -173,9 +183,7 @@ class DebugResult(object):
 
         events = [
             e
-            for (node, times, starting_time) in zip(
-                self._nodes_list, self._time_list, starting_times
-            )
+            for (node, times, starting_time) in zip(self._nodes_list, time_list, starting_times)
             for e in node_to_events(node, times, starting_time)
         ]
         result = dict(displayTimeUnit="ns", traceEvents=[e._asdict() for e in events])
@@ -183,6 +191,88 @@ class DebugResult(object):
         with open(os.path.join(self._dump_path, CHROME_TRACE_FILE_NAME), "w") as trace_f:
             json.dump(result, trace_f)
 
+    def reset_profile(self, window_size=10000):
+        """Drop the profiled samples.
+
+        Parameters
+        ----------
+        window_size : int
+            The number of the latest samples to keep.
+        """
+        self._profile_samples = collections.deque(maxlen=window_size)
+
+    def add_profile_sample(self, time_list):
+        """Add the time of each node in one sampled run.
+
+        Parameters
+        ----------
+        time_list : list of float
+            The time in microseconds of each node, 0 for the nodes without op.
+        """
+        self._profile_samples.append(np.array(time_list, dtype="float64"))
+
+    def get_profile_summary(self):
+        """Return the statistics of the profiled samples.
+
+        Returns
+        -------
+        summary : dict
+            The number of samples, the mean and the 99th percentile of the total time, and
+            the mean, the 99th percentile and the share of the total mean time of each node
+            and of each fused function summed over the nodes calling it. The times are in
+            microseconds and the nodes and functions are sorted by their mean time.
+        """
+        if not self._profile_samples:
+            raise RuntimeError("No profile sample, run the graph with profiling enabled first.")
+        samples = np.stack(self._profile_samples)
+
+        def stats(times):
+            return {
+                "mean_us": float(np.mean(times)),
+                "p99_us": float(np.percentile(times, 99)),
+            }
+
+        total = samples.sum(axis=1)
+        total_mean = float(np.mean(total))
+
+        def percent(item):
+            item["percent"] = item["mean_us"] / total_mean * 100 if total_mean > 0 else 0.0
+            return item
+
+        nodes = []
+        func_nodes = collections.OrderedDict()
+        for i, node in enumerate(self._nodes_list):
+            if node["op"] == "param":
+                continue
+            nodes.append(percent(dict(name=node["name"], op=node["op"], **stats(samples[:, i]))))
+            func_nodes.setdefault(node["op"], []).append(i)
+        functions = [
+            percent(dict(name=op, count=len(ids), **stats(samples[:, ids].sum(axis=1))))
+            for op, ids in func_nodes.items()
+        ]
+        return {
+            "num_samples": len(samples),
+            "total": stats(total),
+            "nodes": sorted(nodes, key=lambda x: x["mean_us"], reverse=True),
+            "functions": sorted(functions, key=lambda x: x["mean_us"], reverse=True),
+        }
+
+    def dump_profile(self):
+        """Dump the summary of the profiled samples to json, and the mean time
+        of each node to the Chrome trace.json format.
+
+        Returns
+        -------
+        summary : dict
+            The summary returned by :any:`get_profile_summary`.
+        """
+        summary = self.get_profile_summary()
+        mean_times = np.mean(np.stack(self._profile_samples), axis=0) * 1e-6
+        self.dump_chrome_trace([[t] for t in mean_times])
+        with open(os.path.join(self._dump_path, PROFILE_SUMMARY_FILE_NAME), "w") as summary_f:
+            json.dump(summary, summary_f, indent=4)
+        return summary
+
     def _dump_graph_json(self, graph):
         """Dump json formatted graph.
 
@@ -100,6 +100,9 @@ class GraphModuleDebug(graph_runtime.GraphModule):
         self._dump_path = None
         self._get_output_by_layer = module["get_output_by_layer"]
         self._run_individual = module["run_individual"]
+        self._run_profile = module["run_profile"]
+        self._sample_rate = 0
+        self._sample_credit = 0
         graph_runtime.GraphModule.__init__(self, module)
         self._create_debug_env(graph_json_str, ctx)
 
@@ -213,6 +216,9 @@ class GraphModuleDebug(graph_runtime.GraphModule):
     def run(self, **input_dict):
         """Run forward execution of the graph with debug
 
+        When profiling is enabled, the graph is run as usual and only the
+        time of each node in the sampled runs is recorded.
+
         Parameters
         ----------
         input_dict : dict of str to NDArray
@@ -221,6 +227,10 @@ class GraphModuleDebug(graph_runtime.GraphModule):
         if input_dict:
             self.set_input(**input_dict)
 
+        if self._sample_rate > 0:
+            self._run_sampled()
+            return
+
         # Step 1. Execute the graph
         self._run_debug()
         # Step 2. Dump the output tensors to the dump folder
@@ -230,6 +240,58 @@ class GraphModuleDebug(graph_runtime.GraphModule):
         # Step 4. Display the collected information
         self.debug_datum.display_debug_result()
 
+    def enable_profiling(self, sample_rate=0.01, window_size=10000):
+        """Profile the following runs instead of debugging them.
+
+        The tensors are not dumped and the runs which are not sampled execute the
+        graph as usual. The sampled runs time each node, which synchronizes the
+        device after every op.
+
+        Parameters
+        ----------
+        sample_rate : float
+            The fraction of the runs to time, evenly spread over the runs.
+
+        window_size : int
+            The number of the latest samples to aggregate.
+        """
+        if not 0 < sample_rate <= 1:
+            raise ValueError("sample_rate should be in (0, 1], got %s" % sample_rate)
+        self._sample_rate = sample_rate
+        # time the first run
+        self._sample_credit = 1 - sample_rate
+        self.debug_datum.reset_profile(window_size)
+
+    def disable_profiling(self):
+        """Debug the following runs again, the profiled samples are kept."""
+        self._sample_rate = 0
+
+    def _run_sampled(self):
+        """Run the graph, and time each node if the run is sampled"""
+        self._sample_credit += self._sample_rate
+        if self._sample_credit < 1:
+            self._run()
+            return
+        self._sample_credit -= 1
+        ret = self._run_profile()
+        self.debug_datum.add_profile_sample([float(t) for t in ret.strip(",").split(",")])
+
+    def profile_summary(self):
+        """Return the statistics of the profiled runs, see
+        :any:`DebugResult.get_profile_summary`."""
+        return self.debug_datum.get_profile_summary()
+
+    def dump_profile(self):
+        """Dump the statistics of the profiled runs to json and the mean time of
+        each node to the Chrome trace in the dump folder.
+
+        Returns
+        -------
+        summary : dict
+            The statistics of the profiled runs.
+        """
+        return self.debug_datum.dump_profile()
+
     def run_individual(self, number, repeat=1, min_repeat_ms=0):
         ret = self._run_individual(number, repeat, min_repeat_ms)
         return ret.strip(",").split(",") if ret else []
@@ -15,6 +15,12 @@
 # specific language governing permissions and limitations
 # under the License.
 """Minimum graph runtime that executes graph containing TVM PackedFunc."""
+import collections
+import queue
+import threading
+import time
+from concurrent.futures import Future
+
 import numpy as np
 import tvm._ffi
 
@@ -282,6 +288,26 @@ class GraphModule(object):
         """
         self._load_params(bytearray(params_bytes))
 
+    def load_params_mmap(self, path):
+        """Load parameters from a memory-mappable parameter file.
+
+        Unlike load_params, the file is not read into memory first. Each parameter
+        is copied from the pages of the mapped file to the context of the module.
+
+        Parameters
+        ----------
+        path : str
+            The path of the file saved by :py:func:`tvm.relay.save_param_mmap`.
+        """
+        # pylint: disable=import-outside-toplevel
+        from tvm.relay.param_dict import load_param_mmap
+
+        params = load_param_mmap(path)
+        for name, value in params.items():
+            val = self._get_input(name)
+            if val:
+                val.copyfrom(value)
+
     def share_params(self, other, params_bytes):
         """Share parameters from pre-existing GraphRuntime instance.
 
@@ -304,3 +330,255 @@ class GraphModule(object):
             The key to the module.
         """
         return self.module[key]
+
+
+class _PoolRequest(object):
+    """A request to a GraphModulePool"""
+
+    def __init__(self, inputs, num_rows):
+        self.inputs = inputs
+        self.num_rows = num_rows
+        self.future = Future()
+        self.submit_time = time.time()
+
+
+class GraphModulePool(object):
+    """A pool of graph runtime instances sharing one set of parameters,
+    which runs the requests submitted from several threads concurrently.
+
+    Each instance is driven by its own worker thread. With max_batch_size larger
+    than 1, the module should be compiled with a batch of max_batch_size along the
+    first axis of all inputs and outputs. A worker then coalesces the requests in the
+    queue along that axis, waiting up to max_latency_ms for more requests to fill a batch.
+
+    Parameters
+    ----------
+    graph_json_str : str
+        The graph to be deployed in json format output by json graph.
+
+    libmod : tvm.runtime.Module
+        The module of the corresponding function.
+
+    ctx : TVMContext
+        The context to deploy the module.
+
+    params : dict of str to NDArray, or bytearray
+        The parameters, or the parameters serialized by save_param_dict.
+
+    num_instances : int = 2
+        The number of graph runtime instances.
+
+    max_batch_size : int = 1
+        The batch size the module is compiled with.
+
+    max_latency_ms : float = 0
+        The time to wait for more requests to fill a batch.
+
+    window_size : int = 10000
+        The number of the latest requests to compute the latency percentiles on.
+
+    Examples
+    --------
+
+    .. code-block:: python
+
+        graph, lib, params = relay.build(mod, target, params=params)
+        pool = graph_runtime.GraphModulePool(graph, lib, ctx, params, num_instances=4)
+        # from any thread
+        outputs = pool.run(data=data)
+        print(pool.latency_percentiles())
+        pool.close()
+    """
+
+    def __init__(
+        self,
+        graph_json_str,
+        libmod,
+        ctx,
+        params,
+        num_instances=2,
+        max_batch_size=1,
+        max_latency_ms=0,
+        window_size=10000,
+    ):
+        if isinstance(params, dict):
+            # pylint: disable=import-outside-toplevel
+            from tvm.relay import save_param_dict
+
+            params = save_param_dict(params)
+        params_bytes = bytearray(params)
+
+        self.max_batch_size = max_batch_size
+        self.max_latency_ms = max_latency_ms
+        self.modules = []
+        for i in range(num_instances):
+            module = create(graph_json_str, libmod, ctx)
+            if i == 0:
+                module.load_params(params_bytes)
+            else:
+                module.share_params(self.modules[0], params_bytes)
+            self.modules.append(module)
+
+        self._queue = queue.Queue()
+        self._lock = threading.Lock()
+        self._queue_latency = collections.deque(maxlen=window_size)
+        self._exec_latency = collections.deque(maxlen=window_size)
+        self._batch_sizes = collections.deque(maxlen=window_size)
+        self._closed = False
+        self._threads = []
+        for module in self.modules:
+            thread = threading.Thread(target=self._worker, args=(module,))
+            thread.daemon = True
+            thread.start()
+            self._threads.append(thread)
+
+    def submit(self, **inputs):
+        """Submit a request.
+
+        Parameters
+        ----------
+        inputs : dict of str to NDArray or numpy.ndarray
+            The inputs of the request. With batching, the first axis of each input
+            is the number of rows of the request, which can be at most max_batch_size.
+
+        Returns
+        -------
+        future : concurrent.futures.Future
+            The future of the list of outputs as numpy arrays.
+        """
+        if self._closed:
+            raise RuntimeError("Cannot submit to a closed GraphModulePool")
+        num_rows = 1
+        if self.max_batch_size > 1:
+            inputs = {
+                k: v.asnumpy() if hasattr(v, "asnumpy") else np.asarray(v)
+                for k, v in inputs.items()
+            }
+            num_rows = next(iter(inputs.values())).shape[0]
+            if num_rows > self.max_batch_size:
+                raise ValueError(
+                    "The request has %d rows, more than max_batch_size=%d"
+                    % (num_rows, self.max_batch_size)
+                )
+        request = _PoolRequest(inputs, num_rows)
+        self._queue.put(request)
+        return request.future
+
+    def run(self, **inputs):
+        """Run a request and wait for its outputs.
+
+        Parameters
+        ----------
+        inputs : dict of str to NDArray or numpy.ndarray
+            The inputs of the request.
+
+        Returns
+        -------
+        outputs : List[numpy.ndarray]
+            The outputs of the request.
+        """
+        return self.submit(**inputs).result()
+
+    def latency_percentiles(self, percentiles=(50, 90, 99)):
+        """Get the percentiles of the latency of the latest requests.
+
+        Parameters
+        ----------
+        percentiles : Tuple[float]
+            The percentiles to compute.
+
+        Returns
+        -------
+        ret : dict
+            The percentiles of the time in the queue as "queue_ms" and of the execution
+            of the batch as "exec_ms", as dicts from percentile to milliseconds,
+            and the mean batch size as "batch_size".
+        """
+        with self._lock:
+            queue_latency = list(self._queue_latency)
+            exec_latency = list(self._exec_latency)
+            batch_sizes = list(self._batch_sizes)
+        ret = {"batch_size": float(np.mean(batch_sizes)) if batch_sizes else 0.0}
+        for name, values in [("queue_ms", queue_latency), ("exec_ms", exec_latency)]:
+            ret[name] = {
+                p: float(np.percentile(values, p)) * 1000 if values else 0.0 for p in percentiles
+            }
+        return ret
+
+    def close(self):
+        """Stop the workers after the submitted requests are done"""
+        if self._closed:
+            return
+        self._closed = True
+        for _ in self._threads:
+            self._queue.put(None)
+        for thread in self._threads:
+            thread.join()
+
+    def _next_batch(self, carry):
+        """Get the next batch of requests from the queue.
+        Return the batch, the request carried to the next batch and whether to stop."""
+        first = carry if carry is not None else self._queue.get()
+        if first is None:
+            return [], None, True
+        batch, num_rows = [first], first.num_rows
+        deadline = time.time() + self.max_latency_ms / 1000
+        while num_rows < self.max_batch_size:
+            try:
+                request = self._queue.get(timeout=max(deadline - time.time(), 1e-6))
+            except queue.Empty:
+                break
+            if request is None:
+                # leave the stop signal for the next round
+                self._queue.put(None)
+                break
+            if num_rows + request.num_rows > self.max_batch_size:
+                return batch, request, False
+            batch.append(request)
+            num_rows += request.num_rows
+        return batch, None, False
+
+    def _execute(self, module, batch):
+        """Run a batch of requests on a module"""
+        if self.max_batch_size == 1:
+            module.set_input(**batch[0].inputs)
+        else:
+            num_rows = sum(r.num_rows for r in batch)
+            for name in batch[0].inputs:
+                data = np.concatenate([r.inputs[name] for r in batch])
+                if num_rows < self.max_batch_size:
+                    pad = np.zeros((self.max_batch_size - num_rows,) + data.shape[1:], data.dtype)
+                    data = np.concatenate([data, pad])
+                module.set_input(name, data)
+        module.run()
+        outputs = [module.get_output(i).asnumpy() for i in range(module.get_num_outputs())]
+        if self.max_batch_size == 1:
+            return [outputs]
+        results, begin = [], 0
+        for request in batch:
+            end = begin + request.num_rows
+            results.append([out[begin:end] for out in outputs])
+            begin = end
+        return results
+
+    def _worker(self, module):
+        carry = None
+        while True:
+            batch, carry, stop = self._next_batch(carry)
+            if stop:
+                break
+            start = time.time()
+            try:
+                results = self._execute(module, batch)
+            except Exception as err:  # pylint: disable=broad-except
+                for request in batch:
+                    request.future.set_exception(err)
+                continue
+            end = time.time()
+            with self._lock:
+                for request in batch:
+                    self._queue_latency.append(start - request.submit_time)
+                    self._exec_latency.append(end - start)
+                self._batch_sizes.append(sum(r.num_rows for r in batch))
+            for request, result in zip(batch, results):
+                request.future.set_result(result)
@@ -19,5 +19,6 @@ TVMC - TVM driver command-line interface
 """
 
 from . import autotuner
+from . import benchmark
 from . import compiler
 from . import runner
@@ -0,0 +1,270 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""
+Provides support to benchmark compiled networks under concurrent load.
+"""
+import json
+import logging
+import os
+import tarfile
+import tempfile
+import threading
+import time
+
+import numpy as np
+import tvm
+from tvm.contrib import graph_runtime as runtime
+from tvm.relay import param_dict
+
+from .common import TVMCException
+from .main import register_parser
+from .runner import get_input_info, make_inputs_dict
+
+
+# pylint: disable=invalid-name
+logger = logging.getLogger("TVMC")
+
+
+@register_parser
+def add_benchmark_parser(subparsers):
+    """ Include parser for 'benchmark' subcommand """
+
+    parser = subparsers.add_parser(
+        "benchmark", help="measure the throughput and latency of a compiled module under load"
+    )
+    parser.set_defaults(func=drive_benchmark)
+
+    parser.add_argument(
+        "--device",
+        choices=["cpu", "gpu"],
+        default="cpu",
+        help="target device to run the compiled module. Defaults to 'cpu'",
+    )
+    parser.add_argument(
+        "--fill-mode",
+        choices=["zeros", "ones", "random"],
+        default="random",
+        help="fill all input tensors with values. In case --inputs/-i is provided, "
+        "they will take precedence over --fill-mode. Any remaining inputs will be "
+        "filled using the chosen fill mode. Defaults to 'random'",
+    )
+    parser.add_argument("-i", "--inputs", help="path to the .npz input file")
+    parser.add_argument(
+        "--clients",
+        metavar="K",
+        type=int,
+        default=1,
+        help="number of concurrent clients, each running its own executor. Defaults to '1'",
+    )
+    parser.add_argument(
+        "--warmup",
+        metavar="N",
+        type=int,
+        default=10,
+        help="number of runs of each client before measuring. Defaults to '10'",
+    )
+    parser.add_argument(
+        "--duration",
+        metavar="SECONDS",
+        type=float,
+        default=10,
+        help="how long to measure, unless --requests is given. Defaults to '10'",
+    )
+    parser.add_argument(
+        "--requests",
+        metavar="N",
+        type=int,
+        help="total number of requests to measure, instead of a fixed duration",
+    )
+    parser.add_argument("-o", "--output", help="path to the .json file to save the report")
+    parser.add_argument("FILE", help="path to the compiled module file")
+
+
+def drive_benchmark(args):
+    """Invoke benchmark module with command line arguments
+
+    Parameters
+    ----------
+    args: argparse.Namespace
+        Arguments from command line parser.
+    """
+
+    report = benchmark_module(
+        args.FILE,
+        inputs_file=args.inputs,
+        device=args.device,
+        fill_mode=args.fill_mode,
+        num_clients=args.clients,
+        warmup=args.warmup,
+        duration=args.duration,
+        num_requests=args.requests,
+    )
+
+    report_json = json.dumps(report, indent=2)
+    # print here is intentional
+    print(report_json)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(report_json)
+
+
+def benchmark_module(
+    module_file,
+    inputs_file=None,
+    device="cpu",
+    fill_mode="random",
+    num_clients=1,
+    warmup=10,
+    duration=10,
+    num_requests=None,
+):
+    """Benchmark a compiled graph runtime module locally with concurrent clients.
+
+    The module is loaded once. Each client runs its own executor, sharing the
+    parameters with the others, in a closed loop of requests.
+
+    Parameters
+    ----------
+    module_file : str
+        The path to the module file (a .tar file).
+    inputs_file : str, optional
+        Path to an .npz file containing the inputs.
+    device: str, optional
+        The device (e.g. "cpu" or "gpu") to run on.
+    fill_mode : str, optional
+        The fill-mode to use when generating data for input tensors.
+        Valid options are "zeros", "ones" and "random".
+        Defaults to "random".
+    num_clients : int, optional
+        The number of concurrent clients.
+    warmup : int, optional
+        The number of runs of each client before measuring.
+    duration : float, optional
+        How long to measure in seconds, if num_requests is not given.
+    num_requests : int, optional
+        The total number of requests to measure.
+
+    Returns
+    -------
+    report : dict
+        The number of clients and requests, the duration in seconds, the throughput in
+        requests per second and the mean and percentiles of the latency in milliseconds.
+    """
+    if num_clients < 1:
+        raise TVMCException("The number of clients should be at least 1")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        logger.debug("extracting module file %s", module_file)
+        t = tarfile.open(module_file)
+        t.extractall(tmp_dir)
+        graph = open(os.path.join(tmp_dir, "mod.json")).read()
+        params_file = os.path.join(tmp_dir, "mod.params")
+        if param_dict.is_param_mmap(params_file):
+            params = param_dict.load_param_mmap(params_file)
+            params_bytes = param_dict.save_param_dict(params)
+        else:
+            params = params_bytes = bytearray(open(params_file, "rb").read())
+
+        lib = tvm.runtime.load_module(os.path.join(tmp_dir, "mod.so"))
+        logger.debug("device is %s", device)
+        ctx = tvm.cpu() if device == "cpu" else tvm.gpu()
+
+        shape_dict, dtype_dict = get_input_info(graph, params)
+        inputs_dict = make_inputs_dict(inputs_file, shape_dict, dtype_dict, fill_mode)
+
+        logger.debug("creating %d executors sharing the params", num_clients)
+        modules = []
+        for i in range(num_clients):
+            module = runtime.create(graph, lib, ctx)
+            if i == 0:
+                module.load_params(params_bytes)
+            else:
+                module.share_params(modules[0], params_bytes)
+            module.set_input(**inputs_dict)
+            modules.append(module)
+
+        latencies = [[] for _ in modules]
+        lock = threading.Lock()
+        remaining = [num_requests]
+        deadline = [None]
+
+        def start_measuring():
+            deadline[0] = time.time() + duration
+
+        # start measuring once all the clients are warmed up
+        barrier = threading.Barrier(num_clients + 1, action=start_measuring)
+
+        def next_request():
+            if num_requests is None:
+                return time.time() < deadline[0]
+            with lock:
+                remaining[0] -= 1
+                return remaining[0] >= 0
+
+        errors = []
+
+        def client(module, client_latencies):
+            try:
+                for _ in range(warmup):
+                    module.run()
+                ctx.sync()
+                barrier.wait()
+                while next_request():
+                    tic = time.time()
+                    module.run()
+                    ctx.sync()
+                    client_latencies.append(time.time() - tic)
+            except threading.BrokenBarrierError:
+                # another client failed before measuring
+                pass
+            except Exception as err:  # pylint: disable=broad-except
+                errors.append(err)
+                # do not leave the other clients and the caller waiting
+                barrier.abort()
+
+        threads = [
+            threading.Thread(target=client, args=(module, client_latencies))
+            for module, client_latencies in zip(modules, latencies)
+        ]
+        for thread in threads:
+            thread.start()
+        try:
+            barrier.wait()
+        except threading.BrokenBarrierError:
+            pass
+        start = time.time()
+        for thread in threads:
+            thread.join()
+        elapsed = time.time() - start
+        if errors:
+            raise errors[0]
+
+    all_latencies = np.array([x for client_latencies in latencies for x in client_latencies])
+    if len(all_latencies) == 0:
+        raise TVMCException("No request was measured, try a longer duration")
+
+    percentiles = [50, 90, 99, 99.9]
+    values = np.percentile(all_latencies, percentiles) * 1000
+    latency = {"mean": float(np.mean(all_latencies)) * 1000}
+    latency.update({"p%s" % p: float(v) for p, v in zip(percentiles, values)})
+    return {
+        "clients": num_clients,
+        "requests": len(all_latencies),
+        "duration_s": elapsed,
+        "throughput_rps": len(all_latencies) / elapsed,
+        "latency_ms": latency,
+    }
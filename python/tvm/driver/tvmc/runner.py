@@ -29,6 +29,7 @@ from tvm import rpc
 from tvm.autotvm.measure import request_remote
 from tvm.contrib import graph_runtime as runtime
 from tvm.contrib.debugger import debug_runtime
+from tvm.relay import param_dict
 
 from . import common
 from .common import TVMCException
@@ -152,8 +153,8 @@ def get_input_info(graph_str, params):
     ----------
     graph_str : str
         JSON graph of the module serialized as a string.
-    params : bytearray
-        Params serialized as a bytearray.
+    params : bytearray or dict
+        Params serialized as a bytearray, or a dict with the param names as keys.
 
     Returns
     -------
@@ -165,9 +166,12 @@ def get_input_info(graph_str, params):
 
     shape_dict = {}
     dtype_dict = {}
-    # Use a special function to load the binary params back into a dict
-    load_arr = tvm.get_global_func("tvm.relay._load_param_dict")(params)
-    param_names = [v.name for v in load_arr]
+    if isinstance(params, dict):
+        param_names = list(params)
+    else:
+        # Use a special function to load the binary params back into a dict
+        load_arr = tvm.get_global_func("tvm.relay._load_param_dict")(params)
+        param_names = [v.name for v in load_arr]
     graph = json.loads(graph_str)
     for node_id in graph["arg_nodes"]:
         node = graph["nodes"][node_id]
@@ -343,7 +347,11 @@ def run_module(
         t = tarfile.open(module_file)
         t.extractall(tmp_dir)
         graph = open(os.path.join(tmp_dir, "mod.json")).read()
-        params = bytearray(open(os.path.join(tmp_dir, "mod.params"), "rb").read())
+        params_file = os.path.join(tmp_dir, "mod.params")
+        if param_dict.is_param_mmap(params_file):
+            params = param_dict.load_param_mmap(params_file)
+        else:
+            params = bytearray(open(params_file, "rb").read())
 
         if hostname:
             # Remote RPC
@@ -373,7 +381,10 @@ def run_module(
             module = runtime.create(graph, lib, ctx)
 
         logger.debug("load params into the runtime module")
-        module.load_params(params)
+        if isinstance(params, dict):
+            module.load_params_mmap(params_file)
+        else:
+            module.load_params(params)
 
         shape_dict, dtype_dict = get_input_info(graph, params)
         inputs_dict = make_inputs_dict(inputs_file, shape_dict, dtype_dict, fill_mode)
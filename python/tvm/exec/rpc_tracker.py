@@ -20,14 +20,26 @@ from __future__ import absolute_import
 
 import logging
 import argparse
+import functools
 import multiprocessing
 import sys
-from ..rpc.tracker import Tracker
+from ..rpc.tracker import Tracker, FairShareScheduler
 
 
 def main(args):
     """Main funciton"""
-    tracker = Tracker(args.host, port=args.port, port_end=args.port_end, silent=args.silent)
+    scheduler = None
+    if args.scheduler == "fair-share":
+        quotas = {}
+        for quota in args.quota:
+            user, num = quota.rsplit("=", 1)
+            quotas[user] = int(num)
+        scheduler = functools.partial(
+            FairShareScheduler, quotas=quotas, default_quota=args.default_quota
+        )
+    tracker = Tracker(
+        args.host, port=args.port, port_end=args.port_end, silent=args.silent, scheduler=scheduler
+    )
     tracker.proc.join()
 
 
@@ -45,6 +57,24 @@ if __name__ == "__main__":
                          and ROCM compilers.",
     )
     parser.add_argument("--silent", action="store_true", help="Whether run in silent mode.")
+    parser.add_argument(
+        "--scheduler",
+        choices=["priority", "fair-share"],
+        default="priority",
+        help="How to share the devices of a key among the requests.",
+    )
+    parser.add_argument(
+        "--quota",
+        action="append",
+        default=[],
+        help="The maximum number of sessions in use of a user with the fair-share "
+        "scheduler, in the form user=num.",
+    )
+    parser.add_argument(
+        "--default-quota",
+        type=int,
+        help="The maximum number of sessions in use of the other users.",
+    )
 
     parser.set_defaults(fork=True)
     args = parser.parse_args()
@@ -137,3 +137,6 @@ ScopeBuilder = scope_builder.ScopeBuilder
 # Param Serialization
 save_param_dict = param_dict.save_param_dict
 load_param_dict = param_dict.load_param_dict
+save_param_mmap = param_dict.save_param_mmap
+load_param_mmap = param_dict.load_param_mmap
+convert_param_dict = param_dict.convert_param_dict
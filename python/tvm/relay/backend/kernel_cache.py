@@ -0,0 +1,238 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Persistent on-disk cache of the kernels compiled by relay.build.
+
+Every primitive function lowered by the graph runtime codegen is looked up by
+a key made of its structural hash, the target, the autotvm configs that the
+current dispatch context can apply, the current PassContext and the TVM
+version. A hit loads the compiled kernel from disk, a miss compiles the kernel
+on its own and stores it. Either way the kernel is
+linked into the module returned by relay.build instead of being lowered and
+compiled together with the other functions.
+
+.. code-block:: python
+
+    with relay.backend.kernel_cache.KernelCache("~/.tvm/kernel_cache"):
+        lib = relay.build(mod, target="llvm", params=params)
+"""
+import hashlib
+import logging
+import os
+import weakref
+
+import tvm._ffi
+import tvm.driver
+from tvm import autotvm
+from tvm.ir import IRModule, structural_hash
+from . import compile_engine
+
+logger = logging.getLogger("compile_engine")
+
+
+class KernelCache(object):
+    """A size-bounded on-disk cache of compiled kernels.
+
+    Only kernels of llvm targets are cached, others are lowered and compiled
+    by relay.build as usual. The least recently used kernels are evicted once
+    the cache grows over max_bytes.
+
+    Parameters
+    ----------
+    cache_dir : str
+        The directory to store the kernels, which can be shared by processes.
+    max_bytes : int = 1 << 30
+        The maximum total size of the kernels in the cache.
+    """
+
+    current = None
+
+    def __init__(self, cache_dir, max_bytes=1 << 30):
+        self.cache_dir = os.path.expanduser(cache_dir)
+        self.max_bytes = max_bytes
+        self.stats = {"hit": 0, "miss": 0, "evict": 0}
+        # key -> name of the kernel, as stored in the file "<key>.<name>.ll"
+        self.entries = {}
+        # name -> kernel module to link into the module of the current build
+        self.pending = {}
+        self._old_cache = None
+        self._digests = weakref.WeakKeyDictionary()
+
+        os.makedirs(self.cache_dir, exist_ok=True)
+        for filename in os.listdir(self.cache_dir):
+            fields = filename.split(".")
+            # skip the files of other processes being written
+            if len(fields) == 3 and fields[2] == "ll":
+                self.entries[fields[0]] = fields[1]
+
+    def __enter__(self):
+        self._old_cache = KernelCache.current
+        self.pending = {}
+        KernelCache.current = self
+        return self
+
+    def __exit__(self, ptype, value, trace):
+        KernelCache.current = self._old_cache
+
+    def _path(self, key):
+        return os.path.join(self.cache_dir, "%s.%s.ll" % (key, self.entries[key]))
+
+    def _config_digest(self, ctx):
+        """Digest of the autotvm configs a dispatch context and its parents can apply.
+        Return None if the applied configs do not only depend on the workload."""
+        if ctx in self._digests:
+            return self._digests[ctx]
+        hasher = hashlib.sha256()
+        it = ctx
+        while it is not None:
+            hasher.update(type(it).__name__.encode())
+            if isinstance(it, autotvm.task.ApplyHistoryBest):
+                for best in [it.best_by_targetkey, it.best_by_model]:
+                    for key in sorted(best, key=str):
+                        hasher.update(("%s %s" % (key, best[key][0].config)).encode())
+            elif isinstance(it, autotvm.task.ApplyConfig):
+                hasher.update(str(it._config).encode())
+            elif not isinstance(it, autotvm.task.FallbackContext):
+                # e.g. ApplyGraphBest, which applies configs by the order of the queries
+                hasher = None
+                break
+            it = it._old_ctx
+        digest = hasher.hexdigest() if hasher is not None else None
+        self._digests[ctx] = digest
+        return digest
+
+    def get_key(self, source_func, target):
+        """Get the key of a primitive function, which also covers the autotvm configs,
+        the opt_level, config, required and disabled passes of the current PassContext,
+        and the TVM version.
+
+        Parameters
+        ----------
+        source_func : tvm.relay.Function
+            The primitive function.
+        target : tvm.target.Target
+            The target to compile the function for.
+
+        Returns
+        -------
+        key : Optional[str]
+            The key, or None if the kernel can not be cached.
+        """
+        if target.kind.name != "llvm":
+            return None
+        digest = self._config_digest(autotvm.DispatchContext.current)
+        if digest is None:
+            return None
+        pass_ctx = tvm.transform.PassContext.current()
+        hasher = hashlib.sha256()
+        hasher.update(tvm.__version__.encode())
+        hasher.update(str(structural_hash(source_func)).encode())
+        hasher.update(str(target).encode())
+        hasher.update(digest.encode())
+        hasher.update(str(int(pass_ctx.opt_level)).encode())
+        for key in sorted(pass_ctx.config, key=str):
+            hasher.update(("%s=%s" % (key, pass_ctx.config[key])).encode())
+        hasher.update(("required %s" % sorted(str(x) for x in pass_ctx.required_pass)).encode())
+        hasher.update(("disabled %s" % sorted(str(x) for x in pass_ctx.disabled_pass)).encode())
+        return hasher.hexdigest()
+
+    def lower(self, source_func, target):
+        """Get the kernel of a primitive function from the cache, or compile and store it.
+        The kernel is linked by :any:`link`.
+
+        Parameters
+        ----------
+        source_func : tvm.relay.Function
+            The primitive function.
+        target : tvm.target.Target
+            The target to compile the function for.
+
+        Returns
+        -------
+        func_name : str
+            The name of the kernel, or an empty string if the kernel can not be cached.
+        """
+        key = self.get_key(source_func, target)
+        if key is None:
+            return ""
+
+        if key in self.entries and os.path.isfile(self._path(key)):
+            name = self.entries[key]
+            if name not in self.pending:
+                self.pending[name] = tvm.runtime.load_module(self._path(key))
+            os.utime(self._path(key))
+            self.stats["hit"] += 1
+            return name
+
+        self.stats["miss"] += 1
+        cfunc = compile_engine.get().lower(source_func, target)
+        # suffix the key to avoid clashing with the names given in other processes
+        name = "%s_%s" % (cfunc.func_name, key[:16])
+        prim_func = cfunc.funcs[cfunc.func_name].with_attr("global_symbol", name)
+        kernel = tvm.driver.build(IRModule({name: prim_func}), target=target)
+        self.pending[name] = kernel
+
+        self.entries[key] = name
+        tmp_path = os.path.join(self.cache_dir, "%s.%s.%d.tmp.ll" % (key, name, os.getpid()))
+        kernel.save(tmp_path)
+        os.replace(tmp_path, self._path(key))
+        self._evict()
+        return name
+
+    def link(self, mod):
+        """Link the kernels used by the current build into its module.
+
+        Parameters
+        ----------
+        mod : tvm.runtime.Module
+            The module built by relay.build.
+        """
+        for kernel in self.pending.values():
+            mod.import_module(kernel)
+        self.pending = {}
+
+    def _evict(self):
+        """Remove the least recently used kernels until the cache fits into max_bytes"""
+        files = []
+        for key in list(self.entries):
+            try:
+                stat = os.stat(self._path(key))
+            except OSError:
+                # removed by another process
+                del self.entries[key]
+                continue
+            files.append((stat.st_mtime, stat.st_size, key))
+
+        total = sum(size for _, size, _ in files)
+        for _, size, key in sorted(files):
+            if total <= self.max_bytes:
+                break
+            try:
+                os.remove(self._path(key))
+            except OSError:
+                pass
+            del self.entries[key]
+            total -= size
+            self.stats["evict"] += 1
+            logger.debug("Evict kernel %s from the kernel cache", key)
+
+
+@tvm._ffi.register_func("relay.backend.kernel_cache.lower")
+def _lower(source_func, target):
+    """Called by the graph runtime codegen for every primitive function"""
+    if KernelCache.current is None:
+        return ""
+    return KernelCache.current.lower(source_func, target)
@@ -34,6 +34,7 @@ from . import function as _function
 from .transform import InferType
 from .backend import graph_runtime_factory as _graph_runtime_factory
 from .backend import interpreter as _interpreter
+from .backend import kernel_cache as _kernel_cache
 from .backend.vm import VMExecutor
 
 
@@ -258,6 +259,8 @@ def build(mod, target=None, target_host=None, params=None, mod_name="default"):
     with tophub_context:
         bld_mod = BuildModule()
         graph_json, mod, params = bld_mod.build(mod, target, target_host, params)
+        if _kernel_cache.KernelCache.current is not None:
+            _kernel_cache.KernelCache.current.link(mod)
         mod = _graph_runtime_factory.GraphRuntimeFactoryModule(graph_json, mod, mod_name, params)
         return mod
 
@@ -17,6 +17,9 @@
 # pylint: disable=invalid-name, import-self, len-as-condition, unused-argument, too-many-lines
 # pylint: disable=import-outside-toplevel
 """ONNX: Open Neural Network Exchange frontend for Relay."""
+import mmap
+import os
+
 import numpy as np
 import tvm
 from tvm.ir import IRModule
@@ -2143,9 +2146,12 @@ class GraphProto:
 
     dtype : str or dict of str to str
         The input types to the graph
+
+    external_data_dir : str, optional
+        The directory of the external data files of the tensors
     """
 
-    def __init__(self, shape, dtype):
+    def __init__(self, shape, dtype, external_data_dir=None):
         self._nodes = {}
         self._params = {}
         self._inputs = {}
@@ -2154,6 +2160,9 @@ class GraphProto:
         self._num_param = 0
         self._shape = shape if shape else {}
         self._dtype = dtype
+        self._external_data_dir = external_data_dir
+        # path -> mapped external data file
+        self._mapped_files = {}
 
     def freeze(self, func, params):
         bind_map = {}
@@ -2320,9 +2329,31 @@ class GraphProto:
             return dtype
 
     def _parse_array(self, tensor_proto):
-        np_array = get_numpy(tensor_proto).reshape(tuple(tensor_proto.dims))
+        from onnx import TensorProto
+
+        if tensor_proto.data_location == TensorProto.EXTERNAL:
+            # view the data in the mapped file to only copy it once
+            np_array = self._map_external_data(tensor_proto)
+        else:
+            np_array = get_numpy(tensor_proto).reshape(tuple(tensor_proto.dims))
         return _nd.array(np_array)
 
+    def _map_external_data(self, tensor_proto):
+        """View the external data of a tensor in the mapped data file."""
+        from onnx.mapping import TENSOR_TYPE_TO_NP_TYPE
+
+        info = {entry.key: entry.value for entry in tensor_proto.external_data}
+        path = os.path.join(self._external_data_dir or "", info["location"])
+        if path not in self._mapped_files:
+            with open(path, "rb") as f:
+                self._mapped_files[path] = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        dtype = TENSOR_TYPE_TO_NP_TYPE[tensor_proto.data_type]
+        count = int(np.prod(tensor_proto.dims))
+        np_array = np.frombuffer(
+            self._mapped_files[path], dtype=dtype, count=count, offset=int(info.get("offset", 0))
+        )
+        return np_array.reshape(tuple(tensor_proto.dims))
+
     def _parse_attr(self, attr_proto):
         """Convert a list of AttributeProto to a dict, with names as keys."""
         attrs = {}
@@ -2393,7 +2424,9 @@ class GraphProto:
         return outputs
 
 
-def from_onnx(model, shape=None, dtype="float32", opset=None, freeze_params=False):
+def from_onnx(
+    model, shape=None, dtype="float32", opset=None, freeze_params=False, external_data_dir=None
+):
     """Convert a ONNX model into an equivalent Relay Function.
 
     ONNX graphs are represented as Python Protobuf objects.
@@ -2432,6 +2465,12 @@ def from_onnx(model, shape=None, dtype="float32", opset=None, freeze_params=Fals
         at compile time and helps in making models static if certain inputs represent
         attributes relay would traditionally consider compile-time constants.
 
+    external_data_dir: str, optional
+        The directory of the external data files, for a model loaded with
+        ``onnx.load(path, load_external_data=False)``. The external data is mapped
+        instead of being loaded into the model, and copied once into the params.
+        Defaults to the current directory.
+
     Returns
     -------
     mod : tvm.IRModule
@@ -2454,7 +2493,7 @@ def from_onnx(model, shape=None, dtype="float32", opset=None, freeze_params=Fals
                 warnings.warn(str(e))
     except ImportError:
         pass
-    g = GraphProto(shape, dtype)
+    g = GraphProto(shape, dtype, external_data_dir)
     graph = model.graph
     if opset is None:
         try:
@@ -2684,8 +2684,19 @@ def _run_jit_passes(graph):
     torch._C._jit_pass_inline(graph)
 
 
-def _get_tensor_and_var(torch_tensor, name):
-    tensor = tvm.nd.array(torch_tensor.cpu().numpy())
+def _get_tensor_and_var(torch_tensor, name, zero_copy=False):
+    # DLPack can only wrap dense CPU tensors, which must also be aligned for TVM kernels
+    if (
+        zero_copy
+        and torch_tensor.device.type == "cpu"
+        and torch_tensor.is_contiguous()
+        and torch_tensor.data_ptr() % 64 == 0
+    ):
+        import torch.utils.dlpack
+
+        tensor = tvm.nd.from_dlpack(torch.utils.dlpack.to_dlpack(torch_tensor.detach()))
+    else:
+        tensor = tvm.nd.array(torch_tensor.cpu().numpy())
     var = _expr.var(name, shape=tensor.shape, dtype=tensor.dtype)
     return tensor, var
 
@@ -3007,10 +3018,11 @@ def get_attr_chains(root_getattr_node):
     return get_use_chains(root_getattr_node, terminate)
 
 
-def convert_params(graph, state_dict):
+def convert_params(graph, state_dict, zero_copy=False):
     """
     Return Relay vars and TVM NDArrays for input parameters
     A chain of prim::GetAttr nodes is processed one at a time
+    With zero_copy, the NDArrays share the memory of the CPU tensors through DLPack
     """
     getattr_nodes = graph.findAllNodes("prim::GetAttr", recurse=True)
     params = {}
@@ -3038,7 +3050,7 @@ def convert_params(graph, state_dict):
                     var = vars_by_name[full_attr]
                 else:
                     torch_tensor = state_dict[full_attr]
-                    tensor, var = _get_tensor_and_var(torch_tensor, full_attr)
+                    tensor, var = _get_tensor_and_var(torch_tensor, full_attr, zero_copy)
                     param_tensors[full_attr] = tensor
                     vars_by_name[full_attr] = var
                 params[full_attr_node_name] = var
@@ -3260,7 +3272,13 @@ def get_all_op_names(graph):
     return set(node.kind() for node in nodes)
 
 
-def from_pytorch(script_module, input_infos, custom_convert_map=None, default_dtype="float32"):
+def from_pytorch(
+    script_module,
+    input_infos,
+    custom_convert_map=None,
+    default_dtype="float32",
+    zero_copy_params=False,
+):
     """Load PyTorch model in the form of a scripted PyTorch model and convert into relay.
     The companion parameters will be handled automatically.
 
@@ -3283,6 +3301,11 @@ def from_pytorch(script_module, input_infos, custom_convert_map=None, default_dt
     custom_convert_map: Dictionary of str to Relay op
         A custom op conversion map in the same format as _convert_map above
 
+    zero_copy_params: bool
+        Wrap the parameters in CPU memory as NDArrays through DLPack instead of copying them.
+        The returned params then share the memory of the module,
+        which should not be modified while they are in use.
+
     Returns
     -------
     mod : tvm.relay.Module
@@ -3312,8 +3335,7 @@ def from_pytorch(script_module, input_infos, custom_convert_map=None, default_dt
     outputs = _get_relay_input_vars(
         graph, input_infos, prelude, default_dtype=default_dtype, is_module=is_module
     )
-    param_vars, tensors, packed_param_map = convert_params(graph, params)
-    tvm_params = {k: tvm.nd.array(v) for k, v in tensors.items()}
+    param_vars, tvm_params, packed_param_map = convert_params(graph, params, zero_copy_params)
 
     outputs.update(param_vars)
     ret_name = _get_input_names(graph.return_node())
@@ -16,8 +16,17 @@
 # under the License.
 # pylint: disable=invalid-name
 """Helper utility to save parameter dicts."""
+import ctypes
+import json
+import mmap
+import struct
+
+import numpy as np
 import tvm
 import tvm._ffi
+from tvm._ffi.base import c_array
+from tvm._ffi.runtime_ctypes import DataType, TVMArray, TVMContext, tvm_shape_index_t
+from tvm.runtime.ndarray import _make_array
 
 
 _save_param_dict = tvm._ffi.get_global_func("tvm.relay._save_param_dict")
@@ -76,3 +85,179 @@ def load_param_dict(param_bytes):
         param_bytes = bytearray(param_bytes)
     load_arr = _load_param_dict(param_bytes)
     return {v.name: v.array for v in load_arr}
+
+
+# The memory-mappable parameter file starts with a header of
+# magic (8 bytes), version (uint64) and index size (uint64), followed by the index,
+# a json list of {"name", "dtype", "shape", "offset", "nbytes"}. The data of each
+# parameter is stored in host byte order at the offset from the data section,
+# which starts after the index. Both are aligned to the allocation alignment of the runtime.
+_PARAM_MMAP_MAGIC = b"TVMPMMAP"
+_PARAM_MMAP_VERSION = 1
+_PARAM_MMAP_ALIGN = 64
+_PARAM_MMAP_HEADER = struct.Struct("<8sQQ")
+_NDARRAY_LIST_MAGIC = 0xF7E58D4F05049CB7
+_NDARRAY_MAGIC = 0xDD5E40F096B4A13F
+
+
+def _align(offset):
+    return (offset + _PARAM_MMAP_ALIGN - 1) // _PARAM_MMAP_ALIGN * _PARAM_MMAP_ALIGN
+
+
+def _write_param_mmap(path, entries):
+    """Write (name, dtype, shape, data buffer) entries to a memory-mappable parameter file"""
+    index, offset = [], 0
+    for name, dtype, shape, data in entries:
+        nbytes = memoryview(data).nbytes
+        index.append(
+            {"name": name, "dtype": dtype, "shape": shape, "offset": offset, "nbytes": nbytes}
+        )
+        offset = _align(offset + nbytes)
+    index_bytes = json.dumps(index).encode()
+
+    with open(path, "wb") as f:
+        f.write(_PARAM_MMAP_HEADER.pack(_PARAM_MMAP_MAGIC, _PARAM_MMAP_VERSION, len(index_bytes)))
+        f.write(index_bytes)
+        data_start = _align(f.tell())
+        for item, (_, _, _, data) in zip(index, entries):
+            f.write(b"\0" * (data_start + item["offset"] - f.tell()))
+            f.write(data)
+
+
+def save_param_mmap(params, path):
+    """Save parameter dictionary to a memory-mappable parameter file.
+
+    The file can be loaded by :py:func:`load_param_mmap` without reading it
+    into memory, or by the GraphModule with API "load_params_mmap".
+
+    Parameters
+    ----------
+    params : dict of str to NDArray
+        The parameter dictionary.
+
+    path : str
+        The path of the file.
+    """
+    entries = []
+    for k, v in params.items():
+        v = v.asnumpy() if isinstance(v, tvm.nd.NDArray) else np.ascontiguousarray(v)
+        entries.append((k, str(v.dtype), list(v.shape), v))
+    _write_param_mmap(path, entries)
+
+
+def convert_param_dict(param_file, path):
+    """Convert a file of the bytes saved by :py:func:`save_param_dict`
+    to a memory-mappable parameter file, one parameter at a time.
+
+    Parameters
+    ----------
+    param_file : str
+        The path of the file saved in the format of save_param_dict.
+
+    path : str
+        The path of the memory-mappable parameter file.
+    """
+    with open(param_file, "rb") as f:
+        buf = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+    view = memoryview(buf)
+
+    def read(fmt, pos):
+        return struct.unpack_from("<" + fmt, buf, pos), pos + struct.calcsize("<" + fmt)
+
+    (header, _), pos = read("QQ", 0)
+    if header != _NDARRAY_LIST_MAGIC:
+        raise ValueError("Invalid parameters file format: %s" % param_file)
+    (num_names,), pos = read("Q", pos)
+    names = []
+    for _ in range(num_names):
+        (length,), pos = read("Q", pos)
+        names.append(bytes(view[pos : pos + length]).decode())
+        pos += length
+    (num_arrays,), pos = read("Q", pos)
+    if num_arrays != num_names:
+        raise ValueError("Invalid parameters file format: %s" % param_file)
+
+    entries = []
+    for name in names:
+        (header, _, _, _, ndim), pos = read("QQiii", pos)
+        if header != _NDARRAY_MAGIC:
+            raise ValueError("Invalid parameters file format: %s" % param_file)
+        dtype = repr(DataType.from_buffer_copy(buf, pos))
+        shape, pos = read("%dq" % ndim, pos + 4)
+        (nbytes,), pos = read("q", pos)
+        entries.append((name, dtype, list(shape), view[pos : pos + nbytes]))
+        pos += nbytes
+    _write_param_mmap(path, entries)
+
+
+class MappedParams(dict):
+    """The parameters of a memory-mapped parameter file.
+
+    The values are CPU NDArrays viewing the pages of the mapped file without copying,
+    which are only read from disk when an array is accessed. The arrays are only valid
+    while this dict is alive.
+
+    Parameters
+    ----------
+    path : str
+        The path of the file saved by :py:func:`save_param_mmap`.
+    """
+
+    def __init__(self, path):
+        super(MappedParams, self).__init__()
+        with open(path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, index_size = _PARAM_MMAP_HEADER.unpack_from(self._mmap, 0)
+        if magic != _PARAM_MMAP_MAGIC or version != _PARAM_MMAP_VERSION:
+            raise ValueError("Invalid memory-mappable parameters file: %s" % path)
+        index_start = _PARAM_MMAP_HEADER.size
+        index = json.loads(self._mmap[index_start : index_start + index_size].decode())
+        data_start = _align(index_start + index_size)
+
+        self._data = np.frombuffer(self._mmap, dtype="uint8")
+        # the DLTensors and shapes referenced by the NDArray views
+        self._tensors = []
+        for item in index:
+            arr = TVMArray()
+            shape = c_array(tvm_shape_index_t, item["shape"])
+            arr.data = ctypes.c_void_p(self._data.ctypes.data + data_start + item["offset"])
+            arr.shape = shape
+            arr.strides = None
+            arr.dtype = DataType(item["dtype"])
+            arr.ndim = len(item["shape"])
+            arr.ctx = TVMContext(1, 0)
+            self._tensors.append((arr, shape))
+            self[item["name"]] = _make_array(ctypes.pointer(arr), True, False)
+
+
+def is_param_mmap(path):
+    """Check whether a file is a memory-mappable parameter file.
+
+    Parameters
+    ----------
+    path : str
+        The path of the file.
+
+    Returns
+    -------
+    ret : bool
+        Whether the file is saved by :py:func:`save_param_mmap`.
+    """
+    with open(path, "rb") as f:
+        return f.read(len(_PARAM_MMAP_MAGIC)) == _PARAM_MMAP_MAGIC
+
+
+def load_param_mmap(path):
+    """Load parameter dictionary from a memory-mappable parameter file without copying.
+
+    Parameters
+    ----------
+    path : str
+        The path of the file saved by :py:func:`save_param_mmap`.
+
+    Returns
+    -------
+    params : MappedParams
+        The parameter dictionary, whose NDArrays view the mapped file.
+    """
+    return MappedParams(path)
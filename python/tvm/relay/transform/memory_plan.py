@@ -20,17 +20,22 @@ A pass for manifesting explicit memory allocations.
 """
 from typing import Optional, Dict, List, Tuple
 from collections import defaultdict
+import logging
 import attr
 
+from tvm.ir.transform import PassContext
 from ..expr_functor import ExprMutator
 from .. import op, expr
 from ..function import Function
+from ..analysis import free_vars
 from ... import register_func, ir, cpu
 from ..._ffi.runtime_ctypes import TVMContext
 from ... import IRModule
 from .. import transform
 from . import function_pass
 
+logger = logging.getLogger("relay.memory_plan")
+
 
 def is_primitive(call):
     return (
@@ -56,13 +61,14 @@ class Region:
     dtype: Optional[str]
     ctx: TVMContext
     offsets: Dict[expr.Var, Tuple[expr.Expr, expr.Expr]]
+    static_sizes: Dict[expr.Var, Optional[int]]
 
     @staticmethod
     def empty(region_no):
         zero = expr.const(0, dtype="int64")
         assert len(zero.data.shape) == 0
         region_var = expr.var(f"region{region_no}")
-        return Region(region_var, zero, None, None, None, {})
+        return Region(region_var, zero, None, None, None, {}, {})
 
     def grow(
         self,
@@ -105,20 +111,84 @@ class Region:
 
         self.size = self.size + new_size
 
+        # Keep the aligned size of static allocations for planning the offsets by liveness.
+        if isinstance(size, expr.Constant) and isinstance(self.alignment, expr.Constant):
+            align = int(self.alignment.data.asnumpy().item())
+            self.static_sizes[old_storage] = (
+                (int(size.data.asnumpy().item()) + align - 1) // align * align
+            )
+        else:
+            self.static_sizes[old_storage] = None
+
+    def plan(self, live_ranges) -> Optional[Tuple[Dict[expr.Var, int], int]]:
+        """Assign the offsets of the allocations greedily by size, so that allocations whose
+        live ranges do not overlap share the same memory.
+
+        Parameters
+        ----------
+        live_ranges : Dict[expr.Var, Tuple[int, int, int]]
+            The (let chain, first binding, last use) of every storage.
+
+        Returns
+        -------
+        plan : Optional[Tuple[Dict[expr.Var, int], int]]
+            The offset of every allocation and the total size of the region,
+            None if some allocation has a dynamic size or an unknown live range.
+        """
+        for storage, size in self.static_sizes.items():
+            if size is None or storage not in live_ranges:
+                return None
+
+        def overlap(lhs, rhs):
+            return lhs[0] != rhs[0] or not (lhs[2] < rhs[1] or rhs[2] < lhs[1])
+
+        offsets = {}
+        placed = []
+        total = 0
+        for storage in sorted(self.static_sizes, key=lambda x: -self.static_sizes[x]):
+            size = self.static_sizes[storage]
+            live_range = live_ranges[storage]
+            # First fit between the allocations alive at the same time
+            offset = 0
+            for other_offset, other_size in sorted(
+                (o, sz) for o, sz, r in placed if overlap(r, live_range)
+            ):
+                if offset + size <= other_offset:
+                    break
+                offset = max(offset, other_offset + other_size)
+            placed.append((offset, size, live_range))
+            offsets[storage] = offset
+            total = max(total, offset + size)
+        return offsets, total
+
     def offset_for(self, alloc: expr.Expr) -> expr.Expr:
         return self.offsets.get(alloc, [None])[0]
 
-    def to_expr(self, body: expr.Expr) -> expr.Expr:
+    def to_expr(self, body: expr.Expr, live_ranges=None) -> expr.Expr:
         """
         Generate the prelude code for a region, wrapping the body in it.
 
         The prelude contains the single allocation for a region, and
-        all offset computations.
+        all offset computations. With the live ranges of the storages,
+        the offsets of static allocations are reused after their last use.
         """
 
         if self.ctx is None:
             self.ctx = cpu(0)
 
+        plan = self.plan(live_ranges) if live_ranges is not None else None
+        if plan is not None:
+            offsets, total = plan
+            logger.debug(
+                "region of %s: %d bytes coalesced, %d bytes with reuse",
+                self.dtype,
+                sum(self.static_sizes.values()),
+                total,
+            )
+            self.size = expr.const(total, dtype="int64")
+            for alloc, offset in offsets.items():
+                self.offsets[alloc] = (self.offsets[alloc][0], expr.const(offset, dtype="int64"))
+
         # Generate bindings for each and every size computation
         # we must do this to maintain ANF.
         bindings: List[Tuple[expr.Expr, expr.Expr]] = []
@@ -166,6 +236,52 @@ def mk_let(bindings, body):
     return body
 
 
+def liveness(let):
+    """Compute the live ranges of the storages allocated in a let chain.
+
+    A value bound by the chain refers to a storage if it uses the storage variable or any value
+    that refers to it, e.g. the tensors allocated in it or tuples of those tensors. The live range
+    of a storage ends at the last binding that refers to it, or at the end of the chain if the
+    body of the chain refers to it.
+
+    Parameters
+    ----------
+    let : tvm.relay.Let
+        The head of the let chain.
+
+    Returns
+    -------
+    live_ranges : Dict[tvm.relay.Var, Tuple[int, int]]
+        The index of the binding and the last use of every storage.
+    """
+    alloc_storage = op.op.get("memory.alloc_storage")
+    owners = {}
+    live_ranges = {}
+
+    def use(value, i):
+        storages = set()
+        for var in free_vars(value):
+            storages.update(owners.get(var, ()))
+        for storage in storages:
+            live_ranges[storage][1] = i
+        return storages
+
+    i = 0
+    while isinstance(let, expr.Let):
+        if isinstance(let.value, expr.Call) and let.value.op == alloc_storage:
+            owners[let.var] = {let.var}
+            live_ranges[let.var] = [i, i]
+        else:
+            storages = use(let.value, i)
+            if storages:
+                owners[let.var] = storages
+        let = let.body
+        i += 1
+    use(let, i)
+
+    return {storage: tuple(live_range) for storage, live_range in live_ranges.items()}
+
+
 def const_eval(mod, exp):
     mod = IRModule.from_expr(exp, type_defs=mod.type_definitions)
     mod = transform.FoldConstant()(mod)
@@ -176,18 +292,20 @@ class StorageCoalesce(ExprMutator):
     """
     A pass for coalescing allocations into region/arena allocations.
 
-    After this pass each allocation comes from the same backing storage,
-    but will never overlap even in time, i.e. the allocations are just
-    packed into a contiguous block of memory.
-
-    A secondary part of memory planning will perform liveness analysis to
-    overlap these in time, i.e when an early tensor dies we will attempt
-    to reuse its slot.
+    After this pass each allocation comes from the same backing storage.
+    With reuse, the live range of every storage is computed on the let
+    chain, and static allocations that are not alive at the same time
+    share their slots, so a region is sized to the peak of the live
+    allocations instead of their sum.
     """
 
-    def __init__(self):
+    def __init__(self, reuse=True):
         super().__init__()
         self.regions = []
+        self.reuse = reuse
+        # The (let chain, first binding, last use) of every storage
+        self.live_ranges = {}
+        self.num_chains = 0
 
     def enter_scope(self) -> None:
         region_no = len(self.regions)
@@ -198,7 +316,7 @@ class StorageCoalesce(ExprMutator):
         dtype_region = self.regions.pop()
         for _, region in reversed(list(dtype_region.items())):
             if len(region.offsets) != 0:
-                body = region.to_expr(body)
+                body = region.to_expr(body, self.live_ranges if self.reuse else None)
 
         return body
 
@@ -263,6 +381,12 @@ class StorageCoalesce(ExprMutator):
     def visit_let(self, let):
         dynamic_regions = []
 
+        if self.reuse:
+            chain = self.num_chains
+            self.num_chains += 1
+            for storage, (first, last) in liveness(let).items():
+                self.live_ranges[storage] = (chain, first, last)
+
         def _each_binding(lhs, rhs):
             if isinstance(rhs, expr.Call) and rhs.op == op.op.get("memory.alloc_storage"):
                 return self.process_alloc_storage(dynamic_regions, lhs, rhs)
@@ -354,7 +478,8 @@ class MemoryPlan:
 
     def transform_function(self, func, mod, _):
         mod.import_from_std("core.rly")
-        sc = StorageCoalesce()
+        reuse = bool(PassContext.current().config.get("relay.MemoryPlan.reuse", True))
+        sc = StorageCoalesce(reuse)
         func = sc.visit(func)
         return func
 
@@ -27,5 +27,5 @@ upload and run remote RPC server, get the result back to verify correctness.
 
 from .server import Server
 from .client import connect, connect_tracker
-from .client import RPCSession, LocalSession, PopenSession, TrackerSession
+from .client import RPCSession, LocalSession, PopenSession, TrackerSession, RPCLease
 from .minrpc import with_minrpc
@@ -19,6 +19,7 @@ import os
 import stat
 import socket
 import struct
+import tarfile
 import time
 
 import tvm._ffi
@@ -116,6 +117,35 @@ class RPCSession(object):
             self._remote_funcs["upload"] = self.get_function("tvm.rpc.server.upload")
         self._remote_funcs["upload"](target, blob)
 
+    def upload_files(self, files):
+        """Upload files to remote runtime temp folder as one archive.
+
+        The remote unpacks the archive, a remote without support for it
+        gets the files one by one.
+
+        Parameters
+        ----------
+        files : dict of str to str
+            The path in remote of each local file to upload.
+        """
+        if "unpack" not in self._remote_funcs:
+            try:
+                self._remote_funcs["unpack"] = self.get_function("tvm.rpc.server.unpack")
+            except AttributeError:
+                self._remote_funcs["unpack"] = None
+        if self._remote_funcs["unpack"] is None:
+            for target, path in files.items():
+                self.upload(path, target)
+            return
+
+        temp = util.tempdir()
+        archive = temp.relpath("files.tar.gz")
+        with tarfile.open(archive, "w:gz") as tar:
+            for target, path in files.items():
+                tar.add(path, arcname=target)
+        self.upload(archive, "files.tar.gz")
+        self._remote_funcs["unpack"]("files.tar.gz")
+
     def download(self, path):
         """Download file from remote temp folder.
 
@@ -362,7 +392,7 @@ class TrackerSession(object):
         res += separate_line
         return res
 
-    def request(self, key, priority=1, session_timeout=0, max_retry=5):
+    def request(self, key, priority=1, session_timeout=0, max_retry=5, user=""):
         """Request a new connection from the tracker.
 
         Parameters
@@ -380,13 +410,16 @@ class TrackerSession(object):
 
         max_retry : int, optional
             Maximum number of times to retry before give up.
+
+        user : str, optional
+            The user sharing the devices with others, the host of the client by default.
         """
         last_err = None
         for _ in range(max_retry):
             try:
                 if self._sock is None:
                     self._connect()
-                base.sendjson(self._sock, [base.TrackerCode.REQUEST, key, "", priority])
+                base.sendjson(self._sock, [base.TrackerCode.REQUEST, key, user, priority])
                 value = base.recvjson(self._sock)
                 if value[0] != base.TrackerCode.SUCCESS:
                     raise RuntimeError("Invalid return value %s" % str(value))
@@ -401,6 +434,55 @@ class TrackerSession(object):
             "Cannot request %s after %d retry, last_error:%s" % (key, max_retry, str(last_err))
         )
 
+    def lease(
+        self,
+        key,
+        priority=1,
+        session_timeout=0,
+        duration=None,
+        max_requests=None,
+        max_retry=5,
+        user="",
+    ):
+        """Lease a connection from the tracker for a batch of requests.
+
+        The connection is requested on the first use of the lease, then kept
+        until the lease ends or an error invalidates it.
+
+        Parameters
+        ----------
+        key : str
+            The type key of the device.
+
+        priority : int, optional
+            The priority of the request.
+
+        session_timeout : float, optional
+            The duration of each session, allows server to kill
+            the connection when duration is longer than this value.
+            When duration is zero, it means the request must always be kept alive.
+
+        duration : float, optional
+            Request a new connection once the current one is older than this value.
+
+        max_requests : int, optional
+            Request a new connection once the current one served this number of requests.
+
+        max_retry : int, optional
+            Maximum number of times to retry each request before give up.
+
+        user : str, optional
+            The user sharing the devices with others, the host of the client by default.
+
+        Returns
+        -------
+        lease : RPCLease
+            The lease of the connection.
+        """
+        return RPCLease(
+            self, key, priority, session_timeout, duration, max_requests, max_retry, user
+        )
+
     def request_and_run(self, key, func, priority=1, session_timeout=0, max_retry=2):
         """Request a resource from tracker and run the func.
 
@@ -443,6 +525,93 @@ class TrackerSession(object):
         )
 
 
+class RPCLease(object):
+    """A connection leased from the tracker for a batch of requests.
+
+    Do not directly create the object, call TrackerSession.lease.
+    The device stays reserved while the lease holds its connection,
+    so the requests of the batch do not wait in the tracker queue,
+    nor connect and upload their modules again.
+
+    The connection is only closed once no reference to it is left, so drop
+    the previous session before getting a new one from the lease, otherwise
+    the request can wait for the device held by the previous session.
+    num_sessions tells whether the session changed, e.g. to upload again.
+
+    Examples
+    --------
+    .. code-block:: python
+
+        with tracker.lease("rasp3b", session_timeout=600) as lease:
+            for candidate in batch:
+                try:
+                    measure(lease.session(), candidate)
+                except TVMError:
+                    # request another connection for the next candidate
+                    lease.invalidate()
+    """
+
+    def __init__(
+        self, tracker, key, priority, session_timeout, duration, max_requests, max_retry, user
+    ):
+        self._tracker = tracker
+        self._key = key
+        self._priority = priority
+        self._session_timeout = session_timeout
+        self._duration = duration
+        self._max_requests = max_requests
+        self._max_retry = max_retry
+        self._user = user
+        self._sess = None
+        self._tstart = None
+        self._num_requests = 0
+        self.num_sessions = 0
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, ptype, value, trace):
+        self.invalidate()
+
+    @property
+    def expired(self):
+        """Whether the current connection can no longer serve requests."""
+        if self._sess is None:
+            return True
+        if self._duration is not None and time.time() - self._tstart >= self._duration:
+            return True
+        return self._max_requests is not None and self._num_requests >= self._max_requests
+
+    def session(self):
+        """Get the leased connection, requesting a new one if needed.
+
+        Returns
+        -------
+        sess : RPCSession
+            The connected session.
+        """
+        if self.expired:
+            self.invalidate()
+            self._sess = self._tracker.request(
+                self._key,
+                priority=self._priority,
+                session_timeout=self._session_timeout,
+                max_retry=self._max_retry,
+                user=self._user,
+            )
+            self._tstart = time.time()
+            self._num_requests = 0
+            self.num_sessions += 1
+        self._num_requests += 1
+        return self._sess
+
+    def invalidate(self):
+        """Close the leased connection, e.g. after an error.
+        The next use of the lease requests a new one."""
+        # the server goes back to the tracker once the connection is closed
+        self._sess = None
+
+
 def connect(url, port, key="", session_timeout=0, session_constructor_args=None):
     """Connect to RPC Server
 
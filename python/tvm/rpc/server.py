@@ -37,6 +37,7 @@ import time
 import sys
 import signal
 import platform
+import tarfile
 import tvm._ffi
 
 from tvm._ffi.base import py_str
@@ -70,6 +71,21 @@ def _server_env(load_library, work_path=None):
         logger.info("load_module %s", path)
         return m
 
+    @tvm._ffi.register_func("tvm.rpc.server.unpack", override=True)
+    def unpack(file_name):
+        """Unpack an uploaded archive into the temp folder."""
+        path = temp.relpath(file_name)
+        with tarfile.open(path) as archive:
+            for member in archive.getmembers():
+                if os.path.isabs(member.name) or ".." in member.name.split("/"):
+                    raise RuntimeError("Invalid file %s in %s" % (member.name, file_name))
+                # links could point outside the temp folder
+                if member.issym() or member.islnk():
+                    raise RuntimeError("Invalid link %s in %s" % (member.name, file_name))
+            archive.extractall(temp.temp_dir)
+        os.remove(path)
+        logger.info("unpack %s", path)
+
     @tvm._ffi.register_func("tvm.rpc.server.download_linked_module", override=True)
     def download_linked_module(file_name):
         """Load module from remote side."""
@@ -42,6 +42,7 @@ List of available APIs:
 # pylint: disable=invalid-name
 
 import heapq
+import itertools
 import time
 import logging
 import socket
@@ -49,6 +50,7 @@ import multiprocessing
 import errno
 import struct
 import json
+from collections import deque
 
 try:
     from tornado import ioloop
@@ -147,6 +149,262 @@ class PriorityScheduler(Scheduler):
         return {"free": len(self._values), "pending": len(self._requests)}
 
 
+class _UserState(object):
+    """Requests and usage of a user in FairShareScheduler"""
+
+    def __init__(self, share, quota):
+        self.share = share
+        self.quota = quota
+        # heap of (-priority, time, seq, callback)
+        self.requests = []
+        self.usage = 0.0
+        self.in_use = 0
+        # the entry of the user in the ready heap, None if not ready
+        self.ready_entry = None
+
+
+class _DeviceState(object):
+    """Recent session outcomes of a device in FairShareScheduler"""
+
+    def __init__(self):
+        self.first_seen = time.time()
+        self.session_time = 0.0
+        self.failure_rate = 0.0
+        self.sessions = 0
+        self.failures = 0
+        self.busy_time = 0.0
+        # the user and the value of the current session
+        self.busy_since = None
+        self.user = None
+        self.value = None
+
+
+class FairShareScheduler(Scheduler):
+    """Fair share scheduler with per-user quotas and device health scoring.
+
+    Each user has its own queue, FIFO within the same priority. The next free
+    device goes to the user with the least usage, which grows by 1 / share at
+    each session the user gets, so the users with pending requests get sessions
+    in proportion to their shares, whatever the number of their requests.
+    A user coming back from idle starts from the usage of the last served user.
+    A user with quota sessions in use waits for one of them to end.
+
+    Free devices are handed out by increasing score, the recent mean session
+    time in seconds plus failure_penalty times the recent failure rate, so slow
+    and flaky devices are only used when the others are busy. A session ends when
+    the server puts the device back, it fails when the server disconnects during
+    the session. All queue operations take O(log n).
+
+    Parameters
+    ----------
+    key : str
+        The key of the devices.
+
+    shares : dict of str to float, optional
+        The share of each user, 1 by default.
+
+    quotas : dict of str to int, optional
+        The maximum number of sessions in use of each user.
+
+    default_quota : int, optional
+        The quota of the users not in quotas, unlimited by default.
+
+    failure_penalty : float, optional
+        The score of a device which always fails, in seconds.
+
+    decay : float, optional
+        The weight of the last session outcome in the recent session time and failure rate.
+
+    window_size : int, optional
+        The number of the latest wait times to summarize.
+    """
+
+    def __init__(
+        self,
+        key,
+        shares=None,
+        quotas=None,
+        default_quota=None,
+        failure_penalty=60.0,
+        decay=0.2,
+        window_size=1000,
+    ):
+        self._key = key
+        self._shares = shares or {}
+        self._quotas = quotas or {}
+        self._default_quota = default_quota
+        self._failure_penalty = failure_penalty
+        self._decay = decay
+        self._seq = itertools.count()
+        self._users = {}
+        self._devices = {}
+        # heap of (usage, seq, user) of the users which can get a device
+        self._ready = []
+        # heap of (score, seq, value) of the free devices, invalidated by removing
+        # the value from _free_values
+        self._free = []
+        self._free_values = set()
+        self._num_pending = 0
+        self._vtime = 0.0
+        self._wait_times = deque(maxlen=window_size)
+
+    @staticmethod
+    def _device_id(value):
+        # (addr, port) of the server, which puts a new value after each session
+        return "%s:%d" % (value[1], value[2])
+
+    def _score(self, device):
+        return device.session_time + self._failure_penalty * device.failure_rate
+
+    def _update_ready(self, user):
+        """Add the user to the ready heap if it can get a device, otherwise remove it"""
+        state = self._users[user]
+        ready = state.requests and (state.quota is None or state.in_use < state.quota)
+        if not ready:
+            state.ready_entry = None
+        elif state.ready_entry is None:
+            state.ready_entry = (state.usage, next(self._seq), user)
+            heapq.heappush(self._ready, state.ready_entry)
+
+    def _peek_ready(self):
+        while self._ready:
+            entry = self._ready[0]
+            if self._users[entry[-1]].ready_entry is entry:
+                return entry[-1]
+            heapq.heappop(self._ready)
+        return None
+
+    def _peek_free(self):
+        while self._free:
+            value = self._free[0][-1]
+            if value in self._free_values:
+                return value
+            heapq.heappop(self._free)
+        return None
+
+    def _schedule(self):
+        while True:
+            user = self._peek_ready()
+            value = self._peek_free()
+            if user is None or value is None:
+                return
+            heapq.heappop(self._free)
+            self._free_values.remove(value)
+            state = self._users[user]
+            _, tstart, _, callback = heapq.heappop(state.requests)
+            self._num_pending -= 1
+            if callback(value[1:]):
+                value[0].pending_matchkeys.remove(value[-1])
+                device = self._devices[self._device_id(value)]
+                device.busy_since = time.time()
+                device.user = user
+                device.value = value
+                self._wait_times.append(device.busy_since - tstart)
+                self._vtime = state.usage
+                state.usage += 1.0 / state.share
+                state.in_use += 1
+                state.ready_entry = None
+            else:
+                self._push_free(value)
+            self._update_ready(user)
+
+    def _push_free(self, value):
+        device = self._devices[self._device_id(value)]
+        heapq.heappush(self._free, (self._score(device), next(self._seq), value))
+        self._free_values.add(value)
+
+    def _end_session(self, device, failed):
+        """Record the outcome of the current session of a device"""
+        duration = time.time() - device.busy_since
+        device.busy_time += duration
+        device.sessions += 1
+        if failed:
+            device.failures += 1
+        else:
+            device.session_time += self._decay * (duration - device.session_time)
+        device.failure_rate += self._decay * (float(failed) - device.failure_rate)
+        self._users[device.user].in_use -= 1
+        self._update_ready(device.user)
+        device.busy_since = device.user = device.value = None
+
+    def put(self, value):
+        device_id = self._device_id(value)
+        if device_id not in self._devices:
+            self._devices[device_id] = _DeviceState()
+        device = self._devices[device_id]
+        if device.busy_since is not None:
+            self._end_session(device, failed=False)
+        self._push_free(value)
+        self._schedule()
+
+    def request(self, user, priority, callback):
+        if user not in self._users:
+            self._users[user] = _UserState(
+                self._shares.get(user, 1.0), self._quotas.get(user, self._default_quota)
+            )
+        state = self._users[user]
+        if not state.requests:
+            # do not let an idle user catch up with the usage of the others
+            state.usage = max(state.usage, self._vtime)
+        heapq.heappush(state.requests, (-priority, time.time(), next(self._seq), callback))
+        self._num_pending += 1
+        self._update_ready(user)
+        self._schedule()
+
+    def remove(self, value):
+        if value in self._free_values:
+            self._free_values.remove(value)
+            return
+        device = self._devices.get(self._device_id(value))
+        if device is not None and device.value == value:
+            self._end_session(device, failed=True)
+            self._schedule()
+
+    def summary(self):
+        """Get summary information of the scheduler.
+
+        Besides the number of free devices and of pending requests, the metrics
+        contain the statistics of the latest wait times in seconds, the pending
+        requests, sessions in use and usage of each user, and the recent session
+        time in seconds, failure rate, score and utilization of each device.
+        """
+        now = time.time()
+        wait_times = sorted(self._wait_times)
+        wait = {"mean": 0.0, "p50": 0.0, "p99": 0.0}
+        if wait_times:
+            wait["mean"] = sum(wait_times) / len(wait_times)
+            for p in [50, 99]:
+                wait["p%d" % p] = wait_times[min(len(wait_times) * p // 100, len(wait_times) - 1)]
+        users = {
+            user: {
+                "pending": len(state.requests),
+                "in_use": state.in_use,
+                "usage": state.usage,
+                "quota": state.quota,
+            }
+            for user, state in self._users.items()
+        }
+        devices = {}
+        for device_id, device in self._devices.items():
+            busy_time = device.busy_time
+            if device.busy_since is not None:
+                busy_time += now - device.busy_since
+            devices[device_id] = {
+                "busy": device.busy_since is not None,
+                "sessions": device.sessions,
+                "failures": device.failures,
+                "session_time": device.session_time,
+                "failure_rate": device.failure_rate,
+                "score": self._score(device),
+                "utilization": busy_time / max(now - device.first_seen, 1e-9),
+            }
+        return {
+            "free": len(self._free_values),
+            "pending": self._num_pending,
+            "metrics": {"wait_time": wait, "users": users, "devices": devices},
+        }
+
+
 class TCPEventHandler(tornado_util.TCPHandler):
     """Base asynchronize message handler.
 
@@ -241,7 +499,8 @@ class TCPEventHandler(tornado_util.TCPHandler):
             self.ret_value(TrackerCode.SUCCESS)
         elif code == TrackerCode.REQUEST:
             key = args[1]
-            user = args[2]
+            # share among the client hosts by default
+            user = args[2] or self._addr[0]
             priority = args[3]
 
             def _cb(value):
@@ -287,8 +546,9 @@ class TCPEventHandler(tornado_util.TCPHandler):
 class TrackerServerHandler(object):
     """Tracker that tracks the resources."""
 
-    def __init__(self, sock, stop_key):
+    def __init__(self, sock, stop_key, scheduler=None):
         self._scheduler_map = {}
+        self._scheduler = scheduler or PriorityScheduler
         self._sock = sock
         self._sock.setblocking(0)
         self._ioloop = ioloop.IOLoop.current()
@@ -311,7 +571,7 @@ class TrackerServerHandler(object):
 
     def create_scheduler(self, key):
         """Create a new scheduler."""
-        return PriorityScheduler(key)
+        return self._scheduler(key)
 
     def put(self, key, value):
         """Report a new resource to the tracker."""
@@ -357,8 +617,8 @@ class TrackerServerHandler(object):
         self._ioloop.start()
 
 
-def _tracker_server(listen_sock, stop_key):
-    handler = TrackerServerHandler(listen_sock, stop_key)
+def _tracker_server(listen_sock, stop_key, scheduler=None):
+    handler = TrackerServerHandler(listen_sock, stop_key, scheduler)
     handler.run()
 
 
@@ -380,9 +640,13 @@ class Tracker(object):
 
     silent: bool, optional
         Whether run in silent mode
+
+    scheduler : function of str -> Scheduler, optional
+        Create the scheduler of the devices of a key, PriorityScheduler by default.
+        e.g. functools.partial(FairShareScheduler, default_quota=4)
     """
 
-    def __init__(self, host, port=9190, port_end=9199, silent=False):
+    def __init__(self, host, port=9190, port_end=9199, silent=False, scheduler=None):
         if silent:
             logger.setLevel(logging.WARN)
 
@@ -402,7 +666,9 @@ class Tracker(object):
             raise ValueError("cannot bind to any port in [%d, %d)" % (port, port_end))
         logger.info("bind to %s:%d", host, self.port)
         sock.listen(1)
-        self.proc = multiprocessing.Process(target=_tracker_server, args=(sock, self.stop_key))
+        self.proc = multiprocessing.Process(
+            target=_tracker_server, args=(sock, self.stop_key, scheduler)
+        )
         self.proc.start()
         self.host = host
         # close the socket on this process
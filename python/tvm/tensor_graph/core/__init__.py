@@ -1,8 +1,9 @@
 from .abs_graph import ForwardGraph, GraphVisitor, GraphMutator, \
                      BackwardGraph, make_fwd_graph
 from .tensor import GraphTensor, GraphOp, compute, GraphNode
-from .con_graph import PyTIRGraph, PyOpState, make_tir_graph
+from .con_graph import PyTIRGraph, PyOpState, make_tir_graph, \
+                       partition_policy, set_partition_policy, split_training_graph
 from .auto_schedule import *
-from .runtime import SingleGraphSession
+from .runtime import SingleGraphSession, DataParallelSession
 # cache
 from .utils import util_cache
\ No newline at end of file
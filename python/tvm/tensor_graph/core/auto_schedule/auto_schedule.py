@@ -1267,7 +1267,8 @@ class AutoScheduleMultiGraphContext(object):
         self.performance_trace = {}
         self.schedules = {}
         self.contexts = {}
-        self.graph_tag_to_tid = {}
+        self.graph_hash_to_tid = {}
+        self.subgraph_hashes = {}
         self.C = {}
         self.alpha = {}
         self.beta = {}
@@ -1283,16 +1284,18 @@ class AutoScheduleMultiGraphContext(object):
             sorted([(x.value, y) for x, y in graphs.items()], key=lambda x: x[0]))
         for key, subgraph in graphs.items():
             new_name = name + ":subgraph" + str(key)
-            if subgraph.tag in self.graph_tag_to_tid:
-                self.subgraph_count[subgraph.tag] += 1
+            graph_hash = tg.subgraph_hash(subgraph)
+            self.subgraph_hashes[key] = graph_hash
+            if graph_hash in self.graph_hash_to_tid:
+                self.subgraph_count[graph_hash] += 1
                 continue
             else:
-                self.subgraph_count[subgraph.tag] = 1
+                self.subgraph_count[graph_hash] = 1
             tid, ctx, use_at = AutoScheduleGraphDispatch.add_task(
                 new_name, self.log_dir, subgraph, measure_option, scheduler_option=scheduler_option
             )
             if use_at:
-                self.use_at_set.add(subgraph.tag)
+                self.use_at_set.add(graph_hash)
             sch, args, perf = AutoScheduleGraphDispatch.query_schedule(tid)
             self.performance_trace[tid] = [perf]
             self.C[tid] = perf
@@ -1301,11 +1304,27 @@ class AutoScheduleMultiGraphContext(object):
             self.X[tid] = self.calculate_X(tid)
             self.schedules[tid] = (sch, args)
             self.contexts[tid] = ctx
-            self.graph_tag_to_tid[subgraph.tag] = tid
-        self.L = len(self.graph_tag_to_tid) * trials
+            self.graph_hash_to_tid[graph_hash] = tid
+        print(
+            "[NOTICE] totally",
+            len(self.subgraph_hashes),
+            "subgraphs,",
+            len(self.graph_hash_to_tid),
+            "unique, reuse ratio=",
+            self.reuse_ratio() * 100.0,
+            "%",
+        )
+        self.L = len(self.graph_hash_to_tid) * trials
         self.trials = trials
         self.policy = policy
 
+    def reuse_ratio(self):
+        """The ratio of subgraphs that reuse the schedule of another subgraph."""
+        total = len(self.subgraph_hashes)
+        if total == 0:
+            return 0.0
+        return 1.0 - len(self.graph_hash_to_tid) / total
+
     def calculate_X(self, tid):
         raw = math.sqrt(self.C[tid] / (self.alpha[tid] + 1e-10))
         return raw
@@ -1363,19 +1382,15 @@ class AutoScheduleMultiGraphContext(object):
             "%",
         )
         ret = {}
-        graphs = tg.get_graphs_from_tir_multi_graph(self.tir_multi_graph)
-        graphs = OrderedDict({x.value: y for x, y in graphs.items()})
-        for key, subgraph in graphs.items():
-            tid = self.graph_tag_to_tid[subgraph.tag]
+        for key, graph_hash in self.subgraph_hashes.items():
+            tid = self.graph_hash_to_tid[graph_hash]
             sch, args = self.schedules[tid]
             ret[key] = tg.ScheduleTensors(sch, args)
         return ret
 
     def ready(self):
-        graphs = tg.get_graphs_from_tir_multi_graph(self.tir_multi_graph)
-        graphs = OrderedDict({x.value: y for x, y in graphs.items()})
-        for key, subgraph in graphs.items():
-            tid = self.graph_tag_to_tid[subgraph.tag]
+        for key, graph_hash in self.subgraph_hashes.items():
+            tid = self.graph_hash_to_tid[graph_hash]
             sch, args = self.schedules[tid]
             if sch is None or args is None:
                 return False
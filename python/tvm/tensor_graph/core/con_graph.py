@@ -37,6 +37,70 @@ def make_tir_graph(fwd_graph, loss=None, optimizer=None, inference=True, need_ou
     return tir_graph
 
 
+def split_training_graph(tir_graph):
+    """Split a training graph at the gradients.
+
+    The first graph computes loss and gradients without updating the weights,
+    the second one applies the optimizer, reading the gradients from placeholders.
+    This allows reducing the gradients between the two, e.g., for data parallel.
+
+    Returns
+    -------
+    (grad_graph, update_graph, grad_placeholders)
+    """
+    assert tir_graph.loss is not None and len(tir_graph.updates) > 0, \
+        "Expect a training graph with updates."
+    grad_graph = tvm.tg.make_tir_graph_training(
+        list(tir_graph.inputs), list(tir_graph.labels), list(tir_graph.outputs),
+        list(tir_graph.weights), tir_graph.loss, list(tir_graph.gradients), tir_graph.lr, [])
+
+    grad_placeholders = [
+        tvm.te.placeholder(g.shape, dtype=g.dtype, name=g.op.name + "_reduced", requires_grad=False)
+        for g in tir_graph.gradients]
+    tensor_map = {g: p for g, p in zip(tir_graph.gradients, grad_placeholders)}
+
+    def clone(op):
+        org_inputs = list(op.input_tensors)
+        inputs = [tensor_map[t] if t in tensor_map else t for t in org_inputs]
+        org_reduce_axis = list(op.reduce_axis)
+        reduce_axis = [
+            tvm.te.reduce_axis((iv.dom.min, iv.dom.min + iv.dom.extent), iv.var.name)
+            for iv in org_reduce_axis]
+
+        def body(*indices):
+            return tvm.tg.substitute_expression(
+                op.body[0], org_inputs, inputs, [iv.var for iv in op.axis], list(indices),
+                org_reduce_axis, reduce_axis)
+
+        return tvm.te.compute(
+            [iv.dom.extent for iv in op.axis], body,
+            name=op.name, tag=op.tag, requires_grad=False).op
+
+    # clone the ops between gradients and updates in post order
+    visited = set()
+
+    def visit(op):
+        if op in visited:
+            return
+        visited.add(op)
+        if not isinstance(op, tvm.te.ComputeOp):
+            return
+        for t in op.input_tensors:
+            if t not in tensor_map:
+                visit(t.op)
+        new_op = clone(op)
+        for i in range(op.num_outputs):
+            tensor_map[op.output(i)] = new_op.output(i)
+
+    for t in tir_graph.updates:
+        visit(t.op)
+
+    updates = [tensor_map[t] for t in tir_graph.updates]
+    update_graph = tvm.tg.make_tir_graph_training(
+        grad_placeholders, [], [], list(tir_graph.weights), None, [], tir_graph.lr, updates)
+    return grad_graph, update_graph, grad_placeholders
+
+
 @tvm._ffi.register_func("tg.graph.partition_policy")
 def partition_policy(graph, pre, post, number):
     pre_stat = graph.operation_stat_dict[pre]
@@ -181,6 +245,16 @@ class PyTIRSubGraph(object):
         self.down_graph = {}
         self.c_list = []
 
+    def buffers(self):
+        """The arguments of the subgraph function, in a deterministic order."""
+        ret = []
+        for part in [self.inputs, self.labels, self.outputs, self.weights, self.loss,
+                     self.gradients, self.lr, self.updates]:
+            for t in part.keys():
+                if t not in ret:
+                    ret.append(t)
+        return ret
+
     def __repr__(self):
         ret = "PyTIRSubGraph\n"
         ret += "inputs=" + str(self.inputs) + "\n"
@@ -311,7 +385,8 @@ class PyTIRGraph(object):
 
             subgraph.op_list = op_list
             subgraph.down_graph = down_graph
-            self.subgraph_features[mark] = ";".join(map(lambda x: self.op_feature_dict[self.op_map[x]], op_list))
+            self.subgraph_features[mark] = tvm.tg.subgraph_hash(
+                list(reversed(op_list)), args=subgraph.buffers())
             return None
 
         _ = list(map(func, subgraphs.items()))
@@ -379,17 +454,12 @@ class PyTIRGraph(object):
         elif feature in self.scheduled_subgraphs:
             return False
         subgraph = subgraphs[mark]
-        inputs = list(subgraph.inputs.keys())
         outputs = list(subgraph.outputs.keys())
-        weights = list(subgraph.weights.keys())
-        labels = list(subgraph.labels.keys())
         loss = list(subgraph.loss.keys())
         gradients = list(subgraph.gradients.keys())
-        lr = list(subgraph.lr.keys())
         updates = list(subgraph.updates.keys())
 
-        sub_bufs = list(set(inputs + labels + outputs + weights + loss + gradients + lr + updates))
-        self.bufs[mark] = sub_bufs
+        self.bufs[mark] = subgraph.buffers()
         ops = [x.op for x in outputs + loss + gradients + updates]
         s = tvm.te.create_schedule(ops)
         self.schedules[mark] = s
@@ -404,17 +474,12 @@ class PyTIRGraph(object):
             feature = self.subgraph_features[mark]
             if feature in self.scheduled_subgraphs:
                 continue
-            inputs = list(subgraph.inputs.keys())
             outputs = list(subgraph.outputs.keys())
-            weights = list(subgraph.weights.keys())
-            labels = list(subgraph.labels.keys())
             loss = list(subgraph.loss.keys())
             gradients = list(subgraph.gradients.keys())
-            lr = list(subgraph.lr.keys())
             updates = list(subgraph.updates.keys())
 
-            sub_bufs = list(set(inputs + labels + outputs + weights + loss + gradients + lr + updates))
-            self.bufs[mark] = sub_bufs
+            self.bufs[mark] = subgraph.buffers()
             ops = [x.op for x in outputs + loss + gradients + updates]
             s = tvm.te.create_schedule(ops)
             self.schedules[mark] = s
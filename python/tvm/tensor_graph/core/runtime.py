@@ -1,9 +1,14 @@
+import os
+import glob
 import tvm
 import time
 import _thread
 import queue
+from concurrent.futures import ThreadPoolExecutor
 
 from tvm import tg
+from .con_graph import split_training_graph
+from .utils import to_tuple
 
 
 """
@@ -104,7 +109,8 @@ class SingleGraphSession(object):
     execution_parallel=1,
     execution_timeout=100.0,
     synchronize_subgraph=True,
-    execution_log_file="execution_log.txt"):
+    execution_log_file="execution_log.txt",
+    module_store=None):
 
     self.sess_option = tg.create_session_option(
       report_profile,
@@ -130,6 +136,9 @@ class SingleGraphSession(object):
       execution_log_file
     )
 
+    if module_store is not None:
+      # best functions are loaded from the store in add_task
+      tg.use_module_store(module_store)
     self.sess_id = tg.create_session(target, dev_id, self.sess_option)
     self.tir_graph = tir_graph
     self.task_id = self._set_task(self.tir_graph)
@@ -166,3 +175,212 @@ class SingleGraphSession(object):
     if not self.test_only:
       self._end_tuning_for_task()
     tg.delete_session(self.sess_id)
+
+
+def get_numa_cpu_sets(num_sets):
+  """Split the usable cpus into num_sets groups, following NUMA nodes when possible.
+
+  Returns
+  -------
+  list of list of int
+  """
+  usable = sorted(os.sched_getaffinity(0))
+  nodes = []
+  for path in sorted(glob.glob("/sys/devices/system/node/node[0-9]*/cpulist")):
+    cpus = []
+    with open(path, "r") as fin:
+      for part in fin.read().strip().split(","):
+        if not part:
+          continue
+        if "-" in part:
+          beg, end = part.split("-")
+          cpus.extend(range(int(beg), int(end) + 1))
+        else:
+          cpus.append(int(part))
+    cpus = [x for x in cpus if x in usable]
+    if cpus:
+      nodes.append(cpus)
+  if len(nodes) >= num_sets:
+    # several nodes for one set
+    return [sum(nodes[i::num_sets], []) for i in range(num_sets)]
+  # several sets in one node, or no NUMA information
+  step = max(1, len(usable) // num_sets)
+  return [usable[i * step:(i + 1) * step] or usable for i in range(num_sets)]
+
+
+class DataParallelSession(object):
+  """Run a training graph data-parallel on several contexts.
+
+  The batch of inputs and labels is split across the shards, each shard
+  runs the gradient part of the graph with the same tuned functions,
+  the gradients are all-reduced (averaged), and then each shard applies
+  the optimizer so that the weights stay identical.
+
+  Parameters
+  ----------
+  tir_graph : TIRGraph
+      The training graph of one shard, i.e., its batch size is
+      the global batch size divided by len(dev_ids).
+
+  target : str
+
+  dev_ids : list of int
+      One shard per device.
+
+  reference_file : str
+      Schedule log of tuned functions, shared by all shards.
+
+  module_store : tg.ModuleStore
+      Optional, store of compiled functions shared by all shards.
+
+  pin_numa : bool
+      For CPU, pin the worker thread of each shard to its own NUMA node.
+
+  **kwargs
+      Other options for tg.create_session_option.
+  """
+  def __init__(
+    self,
+    tir_graph,
+    target="llvm",
+    dev_ids=(0,),
+    reference_file="",
+    module_store=None,
+    pin_numa=True,
+    **kwargs):
+    assert reference_file or module_store is not None, \
+      "Data parallel session runs tuned functions, provide reference_file or module_store."
+    self.tir_graph = tir_graph
+    self.dev_ids = list(dev_ids)
+    self.num_shards = len(self.dev_ids)
+    self.grad_graph, self.update_graph, self.grad_placeholders = split_training_graph(tir_graph)
+    self.batch_tensors = list(tir_graph.inputs) + list(tir_graph.labels)
+
+    is_cpu = tvm.target.Target(target).kind.name == "llvm"
+    cpu_sets = get_numa_cpu_sets(self.num_shards) if (pin_numa and is_cpu) else None
+    old_env = {}
+    if cpu_sets is not None:
+      # the runtime reads these when the sessions are created: let its workers
+      # inherit the affinity of the shard thread instead of binding all cpus,
+      # the values of the user are kept and the environment is restored later
+      for name, value in [("TVM_BIND_THREADS", "0"), ("TVM_NUM_THREADS", str(len(cpu_sets[0])))]:
+        old_env[name] = os.environ.get(name)
+        os.environ.setdefault(name, value)
+
+    if module_store is not None:
+      tg.use_module_store(module_store)
+    self.sess_option = tg.create_session_option(**kwargs)
+    self.sess_ids = []
+    self.grad_task_ids = []
+    self.update_task_ids = []
+    try:
+      for dev_id in self.dev_ids:
+        sess_id = tg.create_session(target, dev_id, self.sess_option)
+        self.sess_ids.append(sess_id)
+        self.grad_task_ids.append(tg.add_task(sess_id, self.grad_graph))
+        self.update_task_ids.append(tg.add_task(sess_id, self.update_graph))
+    finally:
+      for name, value in old_env.items():
+        if value is None:
+          os.environ.pop(name, None)
+        else:
+          os.environ[name] = value
+    for sess_id, grad_id, update_id in zip(self.sess_ids, self.grad_task_ids, self.update_task_ids):
+      if reference_file:
+        tg.test_schedule_reference(sess_id, grad_id, reference=reference_file)
+        tg.test_schedule_reference(sess_id, update_id, reference=reference_file)
+    self.ctxs = [tg.get_context_from_session(x) for x in self.sess_ids]
+
+    def make_pool(i):
+      if cpu_sets is None:
+        return ThreadPoolExecutor(max_workers=1)
+      return ThreadPoolExecutor(
+        max_workers=1, initializer=os.sched_setaffinity, initargs=(0, cpu_sets[i]))
+
+    # one single-thread pool per shard, so that the thread local
+    # runtime thread pool of each shard stays on its cpus
+    self.pools = [make_pool(i) for i in range(self.num_shards)]
+    self.reduced_gradients = [
+      [tvm.nd.empty(to_tuple(g.shape), g.dtype, ctx) for g in self.grad_placeholders]
+      for ctx in self.ctxs]
+
+  def get_context(self, shard=0):
+    return self.ctxs[shard]
+
+  def set_weights(self, weight_bindings):
+    """Initialize the weights of all shards with the same values.
+
+    Parameters
+    ----------
+    weight_bindings : list of tvm.runtime.NDArray or numpy.ndarray
+    """
+    for sess_id, ctx in zip(self.sess_ids, self.ctxs):
+      weights = [tvm.nd.array(w.asnumpy() if hasattr(w, "asnumpy") else w, ctx)
+                 for w in weight_bindings]
+      tg.initialize_weights(sess_id, self.grad_graph, weights)
+      tg.initialize_weights(sess_id, self.update_graph, weights)
+
+  def get_weights(self, shard=0):
+    return tg.get_data_from_session(self.sess_ids[shard], list(self.tir_graph.weights))
+
+  def _shard_bindings(self, bindings):
+    ret = [{} for _ in range(self.num_shards)]
+    for t, value in bindings.items():
+      value = value.asnumpy() if hasattr(value, "asnumpy") else value
+      if t in self.batch_tensors:
+        shard_size = int(t.shape[0])
+        assert value.shape[0] == shard_size * self.num_shards, \
+          "Expect batch %d for %s but get %d." % (
+            shard_size * self.num_shards, t.op.name, value.shape[0])
+        for i in range(self.num_shards):
+          ret[i][t] = tvm.nd.array(value[i * shard_size:(i + 1) * shard_size], self.ctxs[i])
+      else:
+        for i in range(self.num_shards):
+          ret[i][t] = tvm.nd.array(value, self.ctxs[i])
+    return ret
+
+  def _all_reduce(self):
+    grads = [
+      tg.get_data_from_session(sess_id, list(self.grad_graph.gradients))
+      for sess_id in self.sess_ids]
+    for j in range(len(self.grad_placeholders)):
+      reduced = grads[0][j].asnumpy()
+      for i in range(1, self.num_shards):
+        reduced += grads[i][j].asnumpy()
+      reduced /= self.num_shards
+      for i in range(self.num_shards):
+        self.reduced_gradients[i][j].copyfrom(reduced)
+
+  def _run_all(self, task_ids, shard_bindings):
+    futures = [
+      pool.submit(tg.run_task, sess_id, task_id, [bindings], save_to="")
+      for pool, sess_id, task_id, bindings in zip(
+        self.pools, self.sess_ids, task_ids, shard_bindings)]
+    for f in futures:
+      f.result()
+
+  def run(self, data_bindings):
+    """Run training iterations.
+
+    Parameters
+    ----------
+    data_bindings : list of dict of te.Tensor to NDArray
+        One dict per iteration, inputs and labels are of the global batch size.
+    """
+    for bindings in data_bindings:
+      shard_bindings = self._shard_bindings(bindings)
+      self._run_all(self.grad_task_ids, shard_bindings)
+      self._all_reduce()
+      update_bindings = []
+      for i in range(self.num_shards):
+        tmp = {p: g for p, g in zip(self.grad_placeholders, self.reduced_gradients[i])}
+        if self.tir_graph.lr is not None and self.tir_graph.lr in shard_bindings[i]:
+          tmp[self.tir_graph.lr] = shard_bindings[i][self.tir_graph.lr]
+        update_bindings.append(tmp)
+      self._run_all(self.update_task_ids, update_bindings)
+
+  def __del__(self):
+    for pool in self.pools:
+      pool.shutdown()
+    for sess_id in self.sess_ids:
+      tg.delete_session(sess_id)
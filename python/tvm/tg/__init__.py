@@ -5,5 +5,8 @@
 from .autodiff import gradient
 from .autodiff import expr_equal, grad_op
 from .graph import *
+from .partition import PartitionCostModel, CostDrivenPartitioner, \
+  get_cost_partition_mark, use_partition_mark
 from .auto_schedule import *
 from .runtime import *
+from .module_store import ModuleStore, use_module_store, populate_module_store
@@ -3,6 +3,9 @@ Author: size zheng
 """
 
 """Longtail related functions."""
+import hashlib
+from tvm import tir, te
+from tvm.ir import structural_hash
 from . import _ffi_api
 
 
@@ -158,7 +161,8 @@ def get_graph_mark(graph):
   return {x:y.value for x, y in ret.items()}
 
 
-def get_graph_partition_mark(graph, max_subgraph_size=100, max_minigraph_size=100):
+def get_graph_partition_mark(
+  graph, max_subgraph_size=100, max_minigraph_size=100, policy="size", **kwargs):
   """Get the partition marks of a graph.
 
     Parameters
@@ -169,10 +173,21 @@ def get_graph_partition_mark(graph, max_subgraph_size=100, max_minigraph_size=10
 
     max_minigraph_size : int
 
+    policy : str
+        "size": partition by the size caps.
+        "cost": search the cuts with a launch overhead plus memory traffic model,
+        the extra kwargs are passed to tg.get_cost_partition_mark.
+        The marks can be applied to make_tir_multi_graph by tg.use_partition_mark.
+
     Returns
     -------
     map from operation to mark (minigraph, subgraph)
   """
+  if policy == "cost":
+    from .partition import get_cost_partition_mark
+    return get_cost_partition_mark(graph, max_subgraph_size=max_subgraph_size, **kwargs)
+  elif policy != "size":
+    raise ValueError("Unknown partition policy: %s" % policy)
   ret = _ffi_api.get_graph_partition_mark(graph, max_subgraph_size, max_minigraph_size)
   return {x:[y.value for y in z] for x, z in ret.items()}
 
@@ -196,4 +211,184 @@ def flatten_tir_graph(ops, output_first=False):
 
 
 def get_graphs_from_tir_multi_graph(multi_graph):
-  return _ffi_api.get_graphs_from_tir_multi_graph(multi_graph)
\ No newline at end of file
+  return _ffi_api.get_graphs_from_tir_multi_graph(multi_graph)
+
+
+class SubGraphHasher(object):
+  """Canonical structural hasher for TIRGraph subgraphs.
+
+  The hash is invariant to the names of tensors, axis and variables,
+  and to the operand order of commutative operations (add, mul, min,
+  max, and, or, eq, ne). Placeholder tensors are identified by their
+  position in the argument list of the compiled function, so two graphs
+  with the same hash can share a schedule and a kernel.
+
+  Parameters
+  ----------
+  shape_abstract : bool
+      If True, concrete extents and shapes are replaced by their rank,
+      so graphs that only differ in shapes get the same hash.
+  """
+  _COMMUTATIVE = (tir.Add, tir.Mul, tir.Min, tir.Max, tir.EQ, tir.NE, tir.And, tir.Or)
+  _BINARY = (tir.Sub, tir.Div, tir.Mod, tir.FloorDiv, tir.FloorMod, tir.LT, tir.LE)
+  # a > b is hashed as b < a
+  _SWAPPED = {tir.GT: "LT", tir.GE: "LE"}
+
+  def __init__(self, shape_abstract=False):
+    self.shape_abstract = shape_abstract
+    self._args = {}
+    self._ops = set()
+    self._op_digests = {}
+
+  @staticmethod
+  def _digest(*items):
+    return hashlib.sha1("|".join(items).encode()).hexdigest()
+
+  def _extent(self, value):
+    if self.shape_abstract:
+      return "?"
+    if isinstance(value, tir.IntImm):
+      return str(value.value)
+    return self._expr(value, {})
+
+  def _shape(self, tensor):
+    if self.shape_abstract:
+      return "%s<%d>" % (tensor.dtype, len(tensor.shape))
+    return "%s[%s]" % (tensor.dtype, ",".join([self._extent(x) for x in tensor.shape]))
+
+  def _tensor(self, tensor):
+    position = str(self._args.get(tensor, -1))
+    if tensor.op in self._ops:
+      return self._digest(
+        "out", self._op(tensor.op), str(tensor.value_index), position)
+    return self._digest("arg", position, self._shape(tensor))
+
+  def _op(self, op):
+    if op in self._op_digests:
+      return self._op_digests[op]
+    if isinstance(op, te.ComputeOp):
+      var_map = {iv.var: "a%d" % i for i, iv in enumerate(op.axis)}
+      items = ["compute"]
+      items.extend([self._extent(iv.dom.extent) for iv in op.axis])
+      items.extend([self._expr(b, var_map) for b in op.body])
+    else:
+      items = [type(op).__name__]
+      items.extend([self._tensor(t) for t in op.input_tensors])
+    ret = self._digest(*items)
+    self._op_digests[op] = ret
+    return ret
+
+  def _reduce(self, expr, var_map):
+    local_map = dict(var_map)
+    items = ["reduce", str(expr.value_index)]
+    for i, iv in enumerate(expr.axis):
+      local_map[iv.var] = "r%d" % i
+      items.append(self._extent(iv.dom.min))
+      items.append(self._extent(iv.dom.extent))
+    combiner = expr.combiner
+    combiner_map = {v: "x%d" % i for i, v in enumerate(combiner.lhs)}
+    combiner_map.update({v: "y%d" % i for i, v in enumerate(combiner.rhs)})
+    items.extend([self._expr(x, combiner_map) for x in combiner.result])
+    items.extend([self._expr(x, combiner_map) for x in combiner.identity_element])
+    items.extend([self._expr(x, local_map) for x in expr.source])
+    items.append(self._expr(expr.condition, local_map))
+    return self._digest(*items)
+
+  def _expr(self, expr, var_map):
+    cls = type(expr)
+    if isinstance(expr, tir.ProducerLoad):
+      return self._digest(
+        "load", self._tensor(expr.producer), *[self._expr(x, var_map) for x in expr.indices])
+    if isinstance(expr, tir.Var):
+      if expr in var_map:
+        return var_map[expr]
+      # free variables, e.g. symbolic shapes
+      return "var:" + expr.dtype
+    if isinstance(expr, (tir.IntImm, tir.FloatImm)):
+      return "%s:%r" % (expr.dtype, expr.value)
+    if isinstance(expr, tir.StringImm):
+      return "str:" + expr.value
+    if isinstance(expr, self._COMMUTATIVE):
+      operands = sorted([self._expr(expr.a, var_map), self._expr(expr.b, var_map)])
+      return self._digest(cls.__name__, expr.dtype, *operands)
+    if isinstance(expr, self._BINARY):
+      return self._digest(
+        cls.__name__, expr.dtype, self._expr(expr.a, var_map), self._expr(expr.b, var_map))
+    if cls in self._SWAPPED:
+      return self._digest(
+        self._SWAPPED[cls], expr.dtype, self._expr(expr.b, var_map), self._expr(expr.a, var_map))
+    if isinstance(expr, tir.Cast):
+      return self._digest("cast", expr.dtype, self._expr(expr.value, var_map))
+    if isinstance(expr, tir.Not):
+      return self._digest("not", self._expr(expr.a, var_map))
+    if isinstance(expr, tir.Select):
+      return self._digest(
+        "select", self._expr(expr.condition, var_map),
+        self._expr(expr.true_value, var_map), self._expr(expr.false_value, var_map))
+    if isinstance(expr, tir.Call):
+      name = expr.op.name if hasattr(expr.op, "name") else expr.op.name_hint
+      return self._digest(
+        "call", name, expr.dtype, *[self._expr(x, var_map) for x in expr.args])
+    if isinstance(expr, tir.Let):
+      local_map = dict(var_map)
+      local_map[expr.var] = self._digest("let", self._expr(expr.value, var_map))
+      return self._expr(expr.body, local_map)
+    if isinstance(expr, tir.Reduce):
+      return self._reduce(expr, var_map)
+    # rare nodes in compute bodies, fall back to the generic structural hash
+    return "%s:%d" % (type(expr).__name__, structural_hash(expr, map_free_vars=True))
+
+  def hash(self, ops, args):
+    """Get the hash of a graph.
+
+    Parameters
+    ----------
+    ops : list of Operation
+        All the operations in the graph.
+
+    args : list of Tensor
+        The arguments of the compiled function, in order.
+
+    Returns
+    -------
+    str
+    """
+    self._args = {t: i for i, t in enumerate(args)}
+    self._ops = set(ops)
+    self._op_digests = {}
+    items = ["graph"]
+    items.extend([self._tensor(t) for t in args])
+    items.extend(sorted([self._op(op) for op in ops]))
+    return self._digest(*items)
+
+
+def subgraph_hash(graph, shape_abstract=False, args=None):
+  """Get the canonical structural hash of a subgraph.
+
+    Two subgraphs with the same hash compute the same function when
+    called with their arguments in order, so the hash can be used as
+    the key of schedule and kernel caches.
+
+    Parameters
+    ----------
+    graph : TIRGraph or list of Operation
+
+    shape_abstract : bool
+        Ignore the concrete shapes, only keep the ranks.
+
+    args : list of Tensor
+        The arguments of the compiled function.
+        Required when graph is a list of Operation,
+        defaults to graph.tensors for TIRGraph.
+
+    Returns
+    -------
+    str
+  """
+  if isinstance(graph, (list, tuple)):
+    assert args is not None, "Should provide the arguments for a list of operations."
+    ops = graph
+  else:
+    ops = list(graph.operation_list)
+    args = graph.tensors if args is None else args
+  return SubGraphHasher(shape_abstract).hash(ops, list(args))
@@ -0,0 +1,291 @@
+"""
+On-disk store of compiled subgraph functions.
+"""
+import os
+import json
+import time
+import hashlib
+import contextlib
+import tvm._ffi
+from tvm import target as _target
+from tvm.contrib import util
+from .graph import subgraph_hash, make_tir_multi_graph, get_graphs_from_tir_multi_graph
+from .auto_schedule import string_to_multi_schedule_entity, get_schedule_result_from_entity
+
+
+class ModuleStore(object):
+  """A directory of exported modules shared by tg Sessions.
+
+  Each entry is keyed by subgraph hash + schedule entity + target, so
+  structurally identical subgraphs of different models share the same
+  compiled function. The index is rewritten atomically under a file lock,
+  entries are evicted in least-recently-used order when the store exceeds
+  max_bytes. Queries only read the index and mark the use of an entry by
+  touching its module file.
+
+  Parameters
+  ----------
+  path : str
+    The directory of the store.
+
+  max_bytes : int
+    The max total size of stored modules.
+  """
+
+  INDEX = "index.json"
+  LOCK = "index.json.lock"
+
+  def __init__(self, path, max_bytes=2 * 1024 ** 3):
+    self.path = os.path.abspath(path)
+    self.max_bytes = max_bytes
+    os.makedirs(self.path, exist_ok=True)
+
+  @staticmethod
+  def make_key(graph_hash, entity, target):
+    return hashlib.sha1("|".join([graph_hash, entity, str(target)]).encode()).hexdigest()
+
+  def _load_index(self):
+    index_file = os.path.join(self.path, self.INDEX)
+    if not os.path.isfile(index_file):
+      return {}
+    try:
+      with open(index_file, "r") as fin:
+        return json.load(fin)
+    except ValueError:
+      return {}
+
+  @contextlib.contextmanager
+  def _lock(self):
+    """Serialize the read-modify-write of the index across processes."""
+    lock = util.filelock(os.path.join(self.path, self.LOCK))
+    try:
+      yield
+    finally:
+      lock.release()
+
+  def _last_use(self, item):
+    try:
+      mtime = os.path.getmtime(os.path.join(self.path, item["file"]))
+    except OSError:
+      mtime = 0.0
+    return max(item["last_use"], mtime)
+
+  def _dump_index(self, index):
+    tmp_file = os.path.join(self.path, "%s.%d.tmp" % (self.INDEX, os.getpid()))
+    with open(tmp_file, "w") as fout:
+      json.dump(index, fout)
+    os.replace(tmp_file, os.path.join(self.path, self.INDEX))
+
+  def total_bytes(self):
+    return sum([item["size"] for item in self._load_index().values()])
+
+  def __len__(self):
+    return len(self._load_index())
+
+  def query(self, subgraph, target):
+    """Get the best stored entry of a subgraph.
+
+    Parameters
+    ----------
+    subgraph : TIRGraph
+
+    target : str or Target
+
+    Returns
+    -------
+    dict or None
+      With keys entity, func_name, perf, time, file.
+    """
+    graph_hash = subgraph_hash(subgraph)
+    target = str(target)
+    index = self._load_index()
+    best_key = None
+    for key, item in index.items():
+      if item["hash"] != graph_hash or item["target"] != target:
+        continue
+      if not os.path.isfile(os.path.join(self.path, item["file"])):
+        continue
+      if best_key is None or item["perf"] > index[best_key]["perf"]:
+        best_key = key
+    if best_key is None:
+      return None
+    ret = dict(index[best_key])
+    ret["file"] = os.path.join(self.path, ret["file"])
+    try:
+      # the use time for eviction, without writing the index
+      os.utime(ret["file"])
+    except OSError:
+      pass
+    return ret
+
+  def save(self, subgraph, target, entity, module, func_name, perf, elapsed_time):
+    """Export one compiled function into the store.
+
+    Parameters
+    ----------
+    subgraph : TIRGraph
+
+    target : str or Target
+
+    entity : str
+      The schedule entity string.
+
+    module : tvm.runtime.Module
+
+    func_name : str
+      The function name in the module.
+
+    perf : float
+      in GFLOPS
+
+    elapsed_time : float
+      in ms
+
+    Returns
+    -------
+    bool
+      Whether the module is stored.
+    """
+    graph_hash = subgraph_hash(subgraph)
+    target = str(target)
+    key = self.make_key(graph_hash, entity, target)
+    if key in self._load_index():
+      return False
+    file_name = key + ".so"
+    # export outside the lock, to a file of this process
+    tmp_file = os.path.join(self.path, "%s.%d.tmp.so" % (key, os.getpid()))
+    module.export_library(tmp_file)
+    with self._lock():
+      # reload, other processes may have updated the index during export
+      index = self._load_index()
+      if key in index:
+        os.remove(tmp_file)
+        return False
+      os.replace(tmp_file, os.path.join(self.path, file_name))
+      index[key] = {
+        "hash": graph_hash,
+        "target": target,
+        "entity": entity,
+        "func_name": func_name,
+        "perf": float(perf),
+        "time": float(elapsed_time),
+        "file": file_name,
+        "size": os.path.getsize(os.path.join(self.path, file_name)),
+        "last_use": time.time(),
+      }
+      self._evict(index, keep=key)
+      self._dump_index(index)
+    return True
+
+  def _evict(self, index, keep=None):
+    total = sum([item["size"] for item in index.values()])
+    for key in sorted(index.keys(), key=lambda k: self._last_use(index[k])):
+      if total <= self.max_bytes:
+        break
+      if key == keep:
+        continue
+      total -= index[key]["size"]
+      try:
+        os.remove(os.path.join(self.path, index[key]["file"]))
+      except OSError:
+        pass
+      del index[key]
+
+  def evict(self):
+    """Evict the least recently used entries until the store fits in max_bytes."""
+    with self._lock():
+      index = self._load_index()
+      self._evict(index)
+      self._dump_index(index)
+
+
+def use_module_store(store):
+  """Make tg Sessions load best functions from the store at add_task
+  and save their best functions to it.
+
+  Parameters
+  ----------
+  store : ModuleStore or None
+    None to disable the store.
+  """
+  if store is None:
+    def query(subgraph, target):
+      return []
+
+    def save(subgraph, target, entity, module, func_name, perf, elapsed_time):
+      return False
+
+  else:
+    def query(subgraph, target):
+      item = store.query(subgraph, target)
+      if item is None:
+        return []
+      return [
+        item["entity"],
+        item["func_name"],
+        str(item["perf"]),
+        str(item["time"]),
+        item["file"],
+      ]
+
+    def save(subgraph, target, entity, module, func_name, perf, elapsed_time):
+      return store.save(subgraph, target, entity, module, func_name, perf, elapsed_time)
+
+  tvm._ffi.register_func("tg.runtime.module_store_query", query, True)
+  tvm._ffi.register_func("tg.runtime.module_store_save", save, True)
+
+
+def populate_module_store(store, tir_graph, reference, target, target_host="llvm"):
+  """Compile the schedules of a schedule log into the store
+  so that later Sessions skip the compilation.
+
+  Parameters
+  ----------
+  store : ModuleStore
+
+  tir_graph : TIRGraph
+
+  reference : str
+    The schedule log saved by Session, lines of tag|entity|perf|time.
+
+  target : str or Target
+
+  target_host : str
+
+  Returns
+  -------
+  int
+    The number of newly stored functions.
+  """
+  target = _target.Target(target)
+  records = {}
+  with open(reference, "r") as fin:
+    for line in fin:
+      parts = line.strip().split("|")
+      if len(parts) >= 4:
+        records[parts[0]] = (parts[1], float(parts[2]), float(parts[3]))
+
+  multi_graph = make_tir_multi_graph(tir_graph)
+  count = 0
+  visited = set()
+  for key, subgraph in get_graphs_from_tir_multi_graph(multi_graph).items():
+    if subgraph.tag not in records:
+      continue
+    entity_string, perf, elapsed_time = records[subgraph.tag]
+    graph_hash = subgraph_hash(subgraph)
+    if (graph_hash, entity_string) in visited:
+      continue
+    visited.add((graph_hash, entity_string))
+    try:
+      entity = string_to_multi_schedule_entity(entity_string)
+    except tvm.TVMError:
+      # external schedules are not reproducible here
+      continue
+    name = "subgraph_%d" % key.value
+    result = get_schedule_result_from_entity(name, subgraph, target, entity)
+    module = tvm.build(
+      result.schedule, result.tensors, target, target_host=target_host, name=name
+    )
+    if store.save(subgraph, target, entity_string, module, name, perf, elapsed_time):
+      count += 1
+  return count
@@ -0,0 +1,320 @@
+"""
+Cost-driven graph partition.
+"""
+import heapq
+import tvm._ffi
+from tvm import te
+from tvm.runtime import DataType
+from . import _ffi_api
+
+
+def _tensor_bytes(tensor):
+  size = 1
+  for s in tensor.shape:
+    size *= int(s)
+  dtype = DataType(tensor.dtype)
+  return size * ((dtype.bits * dtype.lanes + 7) // 8)
+
+
+def _root_ops(graph):
+  if hasattr(graph, "root_ops"):
+    # TIRGraph
+    return list(graph.root_ops)
+  # Graph with subgraphs
+  ret = []
+  for subgraph in graph.subgraphs.values():
+    for part in [subgraph.outputs, subgraph.loss, subgraph.gradients,
+                 subgraph.updates, subgraph.state_outputs]:
+      ret.extend([t.op for t in part])
+  return ret
+
+
+class PartitionCostModel(object):
+  """Analytical latency model of one subgraph.
+
+  The latency of a subgraph is estimated as
+  launch_overhead + max(gflop / peak_gflops, bytes / bandwidth),
+  where bytes counts the tensors read from and written to global memory.
+
+  Parameters
+  ----------
+  launch_overhead : float
+      Kernel launch overhead in ms.
+
+  peak_gflops : float
+      Peak compute throughput in GFLOP/s.
+
+  bandwidth : float
+      Global memory bandwidth in GB/s.
+  """
+  def __init__(self, launch_overhead=5e-3, peak_gflops=10000.0, bandwidth=500.0):
+    self.launch_overhead = launch_overhead
+    self.peak_gflops = peak_gflops
+    self.bandwidth = bandwidth
+    self._gflop = {}
+
+  def gflop(self, op):
+    if op not in self._gflop:
+      self._gflop[op] = _ffi_api.get_gflop(op) if isinstance(op, te.ComputeOp) else 0.0
+    return self._gflop[op]
+
+  def cost(self, ops, read_tensors, write_tensors):
+    """Estimate the latency of one subgraph.
+
+    Parameters
+    ----------
+    ops : set of Operation
+        The operations in the subgraph.
+
+    read_tensors : set of Tensor
+        The tensors read from global memory.
+
+    write_tensors : set of Tensor
+        The tensors written to global memory.
+
+    Returns
+    -------
+    float
+        latency in ms
+    """
+    gflop = sum([self.gflop(op) for op in ops])
+    gbytes = (sum([_tensor_bytes(t) for t in read_tensors])
+              + sum([_tensor_bytes(t) for t in write_tensors])) / 1e9
+    return self.launch_overhead + max(gflop / self.peak_gflops, gbytes / self.bandwidth) * 1e3
+
+
+class CostDrivenPartitioner(object):
+  """Partition a graph by greedily fusing the subgraph pairs
+  that reduce the estimated latency most.
+
+  Parameters
+  ----------
+  cost_model : PartitionCostModel
+
+  max_subgraph_size : int
+      The max number of operations in one subgraph.
+
+  measure_func : callable
+      Optional, measure_func(list of Operation) returns the measured
+      latency (ms) of one subgraph. Used to refine the result of the
+      cost model.
+
+  measure_trials : int
+      How many candidate cuts to refine with measure_func.
+  """
+  def __init__(self, cost_model=None, max_subgraph_size=100, measure_func=None, measure_trials=20):
+    self.cost_model = PartitionCostModel() if cost_model is None else cost_model
+    self.max_subgraph_size = max_subgraph_size
+    self.measure_func = measure_func
+    self.measure_trials = measure_trials
+    self._measured = {}
+
+  def _prepare(self, root_ops):
+    self.root_ops = set(root_ops)
+    self.op_list = []
+    self.consumers = {}
+    visited = set()
+    for root in root_ops:
+      # iterative post-order dfs
+      stack = [(root, False)]
+      while stack:
+        op, expanded = stack.pop()
+        if expanded:
+          self.op_list.append(op)
+          continue
+        if op in visited or not isinstance(op, te.ComputeOp):
+          continue
+        visited.add(op)
+        stack.append((op, True))
+        for t in op.input_tensors:
+          self.consumers.setdefault(t, []).append(op)
+          stack.append((t.op, False))
+    self.compute_ops = set(self.op_list)
+    self.num_consumer_ops = {}
+    for op in self.op_list:
+      self.num_consumer_ops[op] = len(set(
+        [c for i in range(op.num_outputs) for c in self.consumers.get(op.output(i), [])]))
+
+  def _group_cost(self, ops):
+    reads = set()
+    writes = set()
+    for op in ops:
+      for t in op.input_tensors:
+        if t.op not in ops:
+          reads.add(t)
+      for i in range(op.num_outputs):
+        t = op.output(i)
+        if op in self.root_ops or any([c not in ops for c in self.consumers.get(t, [])]):
+          writes.add(t)
+    return self.cost_model.cost(ops, reads, writes)
+
+  def _successors(self, gid):
+    ret = set()
+    for op in self.groups[gid]:
+      for i in range(op.num_outputs):
+        for c in self.consumers.get(op.output(i), []):
+          if self.group_of[c] != gid:
+            ret.add(self.group_of[c])
+    return ret
+
+  def _fusible(self, src, dst):
+    ops = self.groups[src] | self.groups[dst]
+    if len(ops) > self.max_subgraph_size:
+      return False
+    # do not fuse reductive nodes
+    if len([op for op in ops if op.reduce_axis]) > 1:
+      return False
+    # root op must be separated, do not fuse multi-consumer op
+    for op in self.groups[src]:
+      for i in range(op.num_outputs):
+        if any([self.group_of[c] == dst for c in self.consumers.get(op.output(i), [])]):
+          if op in self.root_ops or self.num_consumer_ops[op] > 1:
+            return False
+    # merging must not create a cycle between subgraphs
+    stack = [x for x in self._successors(src) if x != dst]
+    visited = set(stack)
+    while stack:
+      cur = stack.pop()
+      if cur == dst:
+        return False
+      for nxt in self._successors(cur):
+        if nxt not in visited:
+          visited.add(nxt)
+          stack.append(nxt)
+    return True
+
+  def _delta(self, src, dst, cost_func):
+    return cost_func(self.groups[src] | self.groups[dst]) \
+      - cost_func(self.groups[src]) - cost_func(self.groups[dst])
+
+  def _measure(self, ops):
+    key = frozenset(ops)
+    if key not in self._measured:
+      self._measured[key] = self.measure_func([op for op in self.op_list if op in ops])
+    return self._measured[key]
+
+  def _merge(self, src, dst):
+    for op in self.groups[dst]:
+      self.group_of[op] = src
+    self.groups[src] = self.groups[src] | self.groups.pop(dst)
+    self.version[src] += 1
+
+  def _candidates(self, gid):
+    ret = set()
+    for succ in self._successors(gid):
+      ret.add((gid, succ))
+    for op in self.groups[gid]:
+      for t in op.input_tensors:
+        if t.op in self.compute_ops and self.group_of[t.op] != gid:
+          ret.add((self.group_of[t.op], gid))
+    return ret
+
+  def partition(self, root_ops):
+    """Partition the graph reachable from root_ops.
+
+    Parameters
+    ----------
+    root_ops : list of Operation
+
+    Returns
+    -------
+    dict of Operation to int
+        The subgraph mark of each compute operation,
+        marks are numbered in topological order.
+    """
+    self._prepare(root_ops)
+    self.group_of = {op: i for i, op in enumerate(self.op_list)}
+    self.groups = {i: frozenset([op]) for i, op in enumerate(self.op_list)}
+    self.version = {i: 0 for i in self.groups}
+
+    def push(heap, src, dst):
+      delta = self._delta(src, dst, self._group_cost)
+      heapq.heappush(heap, (delta, src, dst, self.version[src], self.version[dst]))
+
+    heap = []
+    for gid in list(self.groups.keys()):
+      for succ in self._successors(gid):
+        push(heap, gid, succ)
+    while heap:
+      delta, src, dst, ver_src, ver_dst = heapq.heappop(heap)
+      if delta >= 0:
+        break
+      if src not in self.groups or dst not in self.groups:
+        continue
+      if self.version[src] != ver_src or self.version[dst] != ver_dst:
+        continue
+      if not self._fusible(src, dst):
+        continue
+      self._merge(src, dst)
+      for (a, b) in self._candidates(src):
+        push(heap, a, b)
+
+    if self.measure_func is not None:
+      self._refine()
+
+    marks = {}
+    for op in self.op_list:
+      gid = self.group_of[op]
+      if gid not in marks:
+        marks[gid] = len(marks)
+    return {op: marks[self.group_of[op]] for op in self.op_list}
+
+  def _refine(self):
+    candidates = set()
+    for gid in self.groups:
+      candidates.update(self._candidates(gid))
+    candidates = sorted(
+      [(self._delta(src, dst, self._group_cost), src, dst) for (src, dst) in candidates])
+    for _, src, dst in candidates[:self.measure_trials]:
+      if src not in self.groups or dst not in self.groups:
+        continue
+      if not self._fusible(src, dst):
+        continue
+      if self._delta(src, dst, self._measure) < 0:
+        self._merge(src, dst)
+
+
+def get_cost_partition_mark(graph, max_subgraph_size=100, cost_model=None,
+                            measure_func=None, measure_trials=20):
+  """Get the partition marks of a graph by the cost-driven partitioner.
+
+    Parameters
+    ----------
+    graph : TIRGraph or Graph
+
+    max_subgraph_size : int
+
+    cost_model : PartitionCostModel
+
+    measure_func : callable
+        Optional, measure_func(list of Operation) returns latency in ms.
+
+    measure_trials : int
+
+    Returns
+    -------
+    map from operation to mark (minigraph, subgraph)
+  """
+  partitioner = CostDrivenPartitioner(
+    cost_model, max_subgraph_size, measure_func=measure_func, measure_trials=measure_trials)
+  ret = partitioner.partition(_root_ops(graph))
+  return {x: [y, y] for x, y in ret.items()}
+
+
+def use_partition_mark(marks):
+  """Make make_tir_multi_graph follow the given partition marks.
+
+    This overrides tg.graph.partition_policy, use
+    tensor_graph.core.set_partition_policy(tensor_graph.core.partition_policy)
+    to restore the default one.
+
+    Parameters
+    ----------
+    marks : map from operation to mark (minigraph, subgraph)
+  """
+  def policy(graph, pre, post, number):
+    if pre not in marks or post not in marks:
+      return True
+    return marks[pre][-1] != marks[post][-1]
+
+  tvm._ffi.register_func("tg.graph.partition_policy", policy, True)
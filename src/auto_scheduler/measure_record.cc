@@ -259,8 +259,14 @@ void ReadMeasureRecord(const std::string& str, MeasureInputNode* inp, MeasureRes
 
 void RecordToFileNode::Callback(const SearchPolicy& policy, const Array<MeasureInput>& inputs,
                                 const Array<MeasureResult>& results) {
-  std::ofstream ofs(filename, std::ofstream::app);
-  WriteMeasureRecords(&ofs, inputs, results);
+  {
+    std::ofstream ofs(filename, std::ofstream::app);
+    WriteMeasureRecords(&ofs, inputs, results);
+  }
+  // Let the record indices opened on this file catch up with the appended records
+  if (const auto* f = runtime::Registry::Get("auto_scheduler.record_index.on_append")) {
+    (*f)(filename);
+  }
 }
 
 RecordReader::RecordReader(String filename) {
@@ -335,6 +341,30 @@ TVM_REGISTER_GLOBAL("auto_scheduler.RecordReaderReadNext").set_body_typed([](Rec
   }
 });
 
+TVM_REGISTER_GLOBAL("auto_scheduler.ReadMeasureRecord").set_body_typed([](const String& str) {
+  auto inp = make_object<MeasureInputNode>();
+  auto res = make_object<MeasureResultNode>();
+  std::string log_version;
+  ReadMeasureRecord(str, inp.get(), res.get(), &log_version);
+  return Array<ObjectRef>{ObjectRef(inp), ObjectRef(res)};
+});
+
+TVM_REGISTER_GLOBAL("auto_scheduler.SerializeMeasureInput")
+    .set_body_typed([](const MeasureInput& input) {
+      std::ostringstream os;
+      dmlc::JSONWriter writer(&os);
+      writer.Write(*input.operator->());
+      return os.str();
+    });
+
+TVM_REGISTER_GLOBAL("auto_scheduler.DeserializeMeasureInput").set_body_typed([](String json) {
+  std::istringstream ss(json);
+  dmlc::JSONReader reader(&ss);
+  auto inp = make_object<MeasureInputNode>();
+  reader.Read(inp.get());
+  return ObjectRef(inp);
+});
+
 TVM_REGISTER_GLOBAL("auto_scheduler.SaveRecords")
     .set_body_typed([](String filename, Array<MeasureInput> in, Array<MeasureResult> res) {
       std::ofstream ofs(filename, std::ofstream::app);
@@ -84,6 +84,22 @@ State EmptyPolicyNode::Search(int num_measure_trials, int early_stopping,
   }
 }
 
+std::pair<Array<MeasureInput>, Array<MeasureResult>> EmptyPolicyNode::ContinueSearchOneRound(
+    int num_measure, ProgramMeasurer measurer) {
+  Array<MeasureInput> inputs;
+  Array<MeasureResult> results;
+
+  for (const auto& state : SearchOneRound()) {
+    if (static_cast<int>(inputs.size()) >= num_measure) {
+      break;
+    }
+    inputs.push_back(MeasureInput(search_task, state));
+  }
+  measurer->Measure(search_task, GetRef<SearchPolicy>(this), inputs, &results);
+
+  return std::make_pair(std::move(inputs), std::move(results));
+}
+
 // As an example policy, EmptyPolicy always returns a init state
 Array<State> EmptyPolicyNode::SearchOneRound() {
   Array<State> res;
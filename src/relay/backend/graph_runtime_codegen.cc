@@ -400,6 +400,13 @@ class GraphRuntimeCodegen : public backend::MemoizedExprTranslator<std::vector<G
       }
       target = targets_[call_dev_type];
     }
+    // Kernels from the persistent kernel cache are linked into the module by relay.build
+    if (const auto* f = runtime::Registry::Get("relay.backend.kernel_cache.lower")) {
+      std::string cached_name = (*f)(func, target);
+      if (!cached_name.empty()) {
+        return GraphAddCallNode(op, _GetUniqueName(cached_name), cached_name);
+      }
+    }
     CCacheKey key = (*pf0)(func, target);
     CachedFunc lowered_func = (*pf1)(compile_engine_, key);
     if (!lowered_funcs_.count(target->str())) {
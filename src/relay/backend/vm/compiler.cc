@@ -64,6 +64,8 @@ Pass ManifestAlloc(Target target_host, vm::TargetsMap targets) {
   return (*f)(target_host, targets);
 }
 
+TVM_REGISTER_PASS_CONFIG_OPTION("relay.MemoryPlan.reuse", Bool);
+
 Pass MemoryPlan() {
   auto f = tvm::runtime::Registry::Get("relay.transform.MemoryPlan");
   CHECK(f != nullptr) << "unable to load the memory planning pass";
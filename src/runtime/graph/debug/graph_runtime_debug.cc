@@ -74,15 +74,7 @@ class GraphRuntimeDebug : public GraphRuntime {
         for (int k = 0; k < number; k++) {
           for (size_t index = 0; index < op_execs_.size(); ++index) {
             if (op_execs_[index]) {
-              const TVMContext& ctx = data_entry_[entry_id(index, 0)]->ctx;
-              auto op_tbegin = std::chrono::high_resolution_clock::now();
-              op_execs_[index]();
-              TVMSynchronize(ctx.device_type, ctx.device_id, nullptr);
-              auto op_tend = std::chrono::high_resolution_clock::now();
-              double op_duration =
-                  std::chrono::duration_cast<std::chrono::duration<double> >(op_tend - op_tbegin)
-                      .count();
-              time_per_op[index] += op_duration * 1e6;  // us
+              time_per_op[index] += RunOpTimed(index) * 1e6;  // us
             }
           }
         }
@@ -108,6 +100,36 @@ class GraphRuntimeDebug : public GraphRuntime {
     return os.str();
   }
 
+  /*!
+   * \brief Run one operation and wait for it to complete.
+   * \param index The index of the op.
+   * \return The elapsed time in seconds.
+   */
+  double RunOpTimed(size_t index) {
+    const TVMContext& ctx = data_entry_[entry_id(index, 0)]->ctx;
+    auto op_tbegin = std::chrono::high_resolution_clock::now();
+    op_execs_[index]();
+    TVMSynchronize(ctx.device_type, ctx.device_id, nullptr);
+    auto op_tend = std::chrono::high_resolution_clock::now();
+    return std::chrono::duration_cast<std::chrono::duration<double> >(op_tend - op_tbegin).count();
+  }
+
+  /*!
+   * \brief Run the graph once and get the time per op.
+   *
+   *  Unlike RunIndividual, there is neither warmup nor repetition, so that sampled
+   *  runs of a running model can use it in place of Run.
+   * \return Comma seperated string containing the elapsed time per op in microseconds.
+   */
+  std::string RunProfile() {
+    std::ostringstream os;
+    for (size_t index = 0; index < op_execs_.size(); ++index) {
+      double op_duration = op_execs_[index] ? RunOpTimed(index) : 0.0;
+      os << op_duration * 1e6 << ",";
+    }
+    return os.str();
+  }
+
   /*!
    * \brief Run each operation and get the output.
    * \param index The index of op which needs to be returned.
@@ -190,6 +212,9 @@ PackedFunc GraphRuntimeDebug::GetFunction(const std::string& name,
       CHECK_GE(min_repeat_ms, 0);
       *rv = this->RunIndividual(number, repeat, min_repeat_ms);
     });
+  } else if (name == "run_profile") {
+    return PackedFunc(
+        [sptr_to_self, this](TVMArgs args, TVMRetValue* rv) { *rv = this->RunProfile(); });
   } else {
     return GraphRuntime::GetFunction(name, sptr_to_self);
   }
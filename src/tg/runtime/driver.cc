@@ -1098,10 +1098,86 @@ int Session::add_task(TIRGraph graph) {
   }
 
   static_call_order[task_id] = order;
+
+  load_from_module_store(task_id);
   return task_id;
 }
 
 
+void Session::load_from_module_store(int task_id) {
+  // the store is optional, see tg.use_module_store
+  const auto* query = runtime::Registry::Get("tg.runtime.module_store_query");
+  if (query == nullptr) {
+    return;
+  }
+  ASSERT(task_cache.find(task_id) != task_cache.end()) << "No such task " << task_id << "\n";
+  TIRMultiGraph multi_graph = task_cache[task_id];
+
+  int num_hits = 0;
+  bool has_miss = false;
+  for (auto kv : multi_graph.Self()->graphs) {
+    Array<String> item = (*query)(kv.second, target);
+    if (item.size() < 5U) {
+      has_miss = true;
+      continue;
+    }
+    try {
+      ScheduleResult schedule_result;
+      try {
+        MultiScheduleEntity entity = multi_schedule_entity_from_string(item[0]);
+        schedule_result = auto_scheduler->schedule_with_entity(kv.second, target, entity);
+      } catch (...) {
+        schedule_result = auto_scheduler->schedule_with_external(kv.second, target, item[0]);
+      }
+      runtime::Module module = runtime::Module::LoadFromFile(item[4]);
+      runtime::PackedFunc func = module->GetFunction(item[1]);
+      ASSERT(func != nullptr) << "Can't find function " << item[1] << " in " << item[4] << ".\n";
+      double perf = std::stod(item[2]);
+      double time = std::stod(item[3]);
+      best_functions[kv.first].push(std::make_tuple(schedule_result, module, func, perf, time));
+      auto_scheduler->feedback_for(kv.first, kv.second, target, schedule_result, perf);
+      num_hits += 1;
+    } catch (...) {
+      print(1) << "Can't load stored function for subgraph with tag:\n" << kv.second->tag << "\n";
+      has_miss = true;
+    }
+  }
+  print(1) << "Loaded " << num_hits << " of " << multi_graph->graphs.size()
+           << " subgraph functions from module store.\n";
+  if (!has_miss) {
+    cached_all_functions[task_id] = true;
+  }
+}
+
+
+void Session::save_to_module_store(int task_id) {
+  const auto* save = runtime::Registry::Get("tg.runtime.module_store_save");
+  if (save == nullptr) {
+    return;
+  }
+  ASSERT(task_cache.find(task_id) != task_cache.end()) << "No such task " << task_id << "\n";
+  TIRMultiGraph multi_graph = task_cache[task_id];
+
+  for (auto kv : multi_graph.Self()->graphs) {
+    if (best_functions.find(kv.first) == best_functions.end() || best_functions[kv.first].empty()) {
+      continue;
+    }
+    auto sch_mod_func_perf_time = best_functions[kv.first].front();
+    auto schedule_result = std::get<0>(sch_mod_func_perf_time);
+    std::string entity_string = "";
+    if (schedule_result->schedule_entities.defined()) {
+      entity_string = schedule_result->schedule_entities.to_string();
+    } else {
+      entity_string = schedule_result->external_schedule;
+    }
+    // the store skips the entries it already has
+    (*save)(kv.second, target, entity_string, std::get<1>(sch_mod_func_perf_time),
+            get_func_name(kv.first), std::get<3>(sch_mod_func_perf_time),
+            std::get<4>(sch_mod_func_perf_time));
+  }
+}
+
+
 void Session::prepare_for_test(int task_id, std::string reference) {
   // load reference
   // this will add additional schedule results
@@ -1114,6 +1190,10 @@ void Session::prepare_for_test(int task_id, std::string reference) {
   ASSERT(task_cache.find(task_id) != task_cache.end()) << "No such task " << task_id << "\n";
   TIRMultiGraph multi_graph = task_cache[task_id];
   for (auto kv : multi_graph.Self()->graphs) {
+    // functions loaded from module store need no rebuild
+    if (best_functions.find(kv.first) != best_functions.end() && !best_functions[kv.first].empty()) {
+      continue;
+    }
     need_functions[kv.second->tag] = kv.first;
   }
 
@@ -1221,6 +1301,9 @@ void Session::prepare_for_test(int task_id, std::string reference) {
   /* load the fuctions */
   bool has_miss = false;
   for (auto kv : multi_graph.Self()->graphs) {
+    if (best_functions.find(kv.first) != best_functions.end() && !best_functions[kv.first].empty()) {
+      continue;
+    }
     if (target_subgraph_functions.find(kv.second->tag) != target_subgraph_functions.end()) {
       auto sch_mod_func_perf_time = target_subgraph_functions[kv.second->tag].get();
       best_functions[kv.first].push(sch_mod_func_perf_time);
@@ -1231,6 +1314,7 @@ void Session::prepare_for_test(int task_id, std::string reference) {
     }
   }
   cached_all_functions[task_id] = !has_miss;
+  save_to_module_store(task_id);
 }
 
 
@@ -1354,6 +1438,8 @@ void Session::end_tuning(int task_id) {
     this->evaluate_threads[task_id].join();
     this->evaluate_threads.erase(task_id);
   }
+
+  save_to_module_store(task_id);
 }
 
 
@@ -185,6 +185,8 @@ class Session {
     bool no_actual_run=false);
   
   int add_task(TIRGraph graph);
+  void load_from_module_store(int task_id);
+  void save_to_module_store(int task_id);
   void begin_tuning(int task_id, int advance_number, std::string reference="",
     int first_stage_number=100, double second_stage_topk_ratio=0.1);
   void end_tuning(int task_id);
@@ -0,0 +1,131 @@
+import math
+
+import tvm
+from tvm.auto_tensorize.search import measure
+
+
+class FakeTimeEvaluator(object):
+    """Return the listed costs of each call in turn and record the calls"""
+
+    def __init__(self, calls, results):
+        self.calls = calls
+        self.results = list(results)
+
+    def __call__(self, *args):
+        self.calls.append(self)
+        return tvm.runtime.module.ProfileResult(
+            mean=0.0, results=self.results.pop(0) if self.results else [1.0]
+        )
+
+
+class FakeFunc(object):
+    """A module whose first time_evaluator does the quick runs"""
+
+    def __init__(self, quick_results, results):
+        self.calls = []
+        self.evaluators = []
+        self.quick_results = quick_results
+        self.results = results
+
+    def time_evaluator(self, name, ctx, number, repeat, min_repeat_ms):
+        results = self.results if self.evaluators else self.quick_results
+        self.evaluators.append((name, number, repeat, min_repeat_ms))
+        return FakeTimeEvaluator(self.calls, results)
+
+
+def adaptive_inputs(best_cost=None, quick_runs=3, target_rel_ci=0.02, max_repeat=20):
+    measure_opt = measure.MeasureOptions(
+        adaptive=True,
+        adaptive_quick_runs=quick_runs,
+        adaptive_target_rel_ci=target_rel_ci,
+        adaptive_max_repeat=max_repeat,
+    )
+    return measure.get_adaptive_inputs(measure_opt, best_cost)
+
+
+def run_adaptive(func, number=100, min_repeat_ms=150, **kwargs):
+    inputs = adaptive_inputs(**kwargs)
+    costs = measure.adaptive_time_evaluate(
+        func, "main", tvm.cpu(), [], number, min_repeat_ms, *inputs
+    )
+    return costs, inputs[-1].value
+
+
+def test_get_measure_statistics():
+    # a single sample has no confidence interval
+    assert measure.get_measure_statistics([2.0]) == (1, 2.0, 0.0, float("inf"))
+    assert measure.get_measure_statistics([0.0, 0.0])[3] == float("inf")
+
+    # one degree of freedom
+    samples, mean, variance, rel_ci = measure.get_measure_statistics([1.0, 3.0])
+    assert (samples, mean, variance) == (2, 2.0, 2.0)
+    assert math.isclose(rel_ci, 12.706 * math.sqrt(2.0 / 2) / 2.0)
+
+    # the degrees of freedom between tabulated ones take the next smaller one
+    for num, quantile in [(11, 2.228), (13, 2.228), (21, 2.086), (40, 2.042)]:
+        costs = [1.0 + (i % 2) for i in range(num)]
+        samples, mean, variance, rel_ci = measure.get_measure_statistics(costs)
+        assert samples == num
+        assert math.isclose(rel_ci, quantile * math.sqrt(variance / num) / mean)
+
+    # constant samples
+    assert measure.get_measure_statistics([tvm.tir.const(1.5)] * 3) == (3, 1.5, 0.0, 0.0)
+
+
+def test_get_adaptive_inputs():
+    assert measure.get_adaptive_inputs(measure.MeasureOptions(), 1.0) is None
+    quick_runs, target_rel_ci, max_repeat, shared_best = adaptive_inputs(
+        quick_runs=4, target_rel_ci=0.05, max_repeat=8
+    )
+    assert (quick_runs, target_rel_ci, max_repeat) == (4, 0.05, 8)
+    assert shared_best.value == measure.MAX_FLOAT
+    assert adaptive_inputs(best_cost=0.5)[-1].value == 0.5
+
+
+def test_adaptive_time_evaluate_target_ci():
+    func = FakeFunc([[1.0, 1.2, 0.8]], [[1.0], [1.01], [0.99], [1.0], [2.0]])
+    costs, best = run_adaptive(func, target_rel_ci=0.02)
+    assert func.evaluators == [("main", 10, 3, 0), ("main", 100, 1, 150)]
+    # stops at the first sample count whose interval is within 2%
+    assert costs == [1.0, 1.01, 0.99, 1.0]
+    assert len(func.calls) == 5
+    assert measure.get_measure_statistics(costs[:3])[3] > 0.02
+    assert measure.get_measure_statistics(costs)[3] <= 0.02
+    assert math.isclose(best, 1.0)
+
+
+def test_adaptive_time_evaluate_max_repeat():
+    func = FakeFunc([[1.0, 1.0, 1.0]], [[1.0], [3.0]] * 10)
+    costs, best = run_adaptive(func, target_rel_ci=0.001, max_repeat=6)
+    assert costs == [1.0, 3.0] * 3
+    assert len(func.calls) == 7
+    assert best == 2.0
+
+    # the previous best is kept if it is better
+    func = FakeFunc([[1.0, 1.0, 1.0]], [[1.0], [3.0]] * 10)
+    costs, best = run_adaptive(func, best_cost=1.5, target_rel_ci=0.001, max_repeat=4)
+    assert len(costs) == 4
+    assert best == 1.5
+
+
+def test_adaptive_time_evaluate_best_cost():
+    # the quick runs are statistically slower than the best cost
+    func = FakeFunc([[2.0, 2.0, 2.0]], [[1.0]] * 10)
+    costs, best = run_adaptive(func, best_cost=1.0)
+    assert costs == [2.0, 2.0, 2.0]
+    assert len(func.evaluators) == 1 and len(func.calls) == 1
+    assert best == 1.0
+
+    # the quick runs are too noisy to tell, the repeated runs are not
+    func = FakeFunc([[0.5, 2.0, 3.5]], [[2.0], [2.1], [1.9], [2.0]] * 5)
+    costs, best = run_adaptive(func, best_cost=1.0, target_rel_ci=0.001)
+    assert costs == [2.0, 2.1]
+    assert best == 1.0
+
+
+if __name__ == "__main__":
+    test_get_measure_statistics()
+    test_get_adaptive_inputs()
+    test_adaptive_time_evaluate_target_ci()
+    test_adaptive_time_evaluate_max_repeat()
+    test_adaptive_time_evaluate_best_cost()
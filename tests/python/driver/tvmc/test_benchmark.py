@@ -0,0 +1,68 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+import pytest
+
+from tvm.driver import tvmc
+
+
+def test_benchmark_tflite_module__requests(tflite_compiled_module_as_tarfile):
+    # some CI environments wont offer TFLite, so skip in case it is not present
+    pytest.importorskip("tflite")
+
+    report = tvmc.benchmark.benchmark_module(
+        tflite_compiled_module_as_tarfile, num_clients=2, warmup=1, num_requests=8
+    )
+
+    assert report["clients"] == 2
+    assert report["requests"] == 8
+    assert report["throughput_rps"] > 0
+    latency = report["latency_ms"]
+    assert set(latency.keys()) == {"mean", "p50", "p90", "p99", "p99.9"}
+    assert 0 < latency["p50"] <= latency["p90"] <= latency["p99"] <= latency["p99.9"]
+
+
+def test_benchmark_tflite_module__duration(tflite_compiled_module_as_tarfile):
+    # some CI environments wont offer TFLite, so skip in case it is not present
+    pytest.importorskip("tflite")
+
+    report = tvmc.benchmark.benchmark_module(
+        tflite_compiled_module_as_tarfile, fill_mode="zeros", warmup=1, duration=0.5
+    )
+
+    assert report["clients"] == 1
+    assert report["requests"] > 0
+    assert report["duration_s"] >= 0.5
+
+
+def test_benchmark_module__invalid_clients(tflite_compiled_module_as_tarfile):
+    with pytest.raises(tvmc.common.TVMCException):
+        tvmc.benchmark.benchmark_module(tflite_compiled_module_as_tarfile, num_clients=0)
+
+
+def test_benchmark_module__client_error(tflite_compiled_module_as_tarfile, monkeypatch):
+    # some CI environments wont offer TFLite, so skip in case it is not present
+    pytest.importorskip("tflite")
+
+    def run(self):
+        raise RuntimeError("client failed")
+
+    # the clients fail during warmup, before reaching the barrier
+    monkeypatch.setattr(tvmc.benchmark.runtime.GraphModule, "run", run)
+    with pytest.raises(RuntimeError, match="client failed"):
+        tvmc.benchmark.benchmark_module(
+            tflite_compiled_module_as_tarfile, num_clients=2, warmup=1, num_requests=8
+        )
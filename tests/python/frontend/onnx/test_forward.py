@@ -14,9 +14,13 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+import os
+import tempfile
+
 import numpy as np
 import math
 import onnx
+import onnx.numpy_helper
 from onnx import helper, TensorProto, mapping
 import torch
 import torchvision
@@ -3656,6 +3660,41 @@ def test_roi_align():
     verify_roi_align((1, 4, 16, 16), 32, 7, 7, sampling_ratio=2, spatial_scale=1.0)
 
 
+def test_external_data():
+    weight = np.random.uniform(size=(16, 8)).astype("float32")
+    node = helper.make_node("MatMul", inputs=["X", "W"], outputs=["Y"])
+    graph = helper.make_graph(
+        [node],
+        "external_data_test",
+        inputs=[helper.make_tensor_value_info("X", TensorProto.FLOAT, [4, 16])],
+        outputs=[helper.make_tensor_value_info("Y", TensorProto.FLOAT, [4, 8])],
+        initializer=[onnx.numpy_helper.from_array(weight, "W")],
+    )
+    model = helper.make_model(graph, producer_name="external_data_test")
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "model.onnx")
+        onnx.save_model(
+            model,
+            path,
+            save_as_external_data=True,
+            all_tensors_to_one_file=True,
+            location="weights.bin",
+            size_threshold=0,
+        )
+        external_model = onnx.load(path, load_external_data=False)
+        mod, params = relay.frontend.from_onnx(
+            external_model, {"X": (4, 16)}, external_data_dir=tmp_dir
+        )
+        tvm.testing.assert_allclose(params["W"].asnumpy(), weight)
+
+        x = np.random.uniform(size=(4, 16)).astype("float32")
+        with tvm.transform.PassContext(opt_level=1):
+            executor = relay.create_executor("graph", mod, tvm.cpu(), "llvm")
+            out = executor.evaluate()(x, **params)
+        tvm.testing.assert_allclose(out.asnumpy(), np.matmul(x, weight), rtol=1e-5)
+
+
 if __name__ == "__main__":
     test_flatten()
     test_reshape()
@@ -3730,3 +3769,4 @@ if __name__ == "__main__":
     test_xor()
     test_max_roi_pool()
     test_roi_align()
+    test_external_data()
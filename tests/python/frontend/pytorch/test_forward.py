@@ -2982,6 +2982,24 @@ def test_weight_names():
     assert set(params.keys()) == set(n for n, p in tm.named_parameters())
 
 
+def test_zero_copy_params():
+    tm = torch.jit.trace(torch.nn.Linear(64, 32), [torch.randn(2, 64)])
+    _, params = relay.frontend.from_pytorch(tm, [("input", (2, 64))])
+    _, shared_params = relay.frontend.from_pytorch(
+        tm, [("input", (2, 64))], zero_copy_params=True
+    )
+    assert set(params.keys()) == set(shared_params.keys())
+    for name, param in params.items():
+        tvm.testing.assert_allclose(param.asnumpy(), shared_params[name].asnumpy())
+
+    # the aligned CPU tensors are shared through DLPack
+    weight = tm.state_dict()["weight"]
+    if weight.data_ptr() % 64 == 0:
+        with torch.no_grad():
+            weight.add_(1)
+        tvm.testing.assert_allclose(shared_params["weight"].asnumpy(), weight.numpy())
+
+
 @tvm.testing.uses_gpu
 def test_duplicate_weight_use():
     # The test cases doesn't make any sense as a neural network,
@@ -3335,6 +3353,7 @@ if __name__ == "__main__":
     test_forward_traced_function()
     test_forward_dtypes()
     test_weight_names()
+    test_zero_copy_params()
     test_duplicate_weight_use()
 
     # Single operator tests
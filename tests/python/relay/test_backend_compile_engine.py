@@ -14,6 +14,9 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+import os
+import tempfile
+
 import numpy as np
 import tvm
 from tvm import te
@@ -21,6 +24,8 @@ import tvm.testing
 from tvm import relay
 from tvm import autotvm
 from tvm import topi
+from tvm.contrib import graph_runtime
+from tvm.relay.backend import kernel_cache
 from tvm.relay.testing import run_infer_type
 from tvm.relay.testing.temp_op_attr import TempOpAttr
 import tvm.testing
@@ -259,6 +264,54 @@ def test_compile_nhwc_pack():
     relay.build(mod, target="llvm")
 
 
+def test_kernel_cache():
+    x = relay.var("x", shape=(4, 8))
+    w = relay.var("w", shape=(16, 8))
+    y = relay.exp(relay.nn.relu(relay.nn.dense(x, w)))
+    mod = tvm.IRModule.from_expr(relay.Function([x, w], relay.nn.softmax(y)))
+    x_np = np.random.uniform(size=(4, 8)).astype("float32")
+    w_np = np.random.uniform(size=(16, 8)).astype("float32")
+
+    def run(lib):
+        m = graph_runtime.GraphModule(lib["default"](tvm.cpu()))
+        m.run(x=x_np, w=w_np)
+        return m.get_output(0).asnumpy()
+
+    expected = run(relay.build(mod, "llvm"))
+    with tempfile.TemporaryDirectory() as cache_dir:
+        with kernel_cache.KernelCache(cache_dir) as cache:
+            tvm.testing.assert_allclose(run(relay.build(mod, "llvm")), expected, rtol=1e-5)
+        assert cache.stats["hit"] == 0 and cache.stats["miss"] > 0
+
+        # a new cache on the same directory, as in a new process
+        with kernel_cache.KernelCache(cache_dir) as new_cache:
+            tvm.testing.assert_allclose(run(relay.build(mod, "llvm")), expected, rtol=1e-5)
+        assert new_cache.stats == {"hit": cache.stats["miss"], "miss": 0, "evict": 0}
+
+        # a different config misses
+        with autotvm.apply_history_best([]):
+            with kernel_cache.KernelCache(cache_dir) as new_cache:
+                relay.build(mod, "llvm")
+        assert new_cache.stats["miss"] == cache.stats["miss"]
+
+        # a different pass config misses
+        with tvm.transform.PassContext(opt_level=3, config={"tir.disable_vectorize": True}):
+            with kernel_cache.KernelCache(cache_dir) as new_cache:
+                tvm.testing.assert_allclose(run(relay.build(mod, "llvm")), expected, rtol=1e-5)
+        assert new_cache.stats["hit"] == 0
+        assert new_cache.stats["miss"] == cache.stats["miss"]
+        with tvm.transform.PassContext(opt_level=3, disabled_pass=["AlterOpLayout"]):
+            with kernel_cache.KernelCache(cache_dir) as new_cache:
+                relay.build(mod, "llvm")
+        assert new_cache.stats["hit"] == 0
+
+    with tempfile.TemporaryDirectory() as cache_dir:
+        with kernel_cache.KernelCache(cache_dir, max_bytes=0) as cache:
+            tvm.testing.assert_allclose(run(relay.build(mod, "llvm")), expected, rtol=1e-5)
+        assert cache.stats["evict"] == cache.stats["miss"]
+        assert not os.listdir(cache_dir)
+
+
 if __name__ == "__main__":
     test_get_valid_implementations()
     test_select_implementation()
@@ -268,3 +321,4 @@ if __name__ == "__main__":
     test_compile_tuple_dup()
     test_compile_full()
     test_compile_nhwc_pack()
+    test_kernel_cache()
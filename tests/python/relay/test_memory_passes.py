@@ -19,6 +19,7 @@ from tvm import te
 import numpy as np
 from tvm import relay
 from tvm.relay import memory_alloc
+from tvm.relay.transform import memory_plan
 
 
 def check_memory_plan(func, check_fn):
@@ -115,7 +116,69 @@ def test_no_fuse():
     check_memory_plan(func, check_no_fuse)
 
 
+def check_dense_chain(x, w):
+    for _ in range(4):
+        x = np.matmul(x, np.transpose(w))
+    return x
+
+
+def planned_storage_bytes(func, reuse):
+    """The total size of the storages allocated by the VM after memory planning"""
+    mod = tvm.IRModule.from_expr(func)
+    with tvm.transform.PassContext(opt_level=3, config={"relay.MemoryPlan.reuse": reuse}):
+        mod, _ = relay.vm.VMCompiler().optimize(mod, target="llvm")
+    alloc_storage = relay.op.get("memory.alloc_storage")
+    sizes = []
+
+    def visit(node):
+        if isinstance(node, relay.Call) and node.op == alloc_storage:
+            assert isinstance(node.args[0], relay.Constant)
+            sizes.append(int(node.args[0].data.asnumpy()))
+
+    relay.analysis.post_order_visit(mod["main"], visit)
+    assert sizes
+    return sum(sizes)
+
+
+def test_dense_chain():
+    x = relay.var("x", shape=(8, 8))
+    w = relay.var("w", shape=(8, 8))
+    z = x
+    for _ in range(4):
+        z = relay.op.nn.dense(z, w)
+    func = relay.Function([x, w], z)
+    check_memory_plan(func, check_dense_chain)
+    # only two of the four 8x8 float32 outputs are alive at the same time
+    no_reuse_bytes = planned_storage_bytes(func, reuse=False)
+    reuse_bytes = planned_storage_bytes(func, reuse=True)
+    assert no_reuse_bytes == 4 * 8 * 8 * 4
+    assert reuse_bytes < no_reuse_bytes
+
+
+def test_region_reuse():
+    region = memory_plan.Region.empty(0)
+    storages = [relay.var("s%d" % i) for i in range(3)]
+    alignment = relay.const(64, dtype="int64")
+    for storage, size in zip(storages, [256, 100, 256]):
+        region.grow(storage, relay.const(size, dtype="int64"), alignment, tvm.cpu(), "float32")
+
+    # s0 is dead when s2 is allocated, s1 overlaps both
+    live_ranges = {storages[0]: (0, 0, 3), storages[1]: (0, 2, 6), storages[2]: (0, 4, 8)}
+    offsets, total = region.plan(live_ranges)
+    assert total == 384
+    assert offsets[storages[0]] == offsets[storages[2]] == 0
+    assert offsets[storages[1]] == 256
+
+    # Storages of different let chains never share memory
+    live_ranges[storages[2]] = (1, 4, 8)
+    _, total = region.plan(live_ranges)
+    assert total == 640
+
+
 if __name__ == "__main__":
     test_tyck_alloc_tensor()
     test_add()
     test_add_sub()
+    test_no_fuse()
+    test_dense_chain()
+    test_region_reuse()
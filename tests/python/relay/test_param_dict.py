@@ -53,6 +53,45 @@ def test_ndarray_reflection():
     np.testing.assert_equal(deser_param_dict["x"].asnumpy(), deser_param_dict["y"].asnumpy())
 
 
+def test_save_load_mmap():
+    x = np.random.uniform(size=(10, 2)).astype("float32")
+    y = np.arange(7).astype("int8")
+    temp = util.tempdir()
+    path = temp.relpath("params.mmap")
+    relay.save_param_mmap({"x": tvm.nd.array(x), "y": y}, path)
+    assert relay.param_dict.is_param_mmap(path)
+    params = relay.load_param_mmap(path)
+    assert len(params) == 2
+    np.testing.assert_equal(params["x"].asnumpy(), x)
+    np.testing.assert_equal(params["y"].asnumpy(), y)
+
+    # convert from the format of save_param_dict
+    old_path = temp.relpath("params.bin")
+    with open(old_path, "wb") as f:
+        f.write(relay.save_param_dict({"x": x, "y": y}))
+    assert not relay.param_dict.is_param_mmap(old_path)
+    relay.convert_param_dict(old_path, temp.relpath("converted.mmap"))
+    converted = relay.load_param_mmap(temp.relpath("converted.mmap"))
+    np.testing.assert_equal(converted["x"].asnumpy(), x)
+    np.testing.assert_equal(converted["y"].asnumpy(), y)
+
+
+def test_graph_runtime_load_params_mmap():
+    x = relay.var("x", shape=(10,))
+    w = relay.var("w", shape=(10,))
+    func = relay.Function([x, w], relay.add(x, w))
+    w_np = np.random.uniform(size=(10,)).astype("float32")
+    x_np = np.random.uniform(size=(10,)).astype("float32")
+    graph, lib, _ = relay.build(tvm.IRModule.from_expr(func), target="llvm")
+
+    path = util.tempdir().relpath("params.mmap")
+    relay.save_param_mmap({"w": w_np}, path)
+    mod = graph_runtime.create(graph, lib, tvm.cpu())
+    mod.load_params_mmap(path)
+    mod.run(x=x_np)
+    tvm.testing.assert_allclose(mod.get_output(0).asnumpy(), x_np + w_np)
+
+
 def test_bigendian_rpc_param():
     """Test big endian rpc when there is a PowerPC RPC server available"""
     host = os.environ.get("TVM_POWERPC_TEST_HOST", None)
@@ -92,4 +131,6 @@ def test_bigendian_rpc_param():
 if __name__ == "__main__":
     test_save_load()
     test_ndarray_reflection()
+    test_save_load_mmap()
+    test_graph_runtime_load_params_mmap()
     test_bigendian_rpc_param()
@@ -0,0 +1,141 @@
+import tvm
+import os
+import time
+import tvm._ffi
+import tvm.testing
+import numpy as np
+from tvm import tg
+from pebble import concurrent
+from tvm.tensor_graph.testing.models import lenet
+from tvm.tensor_graph.core import evaluate_function_for, start_evaluate, stop_evaluate
+from tvm.tensor_graph.core import GraphTensor, make_fwd_graph, make_tir_graph, \
+                              split_training_graph, DataParallelSession
+from tvm.tensor_graph.core.utils import to_tuple
+from tvm.tensor_graph.nn import CELoss, SGD
+
+
+def random_initialize_weights(weight_tensors):
+  init = []
+  for w in weight_tensors:
+    init.append(np.random.uniform(-1, 1, to_tuple(w.shape)).astype(w.dtype))
+  return init
+
+
+def make_training_graph(batch, num_classes, dtype):
+  model = lenet.lenet5()
+  img_tensor = GraphTensor([batch, 1, 32, 32], dtype, name="data")
+  label_tensor = GraphTensor([batch, num_classes], dtype, name="label")
+  fwd_graph = make_fwd_graph(model, [img_tensor])
+  loss = CELoss(label_tensor)
+  optimizer = SGD(lr=0.002)
+  return make_tir_graph(fwd_graph, loss=loss, optimizer=optimizer, inference=False), optimizer
+
+
+def run_one_step(target, tir_graph, weights, bindings, reference):
+  """Tune the whole graph on one device, then run one step from the given weights"""
+  sess = tg.create_session(target, 0, tg.create_session_option(autoschedule_policy="random"))
+  ctx = tg.get_context_from_session(sess)
+  nd_bindings = {t: tvm.nd.array(v, ctx) for t, v in bindings.items()}
+  tg.initialize_weights(sess, tir_graph, [tvm.nd.array(w, ctx) for w in weights])
+  task_id = tg.add_task(sess, tir_graph)
+  tg.begin_tuning(sess, task_id, 100)
+  tg.run_task(sess, task_id, [nd_bindings] * 100, save_to=reference)
+  tg.end_tuning(sess, task_id)
+  tg.delete_session(sess)
+
+  sess = tg.create_session(target, 0, tg.create_session_option())
+  ctx = tg.get_context_from_session(sess)
+  nd_bindings = {t: tvm.nd.array(v, ctx) for t, v in bindings.items()}
+  tg.initialize_weights(sess, tir_graph, [tvm.nd.array(w, ctx) for w in weights])
+  task_id = tg.add_task(sess, tir_graph)
+  tg.test_schedule_reference(sess, task_id, reference=reference)
+  tg.run_task(sess, task_id, [nd_bindings], save_to="")
+  ret = [w.asnumpy() for w in tg.get_data_from_session(sess, list(tir_graph.weights))]
+  tg.delete_session(sess)
+  return ret
+
+
+@concurrent.process
+def main_process(target, num_shards, reference):
+  os.environ["TG_PRINT_LEVEL"] = "1"
+  # the graph of one shard
+  batch = 4
+  num_classes = 10
+  dtype = "float32"
+  tir_graph, optimizer = make_training_graph(batch, num_classes, dtype)
+  weights = random_initialize_weights(tir_graph.weights)
+
+  global_img_shape = [batch * num_shards, 1, 32, 32]
+  global_label_shape = [batch * num_shards, num_classes]
+  bindings = {
+    tir_graph.inputs[0]: np.random.uniform(-1, 1, global_img_shape).astype(dtype),
+    tir_graph.labels[0]: np.random.uniform(0, 10, global_label_shape).astype(dtype),
+    tir_graph.lr: optimizer.get_lr().astype(dtype)
+  }
+
+  # tune the two parts of the graph once
+  grad_graph, update_graph, grad_placeholders = split_training_graph(tir_graph)
+  sess = tg.create_session(target, 0, tg.create_session_option(autoschedule_policy="random"))
+  ctx = tg.get_context_from_session(sess)
+  nd_weights = [tvm.nd.array(w, ctx) for w in weights]
+  tg.initialize_weights(sess, grad_graph, nd_weights)
+  tg.initialize_weights(sess, update_graph, nd_weights)
+  shard_bindings = {
+    tir_graph.inputs[0]: tvm.nd.array(bindings[tir_graph.inputs[0]][:batch], ctx),
+    tir_graph.labels[0]: tvm.nd.array(bindings[tir_graph.labels[0]][:batch], ctx),
+    tir_graph.lr: tvm.nd.array(bindings[tir_graph.lr], ctx)
+  }
+  update_bindings = {tir_graph.lr: shard_bindings[tir_graph.lr]}
+  for p in grad_placeholders:
+    update_bindings[p] = tvm.nd.array(np.zeros(to_tuple(p.shape), p.dtype), ctx)
+  for graph, data in [(grad_graph, shard_bindings), (update_graph, update_bindings)]:
+    task_id = tg.add_task(sess, graph)
+    tg.begin_tuning(sess, task_id, 100)
+    tg.run_task(sess, task_id, [data] * 100, save_to=reference)
+    tg.end_tuning(sess, task_id)
+  tg.delete_session(sess)
+
+  # data parallel run with the tuned functions
+  dp_sess = DataParallelSession(
+    tir_graph, target=target, dev_ids=list(range(num_shards)), reference_file=reference)
+  dp_sess.set_weights(weights)
+
+  # one step matches one step of a single session on the whole batch,
+  # as the loss is the mean over the batch
+  dp_sess.run([bindings])
+  global_graph, _ = make_training_graph(batch * num_shards, num_classes, dtype)
+  global_bindings = {
+    global_graph.inputs[0]: bindings[tir_graph.inputs[0]],
+    global_graph.labels[0]: bindings[tir_graph.labels[0]],
+    global_graph.lr: bindings[tir_graph.lr]
+  }
+  expected = run_one_step(target, global_graph, weights, global_bindings, "global_" + reference)
+  for shard in range(num_shards):
+    for a, b in zip(dp_sess.get_weights(shard), expected):
+      tvm.testing.assert_allclose(a.asnumpy(), b, rtol=1e-4, atol=1e-5)
+
+  number = 20
+  beg = time.time()
+  dp_sess.run([bindings] * number)
+  end = time.time()
+  print("Average time cost for one iteration:", (end - beg) * 1e3 / number, "ms")
+
+  # all shards still hold the same weights
+  for shard in range(1, num_shards):
+    for a, b in zip(dp_sess.get_weights(0), dp_sess.get_weights(shard)):
+      tvm.testing.assert_allclose(a.asnumpy(), b.asnumpy(), rtol=1e-5)
+  return 0
+
+
+if __name__ == "__main__":
+  start_evaluate()
+  target = "llvm"
+  evalute_exit_code = evaluate_function_for(target, 1)
+  exit_code = main_process(target, 2, "data_parallel_schedules.txt")
+  try:
+    ret = exit_code.result()
+  except Exception as e:
+    print(e)
+  stop_evaluate()
+  ret = evalute_exit_code.result()
+  print("Success!")
@@ -0,0 +1,81 @@
+import tvm
+from tvm import te, tg
+from tvm.tensor_graph.core import set_partition_policy, partition_policy
+
+
+def make_graph():
+  A = te.placeholder([64, 128], name="A")
+  W1 = te.placeholder([128, 128], name="W1")
+  W2 = te.placeholder([128, 32], name="W2")
+  k1 = te.reduce_axis([0, 128], name="k1")
+  B = te.compute([64, 128], lambda i, j: te.sum(A[i, k1] * W1[k1, j], axis=[k1]), name="B")
+  C = te.compute([64, 128], lambda i, j: B[i, j] * 2.0, name="C")
+  D = te.compute([64, 128], lambda i, j: tvm.te.max(C[i, j], 0.0), name="D")
+  k2 = te.reduce_axis([0, 128], name="k2")
+  E = te.compute([64, 32], lambda i, j: te.sum(D[i, k2] * W2[k2, j], axis=[k2]), name="E")
+  return tg.make_tir_graph_inference([A], [E], [W1, W2]), [B, C, D, E]
+
+
+def test_cost_partition_mark():
+  graph, (B, C, D, E) = make_graph()
+  marks = tg.get_graph_partition_mark(graph, policy="cost")
+  # the elementwise ops are fused with their producer
+  assert marks[B.op][1] == marks[C.op][1] == marks[D.op][1]
+  # two heavy reductions are never fused
+  assert marks[B.op][1] != marks[E.op][1]
+
+
+def test_cost_partition_size_cap():
+  graph, (B, C, D, E) = make_graph()
+  marks = tg.get_graph_partition_mark(graph, max_subgraph_size=1, policy="cost")
+  assert len(set([x[1] for x in marks.values()])) == 4
+
+
+class SeparateCostModel(tg.PartitionCostModel):
+  """A model by which fusing never pays off"""
+  def cost(self, ops, read_tensors, write_tensors):
+    return float(len(ops)) ** 2
+
+
+def test_cost_partition_measure():
+  graph, (B, C, D, E) = make_graph()
+  model = SeparateCostModel()
+  marks = tg.get_graph_partition_mark(graph, policy="cost", cost_model=model)
+  assert len(set([marks[op][1] for op in [B.op, C.op, D.op, E.op]])) == 4
+
+  # measured, only fusing C and D pays off
+  measured = []
+
+  def measure_func(ops):
+    measured.append(ops)
+    if len(ops) == 1 or set(ops) == set([C.op, D.op]):
+      return 1.0
+    return 3.0
+
+  marks = tg.get_graph_partition_mark(
+    graph, policy="cost", cost_model=model, measure_func=measure_func)
+  assert marks[C.op][1] == marks[D.op][1]
+  assert len(set([marks[op][1] for op in [B.op, C.op, D.op, E.op]])) == 3
+  # {B, C}, {B}, {C}, then {C, D}, {D}, each subgraph is measured once
+  assert len(measured) == 5
+  assert len(set([frozenset(ops) for ops in measured])) == 5
+  assert [B.op, C.op] in measured and [C.op, D.op] in measured
+
+
+def test_use_partition_mark():
+  graph, _ = make_graph()
+  marks = tg.get_graph_partition_mark(graph, policy="cost")
+  tg.use_partition_mark(marks)
+  try:
+    multi_graph = tg.make_tir_multi_graph(graph)
+    graphs = tg.get_graphs_from_tir_multi_graph(multi_graph)
+    assert len(graphs) == len(set([x[1] for x in marks.values()]))
+  finally:
+    set_partition_policy(partition_policy)
+
+
+if __name__ == "__main__":
+  test_cost_partition_mark()
+  test_cost_partition_size_cap()
+  test_cost_partition_measure()
+  test_use_partition_mark()
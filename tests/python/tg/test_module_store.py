@@ -0,0 +1,106 @@
+import os
+import tempfile
+import multiprocessing
+import tvm
+from tvm import te, tg
+
+
+def make_graph(shape, prefix):
+  A = te.placeholder(shape, name=prefix + "A")
+  B = te.placeholder(shape, name=prefix + "B")
+  C = te.compute(shape, lambda i, j: A[i, j] + B[i, j], name=prefix + "C")
+  return tg.make_tir_graph_inference([A, B], [C], []), [A, B, C]
+
+
+def build(args, name):
+  s = te.create_schedule(args[-1].op)
+  return tvm.build(s, args, "llvm", name=name)
+
+
+def test_save_and_query():
+  with tempfile.TemporaryDirectory() as path:
+    store = tg.ModuleStore(path)
+    g1, args1 = make_graph([16, 32], "x")
+    g2, _ = make_graph([16, 32], "y")
+    assert store.query(g1, "llvm") is None
+    assert store.save(
+      g1, "llvm", "entity_0", build(args1, "subgraph_0"), "subgraph_0", 1.0, 2.0
+    )
+    # the same key is stored only once
+    assert not store.save(
+      g1, "llvm", "entity_0", build(args1, "subgraph_0"), "subgraph_0", 1.0, 2.0
+    )
+    assert store.save(
+      g1, "llvm", "entity_1", build(args1, "subgraph_1"), "subgraph_1", 3.0, 1.0
+    )
+    # structurally identical subgraph hits the store
+    item = store.query(g2, "llvm")
+    assert item["entity"] == "entity_1"
+    assert item["func_name"] == "subgraph_1"
+    assert store.query(g2, "cuda") is None
+    assert tvm.runtime.load_module(item["file"]).get_function("subgraph_1") is not None
+
+
+def test_evict():
+  with tempfile.TemporaryDirectory() as path:
+    store = tg.ModuleStore(path)
+    g, args = make_graph([16, 32], "x")
+    for i in range(3):
+      name = "subgraph_%d" % i
+      store.save(g, "llvm", "entity_%d" % i, build(args, name), name, float(i), 1.0)
+    assert len(store) == 3
+    store.max_bytes = store.total_bytes() - 1
+    store.evict()
+    assert len(store) == 2
+    assert len([x for x in os.listdir(path) if x.endswith(".so")]) == 2
+
+
+def test_query_read_only():
+  with tempfile.TemporaryDirectory() as path:
+    store = tg.ModuleStore(path)
+    g, args = make_graph([16, 32], "x")
+    for i in range(3):
+      name = "subgraph_%d" % i
+      store.save(g, "llvm", "entity_%d" % i, build(args, name), name, 3.0 - i, 1.0)
+    index_file = os.path.join(path, tg.ModuleStore.INDEX)
+    with open(index_file, "r") as fin:
+      index = fin.read()
+    mtime = os.path.getmtime(index_file)
+    assert store.query(g, "llvm")["entity"] == "entity_0"
+    with open(index_file, "r") as fin:
+      assert fin.read() == index
+    assert os.path.getmtime(index_file) == mtime
+    # the query still counts as a use, entity_1 is the least recently used
+    store.max_bytes = store.total_bytes() - 1
+    store.evict()
+    assert sorted(item["entity"] for item in store._load_index().values()) == [
+      "entity_0",
+      "entity_2",
+    ]
+
+
+def save_worker(path, i):
+  store = tg.ModuleStore(path)
+  g, args = make_graph([16, 32], "x")
+  name = "subgraph_%d" % i
+  store.save(g, "llvm", "entity_%d" % i, build(args, name), name, float(i), 1.0)
+
+
+def test_concurrent_save():
+  with tempfile.TemporaryDirectory() as path:
+    procs = [multiprocessing.Process(target=save_worker, args=(path, i)) for i in range(4)]
+    for p in procs:
+      p.start()
+    for p in procs:
+      p.join()
+    assert all(p.exitcode == 0 for p in procs)
+    # no update of the index is lost
+    assert len(tg.ModuleStore(path)) == 4
+    assert not [x for x in os.listdir(path) if ".tmp" in x]
+
+
+if __name__ == "__main__":
+  test_save_and_query()
+  test_evict()
+  test_query_read_only()
+  test_concurrent_save()
@@ -0,0 +1,65 @@
+import tvm
+from tvm import te, tg
+
+
+def make_graph(shape, prefix, swap=False, sub=False):
+  A = te.placeholder(shape, name=prefix + "A")
+  B = te.placeholder(shape, name=prefix + "B")
+  if sub:
+    C = te.compute(shape, lambda i, j: (B[i, j] - A[i, j]) if swap else (A[i, j] - B[i, j]),
+                   name=prefix + "C")
+  else:
+    C = te.compute(shape, lambda i, j: (B[i, j] + A[i, j]) if swap else (A[i, j] + B[i, j]),
+                   name=prefix + "C")
+  D = te.compute(shape, lambda i, j: tvm.te.max(C[i, j], 0.0) * 2.0, name=prefix + "D")
+  return tg.make_tir_graph_inference([A, B], [D], []), [A, B, D]
+
+
+def test_name_invariant():
+  g1, args1 = make_graph([16, 32], "x")
+  g2, args2 = make_graph([16, 32], "y")
+  assert tg.subgraph_hash(g1) == tg.subgraph_hash(g2)
+  assert tg.subgraph_hash(g1, args=args1) == tg.subgraph_hash(g2, args=args2)
+
+
+def test_commutative_invariant():
+  g1, args1 = make_graph([16, 32], "x")
+  g2, args2 = make_graph([16, 32], "y", swap=True)
+  assert tg.subgraph_hash(g1, args=args1) == tg.subgraph_hash(g2, args=args2)
+
+
+def test_non_commutative():
+  g1, args1 = make_graph([16, 32], "x", sub=True)
+  g2, args2 = make_graph([16, 32], "y", sub=True, swap=True)
+  assert tg.subgraph_hash(g1, args=args1) != tg.subgraph_hash(g2, args=args2)
+  A, B, D = args2
+  assert tg.subgraph_hash(g1, args=args1) == tg.subgraph_hash(g2, args=[B, A, D])
+
+
+def test_shape_abstract():
+  g1, _ = make_graph([16, 32], "x")
+  g2, _ = make_graph([8, 64], "y")
+  assert tg.subgraph_hash(g1) != tg.subgraph_hash(g2)
+  assert tg.subgraph_hash(g1, shape_abstract=True) == tg.subgraph_hash(g2, shape_abstract=True)
+
+
+def test_reduce():
+  def make(prefix, swap):
+    A = te.placeholder([16, 32], name=prefix + "A")
+    B = te.placeholder([32, 8], name=prefix + "B")
+    k = te.reduce_axis([0, 32], name=prefix + "k")
+    C = te.compute(
+      [16, 8],
+      lambda i, j: te.sum((B[k, j] * A[i, k]) if swap else (A[i, k] * B[k, j]), axis=[k]),
+      name=prefix + "C")
+    return tg.make_tir_graph_inference([A], [C], [B])
+
+  assert tg.subgraph_hash(make("x", False)) == tg.subgraph_hash(make("y", True))
+
+
+if __name__ == "__main__":
+  test_name_invariant()
+  test_commutative_invariant()
+  test_non_commutative()
+  test_shape_abstract()
+  test_reduce()
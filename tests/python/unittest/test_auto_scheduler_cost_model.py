@@ -78,6 +78,39 @@ def test_xgb_model():
         model.load(fp.name)
 
 
+def test_xgb_model_incremental():
+    task, dag, inputs, results = get_sample_records(60)
+
+    model = auto_scheduler.XGBModel(
+        num_warmup_sample=-1, incremental=True, window_size=40, full_retrain_interval=3
+    )
+    for i in range(0, 60, 20):
+        model.update(inputs[i : i + 20], results[i : i + 20])
+    assert len(model.feature_buffer) == 60
+    assert model.num_updates == 3
+    preds = model.predict(task, [x.state for x in inputs])
+    assert len(preds) == len(inputs)
+
+    # the window keeps all new records and samples old ones
+    record_ids, importance = model._sample_window(np.random.uniform(size=80), 60)
+    assert len(record_ids) == 40 and len(importance) == 40
+    assert set(range(60, 80)).issubset(set(record_ids))
+
+
+def test_flat_feature_buffer():
+    buffer = auto_scheduler.cost_model.xgb_model.FlatFeatureBuffer(capacity=2)
+    features = [np.full((n, 4), i, dtype=np.float32) for i, n in enumerate([1, 3, 2])]
+    buffer.append(features[:1])
+    buffer.append(features[1:])
+    assert len(buffer) == 3
+    np.testing.assert_equal(buffer.get(1), features[1])
+    x_flatten, pack_ids = buffer.take([2, 0])
+    np.testing.assert_equal(x_flatten[:, 0], [2, 2, 0])
+    np.testing.assert_equal(pack_ids, [0, 0, 1])
+
+
 if __name__ == "__main__":
     test_random_model()
     test_xgb_model()
+    test_xgb_model_incremental()
+    test_flat_feature_buffer()
@@ -17,6 +17,9 @@
 
 """ Test measurement and log serialization. """
 
+import os
+import time
+
 import tvm
 from tvm import topi
 from tvm import te, auto_scheduler
@@ -167,6 +170,72 @@ def test_record_pragma_storage_align_rfactor():
     record_common(dag, s)
 
 
+def test_record_index():
+    if not tvm.testing.device_enabled("llvm"):
+        return
+
+    target = tvm.target.Target("llvm")
+    tasks = [
+        auto_scheduler.create_task(matmul_auto_scheduler_test, (n, n, n), target)
+        for n in [64, 128]
+    ]
+    states = [task.compute_dag.get_init_state() for task in tasks]
+
+    def make_records(costs):
+        inputs = [
+            auto_scheduler.MeasureInput(tasks[i % 2], states[i % 2]) for i in range(len(costs))
+        ]
+        results = [auto_scheduler.MeasureResult([c], 0, "", 0.2, 1) for c in costs]
+        return inputs, results
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        log_file = tmp_dir + "/log.json"
+        auto_scheduler.save_records(log_file, *make_records([0.5, 0.4, 0.3, 0.6]))
+        index = auto_scheduler.RecordIndex(log_file)
+        assert len(index) == 2
+        for task, cost in zip(tasks, [0.3, 0.4]):
+            _, res = index.query(task.workload_key, target)
+            assert abs(res.costs[0].value - cost) < 1e-6
+            inp, res = auto_scheduler.load_best(log_file, task.workload_key, target)
+            ref_inp, ref_res = auto_scheduler.load_best(
+                log_file, task.workload_key, target, use_index=False
+            )
+            assert inp.task.workload_key == ref_inp.task.workload_key
+            assert res.costs[0].value == ref_res.costs[0].value
+        assert index.query(tasks[0].workload_key, "cuda") == (None, None)
+
+        # Appended records are indexed without a rebuild
+        auto_scheduler.save_records(log_file, *make_records([0.7, 0.1]))
+        _, res = index.query(tasks[1].workload_key, target)
+        assert abs(res.costs[0].value - 0.1) < 1e-6
+        _, res = index.query()
+        assert abs(res.costs[0].value - 0.1) < 1e-6
+
+        index_file = tmp_dir + "/log.json.idx"
+        index.save(index_file)
+        reloaded = auto_scheduler.RecordIndex(log_file, index_file)
+        assert reloaded.best == index.best
+        assert reloaded.scanned_bytes == index.scanned_bytes
+
+
+def test_persistent_pool():
+    pool = auto_scheduler.utils.PersistentPool(2)
+    res = pool.map_with_timeout(divmod, [(7, 2), (1, 0)], timeout=10)
+    assert res[0] == (3, 1)
+    assert isinstance(res[1], RuntimeError) and "ZeroDivisionError" in str(res[1])
+    pids = [worker[0].pid for worker in pool.workers]
+
+    # A timeout or a crash only replaces the worker running that call
+    res = pool.map_with_timeout(time.sleep, [(0,), (10,)], timeout=1)
+    assert res[0] is None and isinstance(res[1], TimeoutError)
+    assert pool.workers[0][0].pid == pids[0] and pool.workers[1] is None
+    res = pool.map_with_timeout(os._exit, [(1,)], timeout=10)
+    assert isinstance(res[0], RuntimeError)
+    res = pool.map_with_timeout(divmod, [(7, 2)] * 4, timeout=10)
+    assert res == [(3, 1)] * 4
+    pool.close()
+
+
 def test_measure_local_builder_runner(enable_cpu_cache_flush=False):
     if not tvm.testing.device_enabled("llvm"):
         return
@@ -213,6 +282,8 @@ if __name__ == "__main__":
     test_record_compute_at_root_inline_cache_read_write()
     test_record_follow_split_follow_fused_split()
     test_record_pragma_storage_align_rfactor()
+    test_record_index()
+    test_persistent_pool()
     test_measure_local_builder_runner(enable_cpu_cache_flush=True)
     test_measure_local_builder_runner(enable_cpu_cache_flush=False)
     test_measure_local_builder_rpc_runner(enable_cpu_cache_flush=True)
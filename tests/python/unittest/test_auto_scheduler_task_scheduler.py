@@ -0,0 +1,122 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+
+""" Test task scheduler """
+
+import json
+import tempfile
+
+import tvm
+import tvm.testing
+from tvm import auto_scheduler
+
+from test_auto_scheduler_common import matmul_auto_scheduler_test
+
+
+def test_task_scheduler_round_robin():
+    if not tvm.testing.device_enabled("llvm"):
+        return
+
+    tasks = [
+        auto_scheduler.create_task(matmul_auto_scheduler_test, (n, n, n), "llvm")
+        for n in [2, 4, 8]
+    ]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        log_file = tmp_dir + "/log.json"
+        progress_file = tmp_dir + "/progress.json"
+        num_trials_per_task = 2
+
+        # Tune all tasks
+        measure_ctx = auto_scheduler.LocalRPCMeasureContext()
+        tune_option = auto_scheduler.TuningOptions(
+            num_measure_trials=num_trials_per_task * len(tasks),
+            num_measures_per_round=num_trials_per_task,
+            runner=measure_ctx.runner,
+            measure_callbacks=[auto_scheduler.RecordToFile(log_file)],
+        )
+        task_scheduler = auto_scheduler.TaskScheduler(
+            tasks,
+            strategy="round-robin",
+            callbacks=[auto_scheduler.task_scheduler.LogTaskProgress(progress_file)],
+        )
+        task_scheduler.tune(tune_option, search_policy="sketch.random")
+
+        # Check the result of round robin
+        counters = {}
+        for task in tasks:
+            counters[task.workload_key] = 0
+        for inp, _ in auto_scheduler.load_records(log_file):
+            counters[inp.task.workload_key] += 1
+        for task in tasks:
+            assert counters[task.workload_key] == num_trials_per_task
+
+        # Every round has a progress record
+        with open(progress_file) as fin:
+            records = [json.loads(line) for line in fin]
+        assert [r["task_idx"] for r in records] == [0, 1, 2]
+        assert records[-1]["trials"] == num_trials_per_task * len(tasks)
+
+        # Resume from the log, the best costs are restored
+        task_scheduler = auto_scheduler.TaskScheduler(tasks, load_log_file=log_file)
+        assert max(task_scheduler.best_costs) < 1e9
+        del measure_ctx
+
+
+def test_task_scheduler_gradient():
+    if not tvm.testing.device_enabled("llvm"):
+        return
+
+    tasks = [
+        auto_scheduler.create_task(matmul_auto_scheduler_test, (n, n, n), "llvm")
+        for n in [2, 4]
+    ]
+
+    def objective_func(costs):
+        return costs[0]
+
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        log_file = tmp_dir + "/log.json"
+        n_trials = 5
+
+        # Tune all tasks
+        measure_ctx = auto_scheduler.LocalRPCMeasureContext()
+        tune_option = auto_scheduler.TuningOptions(
+            num_measure_trials=n_trials,
+            runner=measure_ctx.runner,
+            num_measures_per_round=1,
+            measure_callbacks=[auto_scheduler.RecordToFile(log_file)],
+        )
+        task_scheduler = auto_scheduler.TaskScheduler(tasks, objective_func=objective_func)
+        task_scheduler.tune(tune_option, search_policy="sketch.random")
+
+        # Check the allocation results
+        counters = {}
+        for task in tasks:
+            counters[task.workload_key] = 0
+        for inp, _ in auto_scheduler.load_records(log_file):
+            counters[inp.task.workload_key] += 1
+
+        # The objective only depends on the first task, the second one only gets its warm-up round
+        assert counters[tasks[0].workload_key] == n_trials - 1
+        assert counters[tasks[1].workload_key] == 1
+        del measure_ctx
+
+
+if __name__ == "__main__":
+    test_task_scheduler_round_robin()
+    test_task_scheduler_gradient()
@@ -17,6 +17,8 @@
 """Test database"""
 import copy
 import logging
+import os
+import tempfile
 
 from tvm.autotvm import database
 from tvm.autotvm.record import encode, MeasureResult
@@ -116,9 +118,44 @@ def test_db_filter():
     assert len(records) == 2
 
 
+def test_sqlite_db():
+    logging.info("test sqlite db ...")
+    records = get_sample_records(5)
+    with tempfile.TemporaryDirectory() as tmp_dir:
+        path = os.path.join(tmp_dir, "records.db")
+        _db = database.SQLiteDatabase(path)
+        _db.save_many(records[:3])
+        _db.save(records[0][0], records[3][1])
+
+        # overwrite if not extend
+        assert _db.load(records[0][0]) == records[3][1]
+        assert len(_db.load(records[0][0], get_all=True)) == 1
+        _db.save(records[0][0], records[4][1], extend=True)
+        assert len(_db.load(records[0][0], get_all=True)) == 2
+
+        # another connection sees the saved records
+        _db2 = database.SQLiteDatabase(path)
+        inps = [inp for inp, _ in records]
+        loaded = _db2.load_many(inps)
+        assert loaded[1] == records[1][1]
+        assert loaded[2] == records[2][1]
+        assert loaded[3] is None and loaded[4] is None
+
+        partial_results, unsaved = database.filter_inputs(_db2, inps)
+        assert partial_results[3] is None
+        assert unsaved == inps[3:]
+        assert len(_db2.filter(lambda inp, ress: True)) == 3
+
+        _db2.flush()
+        assert _db.load(records[1][0]) is None
+        _db.close()
+        _db2.close()
+
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
     test_save_load()
     test_db_hash()
     test_db_latest_all()
     test_db_filter()
+    test_sqlite_db()
@@ -32,6 +32,7 @@ from tvm import relay
 from tvm.autotvm.task import ConfigEntity
 from tvm.autotvm.measure import MeasureResult, MeasureInput
 from tvm.autotvm.graph_tuner import DPTuner, PBQPTuner
+from tvm.autotvm.graph_tuner.dynamic_programming_stage import DPStage
 
 
 def _create_args(dshape, kshape, strides, padding, dilation, layout, out_layout, dtype, out_dtype):
@@ -252,6 +253,17 @@ def test_DPTuner_run():
     assert os.path.isfile(log_file), "No log file with name %s exists." % log_file
 
 
+def test_DPStage_prune_dominated():
+    kernel_costs = [0.03, 0.02, 0.02, 0.04]
+    # candidate 3 has the cheapest layout transform and survives
+    in_edge = np.array([[0.01, 0.01, 0.01, 0.0], [0.02, 0.01, 0.01, 0.0]]).T
+    out_edge = np.array([[0.0, 0.5], [0.0, 0.1], [0.0, 0.1], [0.0, 0.0]])
+    keep = DPStage.prune_dominated(kernel_costs, [in_edge, out_edge])
+    # 0 is dominated by 1, 2 ties with 1 and only the first one is kept
+    assert keep == [1, 3], keep
+    assert DPStage.prune_dominated([0.01], []) == [0]
+
+
 def test_PBQPTuner_run():
     target = "llvm"
     dtype = "float32"
@@ -736,6 +748,7 @@ def test_triangle_block():
 if __name__ == "__main__":
     test_graph_tuner_layout_transform()
     test_DPTuner_run()
+    test_DPStage_prune_dominated()
     test_PBQPTuner_run()
     test_many_sub_graphs()
     test_tuple()
@@ -16,6 +16,7 @@
 # under the License.
 """Test builder and runner"""
 import logging
+import os
 import time
 
 import numpy as np
@@ -24,6 +25,7 @@ import tvm
 from tvm import te
 from test_autotvm_common import DummyRunner, bad_matmul, get_sample_task
 from tvm import autotvm
+from tvm.autotvm.measure import measure_methods
 from tvm.autotvm.measure.measure import MeasureErrorNo, MeasureResult
 
 
@@ -73,8 +75,68 @@ def test_check_correctness():
     tuner.tune(n_trial=2, measure_option=measure_option, callbacks=[_callback_wrong])
 
 
+def _fake_run_batch_through_rpc(measure_inputs, build_results, *args, callback=None):
+    for k, measure_input in enumerate(measure_inputs):
+        if measure_input == "hang":
+            time.sleep(100)
+        if measure_input == "crash":
+            os._exit(1)
+        callback(k, MeasureResult((0.1,), MeasureErrorNo.NO_ERROR, 0, time.time()))
+
+
+def test_rpc_runner_reuse_session_timeout():
+    """only the hanging or crashing candidates of a batch are charged the timeout"""
+    run_batch_through_rpc = measure_methods.run_batch_through_rpc
+    # inherited by the forked batch processes
+    measure_methods.run_batch_through_rpc = _fake_run_batch_through_rpc
+    try:
+        runner = autotvm.RPCRunner(
+            "test_device", "localhost", 9190, timeout=1, n_parallel=2, reuse_session=True
+        )
+        runner.executor.timeout = 1
+        measure_inputs = ["a", "hang", "b", "crash", "c", "d", "e"]
+        results = runner.run(measure_inputs, [None] * len(measure_inputs))
+    finally:
+        measure_methods.run_batch_through_rpc = run_batch_through_rpc
+
+    for measure_input, res in zip(measure_inputs, results):
+        if measure_input in ["hang", "crash"]:
+            assert res.error_no == MeasureErrorNo.RUN_TIMEOUT
+        else:
+            assert res.error_no == MeasureErrorNo.NO_ERROR
+
+
+def test_run_batch_through_rpc_error():
+    """an error before reaching the remote only fails the candidates it happens to"""
+    def connect_tracker(host, port):
+        raise RuntimeError("Cannot connect to the tracker")
+
+    build_result = measure_methods.BuildResult("lib.tar", None, None, 0.1)
+    remote_args = ("test_device", "localhost", 9190, 1, 10)
+    streamed = []
+    old_connect_tracker = measure_methods._rpc.connect_tracker
+    measure_methods._rpc.connect_tracker = connect_tracker
+    try:
+        results = measure_methods.run_batch_through_rpc(
+            ["a", "b"],
+            [build_result, build_result],
+            1,
+            1,
+            0,
+            0,
+            remote_args,
+            callback=lambda i, res: streamed.append(i),
+        )
+    finally:
+        measure_methods._rpc.connect_tracker = old_connect_tracker
+    assert streamed == [0, 1]
+    assert all([res.error_no == MeasureErrorNo.RUNTIME_DEVICE for res in results])
+
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
 
     test_task_tuner_without_measurement()
     test_check_correctness()
+    test_rpc_runner_reuse_session_timeout()
+    test_run_batch_through_rpc_error()
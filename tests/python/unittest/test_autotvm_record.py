@@ -24,6 +24,7 @@ from tvm.contrib import util
 from tvm import autotvm
 from tvm.autotvm.measure import MeasureInput, MeasureResult, MeasureErrorNo
 from tvm.autotvm.record import encode, decode, ApplyHistoryBest, measure_str_key
+from tvm.autotvm.record import build_record_store, RecordStore
 
 from test_autotvm_common import get_sample_task
 
@@ -87,7 +88,40 @@ def test_apply_history_best():
     assert str(x) == str(tsk.config_space.get(2))
 
 
+def test_record_store():
+    temp = util.tempdir()
+    file_path = temp.relpath("temp.log")
+    store_path = temp.relpath("temp.store")
+
+    tsk, target = get_sample_task()
+    costs = [0.1, 0.3, 0.01, 0.4]
+    inputs = [MeasureInput(target, tsk, tsk.config_space.get(i)) for i in range(len(costs))]
+    results = [MeasureResult((c,), 0, 2.3, 0) for c in costs]
+    with open(file_path, "w") as fo:
+        for inp, res in zip(inputs, results):
+            fo.write(encode(inp, res) + "\n")
+        # failed records are never the best
+        fo.write(encode(inputs[3], MeasureResult((0.001,), 1, 2.3, 0)) + "\n")
+
+    store = build_record_store(file_path, store_path, n_parallel=2, chunk_size=64)
+    assert len(store) == 1
+    for records in [store, store_path]:
+        hist_best = ApplyHistoryBest(records)
+        # nothing is decoded before the query
+        assert not hist_best.best_by_targetkey
+        x = hist_best.query(target, tsk.workload)
+        assert str(x) == str(tsk.config_space.get(2))
+
+    # merge into the existing store
+    with open(file_path, "w") as fo:
+        fo.write(encode(inputs[0], MeasureResult((0.001,), 0, 2.3, 0)) + "\n")
+    build_record_store(file_path, store_path)
+    x = ApplyHistoryBest(RecordStore(store_path)).query(target, tsk.workload)
+    assert str(x) == str(tsk.config_space.get(0))
+
+
 if __name__ == "__main__":
     test_load_dump()
     test_apply_history_best()
     test_file_io()
+    test_record_store()
@@ -0,0 +1,113 @@
+# Licensed to the Apache Software Foundation (ASF) under one
+# or more contributor license agreements.  See the NOTICE file
+# distributed with this work for additional information
+# regarding copyright ownership.  The ASF licenses this file
+# to you under the Apache License, Version 2.0 (the
+# "License"); you may not use this file except in compliance
+# with the License.  You may obtain a copy of the License at
+#
+#   http://www.apache.org/licenses/LICENSE-2.0
+#
+# Unless required by applicable law or agreed to in writing,
+# software distributed under the License is distributed on an
+# "AS IS" BASIS, WITHOUT WARRANTIES OR CONDITIONS OF ANY
+# KIND, either express or implied.  See the License for the
+# specific language governing permissions and limitations
+# under the License.
+"""Test simulated annealing model optimizer"""
+import numpy as np
+
+from tvm.autotvm.tuner.model_based_tuner import CostModel, point2knob
+from tvm.autotvm.tuner.sa_model_optimizer import (
+    SimulatedAnnealingOptimizer,
+    random_walk_batch,
+    update_maximums,
+)
+
+from test_autotvm_common import get_sample_task
+
+
+class IndexModel(CostModel):
+    """Score is the index itself"""
+
+    def predict(self, xs, output_margin=False):
+        return np.array(xs, dtype=np.float64)
+
+
+def test_random_walk_batch():
+    dims = [3, 1, 4, 5]
+    points = np.arange(3 * 4 * 5)
+    for _ in range(10):
+        new_points = random_walk_batch(points, dims)
+        for p, q in zip(points, new_points):
+            diff = [a != b for a, b in zip(point2knob(p, dims), point2knob(q, dims))]
+            assert sum(diff) == 1
+            assert not diff[1]
+    assert new_points.dtype == points.dtype
+
+    # the indexes of a space that does not fit in int64 stay python ints
+    dims = [2 ** 40, 2 ** 40]
+    points = np.array([2 ** 70, 3 ** 40, 5], dtype=object)
+    new_points = random_walk_batch(points, dims)
+    assert new_points.dtype == points.dtype
+    for p, q in zip(points, new_points):
+        diff = [a != b for a, b in zip(point2knob(p, dims), point2knob(q, dims))]
+        assert sum(diff) == 1
+
+
+def test_update_maximums():
+    top_scores = np.full(3, float("-inf"))
+    top_points = -1 - np.arange(3)
+    exclusive = np.array([9])
+    top_scores, top_points, modified = update_maximums(
+        top_scores, top_points, np.array([1.0, 9.0, 5.0, 5.0]), np.array([1, 9, 5, 5]), exclusive
+    )
+    assert modified
+    assert sorted(top_points[top_scores >= 0].tolist()) == [1, 5]
+    top_scores, top_points, modified = update_maximums(
+        top_scores, top_points, np.array([2.0, 5.0]), np.array([2, 5]), exclusive
+    )
+    assert modified
+    assert sorted(top_points.tolist()) == [1, 2, 5]
+    top_scores, top_points, modified = update_maximums(
+        top_scores, top_points, np.array([0.5]), np.array([0]), exclusive
+    )
+    assert not modified
+
+
+def test_find_maximums():
+    task, _ = get_sample_task()
+    size = len(task.config_space)
+    for n_chains, n_workers in [(1, 1), (2, 1), (2, 2)]:
+        optimizer = SimulatedAnnealingOptimizer(
+            task,
+            n_iter=50,
+            parallel_size=8,
+            early_stop=None,
+            n_chains=n_chains,
+            n_workers=n_workers,
+        )
+        maximums = optimizer.find_maximums(IndexModel(), 4, {size - 1})
+        assert len(maximums) == 4
+        assert size - 1 not in maximums
+        assert maximums == sorted(maximums, reverse=True)
+
+
+def test_find_maximums_constraint():
+    task, _ = get_sample_task()
+    space = task.config_space
+    space.add_constraint(lambda k: k["tile_y"][:, 1] <= 4)
+    optimizer = SimulatedAnnealingOptimizer(task, n_iter=50, parallel_size=8, early_stop=None)
+    # the start points are resampled until they are valid
+    assert space.columnar().valid(optimizer.sample_points(8)).all()
+    maximums = optimizer.find_maximums(IndexModel(), 4, set())
+    assert len(maximums) == 4
+    assert all(space.get(x).valid() for x in maximums)
+    assert space.columnar().valid(optimizer.points).all()
+
+
+if __name__ == "__main__":
+    test_random_walk_batch()
+    test_update_maximums()
+    test_find_maximums()
+    test_find_maximums_constraint()
@@ -16,6 +16,8 @@
 # under the License.
 """Test space definition primitives"""
 
+import numpy as np
+
 import tvm
 from tvm import te
 from tvm.autotvm.task.space import ConfigSpace, FallbackConfigEntity
@@ -100,5 +102,38 @@ def test_split():
         pass
 
 
+def test_columnar():
+    cfg = ConfigSpace()
+    s, (A, B, C) = gemm_func(cfg, 128)
+    y, x = s[C].op.axis
+    cfg.define_reorder("reorder", [cfg.axis(y), cfg.axis(x)], policy="all")
+    cfg.define_annotate("ann", [cfg.axis(x)], policy="try_unroll_vec")
+    cfg.define_knob("auto_unroll", [0, 512, 1500])
+    cfg.add_constraint(lambda k: k["tile_y"][:, 1] * k["tile_x"][:, 1] <= 64)
+
+    columnar = cfg.columnar()
+    indexes = np.arange(len(cfg))
+    np.testing.assert_equal(columnar.encode(columnar.decode(indexes)), indexes)
+
+    feas = columnar.get_flatten_feature(indexes)
+    assert feas.shape == (len(cfg), columnar.feature_len)
+    for i in [0, 1, 17, len(cfg) - 1]:
+        np.testing.assert_equal(feas[i], cfg.get(i).get_flatten_feature())
+
+    mask = columnar.valid(indexes)
+    assert not mask.all()
+    for i in range(len(cfg)):
+        config = cfg.get(i)
+        assert mask[i] == (config["tile_y"].size[1] * config["tile_x"].size[1] <= 64)
+        # the configs got from the space check the constraints too
+        assert config.valid() == mask[i]
+
+    # the encoding is rebuilt when a new knob is defined
+    cfg.define_knob("unroll_explicit", [0, 1])
+    assert cfg.columnar() is not columnar
+    assert len(cfg.columnar()) == len(cfg)
+
+
 if __name__ == "__main__":
     test_split()
+    test_columnar()
@@ -14,6 +14,7 @@
 # KIND, either express or implied.  See the License for the
 # specific language governing permissions and limitations
 # under the License.
+import tempfile
 import time
 
 import numpy as np
@@ -22,9 +23,10 @@ import tvm
 from tvm import te
 from tvm import autotvm
 from tvm.autotvm import MeasureInput, MeasureResult
-from tvm.autotvm.tuner.xgboost_cost_model import XGBoostCostModel
+from tvm.autotvm.tuner.model_based_tuner import FeatureCache
+from tvm.autotvm.tuner.xgboost_cost_model import XGBoostCostModel, get_feature_service
 
-from test_autotvm_common import get_sample_task, get_sample_records
+from test_autotvm_common import DummyRunner, get_sample_task, get_sample_records
 
 
 def test_fit():
@@ -51,6 +53,115 @@ def test_tuner():
     tuner.load_history(records)
 
 
+def test_tuner_tune():
+    task, target = get_sample_task()
+    measure_option = autotvm.measure_option(builder=autotvm.LocalBuilder(), runner=DummyRunner())
+
+    # enough trials to fit the cost model
+    tuner = autotvm.tuner.XGBTuner(task, plan_size=8, num_threads=2)
+    tuner.tune(n_trial=24, measure_option=measure_option)
+    assert tuner.best_flops > 1
+    assert tuner.cost_model._sample_size > 0
+    # the shared feature extraction service is kept for the next tasks
+    assert get_feature_service(2).workers
+
+    tuner = autotvm.tuner.XGBTuner(task, plan_size=8, num_threads=2)
+    tuner.tune(n_trial=16, measure_option=measure_option)
+    assert tuner.best_flops > 1
+    get_feature_service(2).close()
+
+
+def test_feature_cache():
+    cache = FeatureCache(capacity=32)
+    table = cache.get("itervar")
+    points = list(range(40))
+    assert table.missing(points[:20]) == points[:20]
+    table.put(points[:20], [np.full(4, x, dtype=np.float32) for x in points[:20]])
+    table.put([20], [None])
+    assert table.missing(points[:21]) == []
+    # gather keeps the order of queries, a None feature is a zero row
+    ret = table.take([3, 1, 20])
+    np.testing.assert_equal(ret[:, 0], [3, 1, 0])
+
+    # bounded by capacity, recently used rows survive
+    table.missing(points[:8])
+    table.put(points[21:40], [np.full(4, x, dtype=np.float32) for x in points[21:40]])
+    assert len(table) <= 32
+    assert all([x in table for x in points[:8] + points[21:40]])
+    np.testing.assert_equal(table.take(points[21:40])[:, 0], points[21:40])
+
+    # tables of different keys are independent
+    assert len(cache.get("knob")) == 0
+    assert cache.size("itervar") == len(table)
+    cache.clear("itervar")
+    assert cache.size("itervar") == 0
+
+
+def test_feature_cache_spill():
+    with tempfile.TemporaryDirectory() as spill_dir:
+        table = FeatureCache(capacity=16, spill_dir=spill_dir).get("itervar")
+        table.missing(range(16))
+        table.put(list(range(16)), [np.full(8, x, dtype=np.float32) for x in range(16)])
+        assert isinstance(table.matrix, np.memmap)
+        np.testing.assert_equal(table.take([5, 7])[:, 0], [5, 7])
+
+
+def test_shared_feature_cache():
+    task, target = get_sample_task()
+    cache = FeatureCache()
+    model_a = XGBoostCostModel(task, "itervar", "rank", feature_cache=cache)
+    model_b = XGBoostCostModel(task, "knob", "rank", feature_cache=cache)
+    assert model_a.feature_cache is model_b.feature_cache
+    fea_a = model_a._get_feature([0, 1, 2])
+    fea_b = model_b._get_feature([0, 1, 2])
+    assert fea_a.shape[0] == fea_b.shape[0] == 3
+    assert cache.size(model_a.cache_key) == cache.size(model_b.cache_key) == 3
+
+
+def _square(x):
+    return x * x
+
+
+def test_feature_service():
+    task, target = get_sample_task()
+    service = get_feature_service(2)
+    # do not depend on the workers started by other tests
+    service.close()
+    try:
+        # the service is shared and survives across fit calls
+        model = XGBoostCostModel(task, "itervar", "rank", num_threads=2)
+        model.fit(np.arange(16), np.arange(16), plan_size=8)
+        workers = list(service.workers)
+        assert len(workers) == 2
+        model.fit(np.arange(32), np.arange(32), plan_size=8)
+        assert service.workers == workers
+        assert all([model.task_key in w.keys for w in workers])
+
+        items = list(range(200))
+        assert service.map(_square, items) == [x * x for x in items]
+        starts = sorted([start for start, _ in service.imap(_square, items)])
+        assert starts == list(range(0, 200, service.batch_size))
+    finally:
+        service.close()
+
+
+def test_knob_feature_columnar():
+    task, target = get_sample_task()
+    service = get_feature_service(2)
+    service.close()
+    # knob features are decoded from the columnar encoding, without the service
+    model = XGBoostCostModel(task, "knob", "rank", num_threads=2)
+    feas = model._get_feature(list(range(8)))
+    assert not service.workers
+    for i in range(8):
+        np.testing.assert_equal(feas[i], task.config_space.get(i).get_flatten_feature())
+
 if __name__ == "__main__":
     test_fit()
     test_tuner()
+    test_tuner_tune()
+    test_feature_cache()
+    test_feature_cache_spill()
+    test_shared_feature_cache()
+    test_feature_service()
+    test_knob_feature_columnar()
@@ -120,5 +120,36 @@ def test_graph_simple():
     check_sharing()
 
 
+@tvm.testing.requires_llvm
+def test_graph_module_pool():
+    from tvm import relay
+
+    batch_size = 4
+    x = relay.var("x", shape=(batch_size, 10))
+    w = relay.var("w", shape=(1, 10))
+    func = relay.Function([x, w], relay.add(x, w))
+    w_in = np.random.uniform(size=(1, 10)).astype("float32")
+    graph, lib, params = relay.build(func, target="llvm", params={"w": w_in})
+
+    pool = graph_runtime.GraphModulePool(graph, lib, tvm.cpu(0), params, num_instances=2)
+    a = np.random.uniform(size=(batch_size, 10)).astype("float32")
+    np.testing.assert_equal(pool.run(x=a)[0], a + w_in)
+    pool.close()
+
+    # coalesce requests of 1 or 2 rows into batches of up to 4 rows
+    pool = graph_runtime.GraphModulePool(
+        graph, lib, tvm.cpu(0), params, num_instances=2, max_batch_size=4, max_latency_ms=20
+    )
+    inputs = [np.random.uniform(size=(i % 2 + 1, 10)).astype("float32") for i in range(16)]
+    futures = [pool.submit(x=data) for data in inputs]
+    for data, future in zip(inputs, futures):
+        np.testing.assert_equal(future.result()[0], data + w_in)
+    stats = pool.latency_percentiles()
+    assert 1 < stats["batch_size"] <= batch_size
+    assert stats["exec_ms"][50] > 0
+    pool.close()
+
+
 if __name__ == "__main__":
     test_graph_simple()
+    test_graph_module_pool()
@@ -137,7 +137,47 @@ def test_graph_simple():
         out = mod.get_output(0, out)
         np.testing.assert_equal(out.asnumpy(), a + 1)
 
+    def check_profile():
+        mlib = tvm.build(s, [A, B], "llvm", name="myadd")
+        try:
+            mod = graph_runtime.create(graph, mlib, tvm.cpu(0))
+        except ValueError:
+            return
+
+        directory = mod._dump_path
+        mod.enable_profiling(sample_rate=0.25)
+        for _ in range(20):
+            a = np.random.uniform(size=(n,)).astype(A.dtype)
+            mod.run(x=a)
+            out = mod.get_output(0, tvm.nd.empty((n,)))
+            np.testing.assert_equal(out.asnumpy(), a + 1)
+        # no tensor dumped
+        assert os.listdir(directory) == ["_tvmdbg_graph_dump.json"]
+
+        summary = mod.profile_summary()
+        assert summary["num_samples"] == 5
+        assert [node["name"] for node in summary["nodes"]] == ["add"]
+        assert [func["name"] for func in summary["functions"]] == ["myadd"]
+        assert summary["functions"][0]["count"] == 1
+        node = summary["nodes"][0]
+        assert 0 < node["mean_us"] <= node["p99_us"]
+        assert node["percent"] == 100
+
+        mod.dump_profile()
+        with open(os.path.join(directory, "_tvmdbg_profile_summary.json")) as f:
+            assert json.load(f) == summary
+        with open(os.path.join(directory, "_tvmdbg_execution_trace.json")) as f:
+            events = json.load(f)["traceEvents"]
+        assert [event["name"] for event in events] == ["x", "x", "add", "add"]
+        np.testing.assert_allclose(events[3]["ts"] - events[2]["ts"], node["mean_us"])
+
+        mod.disable_profiling()
+        mod.run(x=a)
+        assert "output_tensors.params" in os.listdir(directory)
+        mod.exit()
+
     check_verify()
+    check_profile()
     check_remote()
 
 
@@ -19,15 +19,17 @@ from tvm import te
 import tvm.testing
 import os
 import stat
+import tarfile
 import logging
 import time
+import functools
 import multiprocessing
 
 import pytest
 import numpy as np
 from tvm import rpc
 from tvm.contrib import util, cc
-from tvm.rpc.tracker import Tracker
+from tvm.rpc.tracker import Tracker, FairShareScheduler
 
 
 def test_bigendian_rpc():
@@ -191,6 +193,21 @@ def test_rpc_file_exchange():
     assert rev == blob
 
 
+def test_rpc_unpack_link():
+    if not tvm.runtime.enabled("rpc"):
+        return
+    server = rpc.Server("localhost")
+    remote = rpc.connect(server.host, server.port)
+    temp = util.tempdir()
+    os.symlink("/etc/passwd", temp.relpath("passwd"))
+    with tarfile.open(temp.relpath("link.tar.gz"), "w:gz") as archive:
+        archive.add(temp.relpath("passwd"), arcname="passwd")
+    remote.upload(temp.relpath("link.tar.gz"))
+    # links could point outside the temp folder of the server
+    with pytest.raises(tvm.error.TVMError):
+        remote.get_function("tvm.rpc.server.unpack")("link.tar.gz")
+
+
 @tvm.testing.requires_llvm
 def test_rpc_remote_module():
     if not tvm.runtime.enabled("rpc"):
@@ -507,6 +524,182 @@ def test_rpc_tracker_request():
     tracker.terminate()
 
 
+def test_rpc_tracker_lease():
+    tracker = Tracker("localhost", port=9000, port_end=10000)
+    device_key = "test_device"
+    server = rpc.Server(
+        "localhost",
+        port=9000,
+        port_end=10000,
+        key=device_key,
+        tracker_addr=(tracker.host, tracker.port),
+    )
+    time.sleep(1)
+    client = rpc.connect_tracker(tracker.host, tracker.port)
+
+    with client.lease(device_key, max_requests=3) as lease:
+        remote = lease.session()
+        assert client.summary()["queue_info"][device_key]["free"] == 0
+        assert lease.session() is remote
+        assert lease.session() is remote
+        assert lease.num_sessions == 1
+        # a new session after max_requests, once the previous one is dropped
+        del remote
+        remote = lease.session()
+        assert lease.num_sessions == 2
+
+        temp = util.tempdir()
+        blobs = {}
+        for name in ["a.bin", "b.bin"]:
+            blobs[name] = bytearray(np.random.randint(0, 10, size=(10)))
+            with open(temp.relpath(name), "wb") as f:
+                f.write(blobs[name])
+        remote.upload_files({"x_" + name: temp.relpath(name) for name in blobs})
+        for name, blob in blobs.items():
+            assert remote.download("x_" + name) == blob
+
+        lease.invalidate()
+        del remote
+        time.sleep(1)
+        assert client.summary()["queue_info"][device_key]["free"] == 1
+        lease.session()
+        assert lease.num_sessions == 3
+    time.sleep(1)
+    assert client.summary()["queue_info"][device_key]["free"] == 1
+
+    server.terminate()
+    tracker.terminate()
+
+
+def test_rpc_tracker_fair_share_scheduler():
+    class Conn(object):
+        def __init__(self):
+            self.pending_matchkeys = set()
+
+    conns = [Conn() for _ in range(3)]
+    granted = []
+
+    def put(scheduler, index):
+        conn = conns[index]
+        matchkey = rpc.base.random_key("test_device:")
+        conn.pending_matchkeys.add(matchkey)
+        value = (conn, "localhost", 9000 + index, matchkey)
+        scheduler.put(value)
+        return value
+
+    def request(scheduler, user):
+        def callback(value):
+            granted.append((user, value[1]))
+            return True
+
+        scheduler.request(user, 1, callback)
+
+    # fair share, alice queues many requests before the others
+    scheduler = FairShareScheduler("test_device", quotas={"carol": 0})
+    for user in ["alice"] * 6 + ["bob"] * 2 + ["carol"]:
+        request(scheduler, user)
+    values = [put(scheduler, i) for i in range(3)]
+    assert granted == [("alice", 9000), ("bob", 9001), ("alice", 9002)]
+    summary = scheduler.summary()
+    assert summary["free"] == 0
+    assert summary["pending"] == 6
+    users = summary["metrics"]["users"]
+    assert users["alice"] == {"pending": 4, "in_use": 2, "usage": 2, "quota": None}
+    assert users["carol"] == {"pending": 1, "in_use": 0, "usage": 0, "quota": 0}
+    put(scheduler, 0)
+    assert granted[-1] == ("bob", 9000)
+    # a failed session releases the device of the user
+    scheduler.remove(values[1])
+    assert scheduler.summary()["metrics"]["users"]["bob"]["in_use"] == 1
+
+    # health, the fast device goes first, then the slow one, then the flaky one
+    granted = []
+    scheduler = FairShareScheduler("test_device")
+    values = [put(scheduler, i) for i in range(3)]
+    for _ in range(3):
+        request(scheduler, "alice")
+    time.sleep(0.1)
+    put(scheduler, 0)
+    scheduler.remove(values[2])
+    put(scheduler, 2)
+    time.sleep(0.2)
+    put(scheduler, 1)
+    devices = scheduler.summary()["metrics"]["devices"]
+    assert devices["localhost:9002"]["failures"] == 1
+    assert devices["localhost:9002"]["score"] > devices["localhost:9001"]["score"]
+    assert devices["localhost:9001"]["session_time"] > devices["localhost:9000"]["session_time"]
+    assert all(0 < device["utilization"] < 1 for device in devices.values())
+    for _ in range(3):
+        request(scheduler, "alice")
+    assert granted[3:] == [("alice", 9000), ("alice", 9001), ("alice", 9002)]
+
+
+def test_rpc_tracker_fair_share():
+    tracker = Tracker(
+        "localhost",
+        port=9000,
+        port_end=10000,
+        scheduler=functools.partial(FairShareScheduler, quotas={"alice": 1}),
+    )
+    device_key = "test_device"
+    servers = [
+        rpc.Server(
+            "localhost",
+            port=9000,
+            port_end=10000,
+            key=device_key,
+            tracker_addr=(tracker.host, tracker.port),
+        )
+        for _ in range(2)
+    ]
+    time.sleep(1)
+    client = rpc.connect_tracker(tracker.host, tracker.port)
+    remote = client.request(device_key, user="alice")
+
+    def target(host, port, device_key, user):
+        client = rpc.connect_tracker(host, port)
+        remote = client.request(device_key, user=user)
+        while True:
+            pass
+        remote.cpu()
+
+    # alice is over its quota although a device is free
+    proc = multiprocessing.Process(
+        target=target, args=(tracker.host, tracker.port, device_key, "alice")
+    )
+    proc.start()
+    time.sleep(1)
+    summary = client.summary()["queue_info"][device_key]
+    assert summary["free"] == 1
+    assert summary["pending"] == 1
+    assert summary["metrics"]["users"]["alice"]["in_use"] == 1
+
+    remote_bob = client.request(device_key, user="bob")
+    summary = client.summary()["queue_info"][device_key]
+    assert summary["free"] == 0
+    assert summary["metrics"]["users"]["bob"]["in_use"] == 1
+
+    # the device of alice goes to its pending request once released
+    del remote
+    time.sleep(1)
+    summary = client.summary()["queue_info"][device_key]
+    assert summary["pending"] == 0
+    assert summary["metrics"]["users"]["alice"] == {
+        "pending": 0,
+        "in_use": 1,
+        "usage": 2,
+        "quota": 1,
+    }
+    assert sorted(d["sessions"] for d in summary["metrics"]["devices"].values()) == [0, 1]
+
+    proc.terminate()
+    proc.join()
+    del remote_bob
+    for server in servers:
+        server.terminate()
+    tracker.terminate()
+
+
 if __name__ == "__main__":
     logging.basicConfig(level=logging.INFO)
     test_rpc_echo()
@@ -516,9 +709,13 @@ if __name__ == "__main__":
     test_bigendian_rpc()
     test_rpc_remote_module()
     test_rpc_file_exchange()
+    test_rpc_unpack_link()
     test_rpc_array()
     test_rpc_simple()
     test_local_func()
     test_rpc_tracker_register()
     test_rpc_tracker_request()
+    test_rpc_tracker_lease()
+    test_rpc_tracker_fair_share_scheduler()
+    test_rpc_tracker_fair_share()
     test_rpc_large_array()